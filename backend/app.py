@@ -77,7 +77,7 @@ def create_app():
         r'/api/*': {
             'origins': allowed_origins,
             'methods': ['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'],
-            'allow_headers': ['Content-Type', 'Authorization'],
+            'allow_headers': ['Content-Type', 'Authorization', 'X-Upload-Offset'],
             'supports_credentials': True,
         }
     })
@@ -193,8 +193,11 @@ def create_app():
 
     # ── DB setup: tables + column migrations + seed ───────────────────────────
     # Runs every boot — all operations are safe/idempotent on an existing DB.
-    with app.app_context():
-        _setup_database()
+    # Only the web process migrates: side processes (completion_worker.py) set
+    # INSPECTPRO_SKIP_DB_SETUP=1 so they never race it on the same ALTER TABLEs.
+    if os.environ.get('INSPECTPRO_SKIP_DB_SETUP') != '1':
+        with app.app_context():
+            _setup_database()
 
     return app
 
@@ -406,6 +409,70 @@ def _setup_database():
         _alter_column("inspections.client_booked",
                       f"ALTER TABLE inspections ADD COLUMN client_booked BOOLEAN NOT NULL DEFAULT {default}")
 
+    # transcription_usage.cache_read_tokens / cache_write_tokens — Anthropic
+    # prompt-cache token counts (reported separately from input_tokens)
+    for _col in ('cache_read_tokens', 'cache_write_tokens'):
+        if not column_exists('transcription_usage', _col):
+            _alter_column(f"transcription_usage.{_col}",
+                          f"ALTER TABLE transcription_usage ADD COLUMN {_col} INTEGER DEFAULT 0")
+
+    # inspections.delivery_status — JSON outcome per post-completion integration
+    # (email / depositary / drive), written by services/completion_jobs.py
+    if not column_exists('inspections', 'delivery_status'):
+        _alter_column("inspections.delivery_status",
+                      "ALTER TABLE inspections ADD COLUMN delivery_status TEXT")
+
+    # inspections.report_version — base version for report_data delta syncs
+    if not column_exists('inspections', 'report_version'):
+        _alter_column("inspections.report_version",
+                      "ALTER TABLE inspections ADD COLUMN report_version INTEGER NOT NULL DEFAULT 0")
+
+    # inspections.report_sectioned — report stored per section in report_sections
+    # (table itself is created by db.create_all()); existing reports move over
+    # on their next write
+    if not column_exists('inspections', 'report_sectioned'):
+        default = "0" if _is_sqlite() else "FALSE"
+        _alter_column("inspections.report_sectioned",
+                      f"ALTER TABLE inspections ADD COLUMN report_sectioned BOOLEAN NOT NULL DEFAULT {default}")
+    for _col in ('size', 'photo_count'):
+        if not column_exists('report_sections', _col):
+            _alter_column(f"report_sections.{_col}",
+                          f"ALTER TABLE report_sections ADD COLUMN {_col} INTEGER NOT NULL DEFAULT 0")
+
+    # inspections.report_size / photo_count / last_synced_at — stored report
+    # summary (services/report_store.py). Size and sync time are backfilled in
+    # SQL here; photo_count stays NULL until migrate_report_summary.py (or the
+    # next write) computes it. Sectioned reports count each section as
+    # `"key": value, ` — the same measure as report_store.section_stats.
+    if not column_exists('inspections', 'report_size'):
+        _alter_column("inspections.report_size",
+                      "ALTER TABLE inspections ADD COLUMN report_size INTEGER NOT NULL DEFAULT 0")
+        db.session.execute(text(
+            "UPDATE inspections SET report_size = LENGTH(report_data) WHERE report_data IS NOT NULL"))
+        db.session.execute(text(
+            "UPDATE inspections SET report_size = COALESCE((SELECT SUM(LENGTH(s.key) + LENGTH(CAST(s.data AS TEXT)) + 6) "
+            "FROM report_sections s WHERE s.inspection_id = inspections.id), 2) "
+            "WHERE report_sectioned"))
+        db.session.commit()
+    if not column_exists('inspections', 'photo_count'):
+        _alter_column("inspections.photo_count",
+                      "ALTER TABLE inspections ADD COLUMN photo_count INTEGER")
+    if not column_exists('inspections', 'last_synced_at'):
+        _alter_column("inspections.last_synced_at",
+                      "ALTER TABLE inspections ADD COLUMN last_synced_at TIMESTAMP")
+        db.session.execute(text(
+            "UPDATE inspections SET last_synced_at = updated_at WHERE report_size > 0"))
+        db.session.commit()
+
+    # floor_plan_scans.geometry_version / geometry — persisted inspect/render
+    # result per scan (services/floorplan_results.py)
+    if not column_exists('floor_plan_scans', 'geometry_version'):
+        _alter_column("floor_plan_scans.geometry_version",
+                      "ALTER TABLE floor_plan_scans ADD COLUMN geometry_version VARCHAR(32)")
+    if not column_exists('floor_plan_scans', 'geometry'):
+        _alter_column("floor_plan_scans.geometry",
+                      "ALTER TABLE floor_plan_scans ADD COLUMN geometry TEXT")
+
     # ── Reset midterm_sections to v2 defaults if still on old v1 schema ───────────
     # The original defaults used "Property Condition Overview" / "Safety & Alarms";
     # the v2 defaults match the industry-standard midterm format (Overview, Keys,
@@ -650,16 +717,20 @@ def _setup_database():
 
 
 # ── Scheduler (runs outside create_app so it starts once, not per worker) ────
+# Standalone processes that import this module for the app object (e.g.
+# completion_worker.py) set INSPECTPRO_DISABLE_SCHEDULERS=1 so the jobs only
+# ever run in the web process.
 app = create_app()
 
-from routes.email_notifications import schedule_clerk_summaries  # noqa
-schedule_clerk_summaries(app)
+if os.environ.get('INSPECTPRO_DISABLE_SCHEDULERS') != '1':
+    from routes.email_notifications import schedule_clerk_summaries  # noqa
+    schedule_clerk_summaries(app)
 
-from routes.google import schedule_expiry_check  # noqa
-schedule_expiry_check(app)
+    from routes.google import schedule_expiry_check  # noqa
+    schedule_expiry_check(app)
 
-from learning.scheduler import schedule_learning_pipeline  # noqa
-schedule_learning_pipeline(app)
+    from learning.scheduler import schedule_learning_pipeline  # noqa
+    schedule_learning_pipeline(app)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,95 @@
+"""
+bench_pdf_build.py — single-pass vs two-pass PDF build timing.
+
+Builds each inspection's PDF with both _PDFBuilder build modes and reports
+wall time and page count. Photos are prefetched once before timing, so the
+numbers compare layout cost only (both modes read the same _img_cache).
+
+Usage (from backend/):
+    python bench_pdf_build.py 1234 1240
+    python bench_pdf_build.py --largest 5 --type check_out --repeat 3
+"""
+
+import argparse
+import os
+import time
+
+os.environ['INSPECTPRO_DISABLE_SCHEDULERS'] = '1'
+
+from app import create_app  # noqa: E402
+from models import db, Inspection, ReportSection  # noqa: E402
+
+
+def _page_count(pdf_bytes: bytes):
+    try:
+        import fitz  # PyMuPDF
+        with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+            return len(doc)
+    except Exception:
+        return pdf_bytes.count(b'/Type /Page') - pdf_bytes.count(b'/Type /Pages')
+
+
+def bench_inspection(inspection, repeat: int = 1) -> dict:
+    from routes.pdf_generator import _PDFBuilder
+
+    builder = _PDFBuilder(inspection)
+    builder._prefetch_images()
+
+    result = {'id': inspection.id, 'images': len(builder._img_cache)}
+    for label, single in (('two_pass', False), ('single_pass', True)):
+        best, pdf_bytes = None, b''
+        for _ in range(repeat):
+            started = time.perf_counter()
+            pdf_bytes = builder.build(single_pass=single)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        result[label] = best
+        result[label + '_pages'] = _page_count(pdf_bytes)
+        result[label + '_kb'] = len(pdf_bytes) // 1024
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare single-pass and two-pass PDF builds')
+    parser.add_argument('ids', nargs='*', type=int, help='Inspection ids to build')
+    parser.add_argument('--largest', type=int, default=0, help='Also bench the N inspections with the largest report_data')
+    parser.add_argument('--type', default=None, help='Restrict --largest to one inspection_type (e.g. check_out)')
+    parser.add_argument('--repeat', type=int, default=1, help='Builds per mode; the fastest is reported')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        ids = list(args.ids)
+        if args.largest:
+            size = (db.session.query(db.func.sum(db.func.length(db.cast(ReportSection.data, db.Text))))
+                    .filter(ReportSection.inspection_id == Inspection.id)
+                    .scalar_subquery())
+            q = Inspection.query.filter(Inspection.has_report())
+            if args.type:
+                q = q.filter(Inspection.inspection_type == args.type)
+            q = q.order_by(db.func.coalesce(db.func.length(Inspection.report_blob), size).desc()).limit(args.largest)
+            ids += [i.id for i in q.with_entities(Inspection.id)]
+        if not ids:
+            parser.error('pass inspection ids and/or --largest N')
+
+        total_two = total_single = 0.0
+        for iid in ids:
+            inspection = db.session.get(Inspection, iid)
+            if not inspection:
+                print(f'{iid}: not found')
+                continue
+            r = bench_inspection(inspection, repeat=args.repeat)
+            total_two += r['two_pass']
+            total_single += r['single_pass']
+            same = 'same pages' if r['two_pass_pages'] == r['single_pass_pages'] else 'PAGE COUNT DIFFERS'
+            print(f"{iid}: {r['images']} images  two-pass {r['two_pass'] * 1000:7.0f} ms "
+                  f"({r['two_pass_pages']} pp)  single-pass {r['single_pass'] * 1000:7.0f} ms "
+                  f"({r['single_pass_pages']} pp)  {r['two_pass'] / r['single_pass']:.2f}x  {same}")
+
+        if total_single:
+            print(f'Total: two-pass {total_two:.2f}s, single-pass {total_single:.2f}s '
+                  f'({total_two / total_single:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+bench_ransac.py — vectorised vs pure-Python RANSAC wall fitting.
+
+Builds the dense point cloud for each recorded scan exactly as
+routes/floorplans.py's _compute_dense_geometry does (subsample_step=6,
+min_inliers scaled to the cloud size), then times fit_wall_lines (numpy,
+batched + adaptive) against _fit_wall_lines_py (the per-hypothesis loop) on
+the same points and reports walls found and inliers covered by each.
+
+Scans come from local zip files (scan packages pulled from S3 or copied off a
+device) and/or FloorPlanScan ids, which are downloaded from S3.
+
+Usage (from backend/):
+    python bench_ransac.py --zip ~/scans/living_room.zip ~/scans/hallway.zip
+    python bench_ransac.py --scan 12 15 --repeat 3
+"""
+
+import argparse
+import os
+import time
+
+os.environ['INSPECTPRO_DISABLE_SCHEDULERS'] = '1'
+
+from services.floorplan_processing import parse_scan_package  # noqa: E402
+from services.floorplan_geometry import (  # noqa: E402
+    build_point_cloud, fit_wall_lines, _fit_wall_lines_py,
+)
+
+
+def _scan_bytes(scan_ids):
+    from app import create_app
+    from models import FloorPlanScan
+    from utils.s3 import download_bytes
+
+    app = create_app()
+    with app.app_context():
+        for scan_id in scan_ids:
+            scan = FloorPlanScan.query.get(scan_id)
+            if scan is None or not scan.s3_key:
+                print(f'  scan {scan_id}: not found / not uploaded — skipped')
+                continue
+            yield f'scan {scan_id}', download_bytes(scan.s3_key)
+
+
+def _zip_bytes(paths):
+    for path in paths:
+        with open(path, 'rb') as f:
+            yield os.path.basename(path), f.read()
+
+
+def _best_of(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_scan(label, zip_bytes, repeat=1, skip_python=False):
+    parsed = parse_scan_package(zip_bytes)
+    cloud = build_point_cloud(zip_bytes, parsed, subsample_step=6)
+    xz = [(p.x, p.z) for p in cloud]
+    min_inliers = max(15, len(xz) // 200)
+
+    result = {'label': label, 'frames': parsed.frame_count, 'points': len(xz)}
+    runs = [('numpy', lambda: fit_wall_lines(xz, min_inliers=min_inliers))]
+    if not skip_python:
+        runs.append(('python', lambda: _fit_wall_lines_py(xz, 0.15, min_inliers, 8, 300, 42)))
+    for name, fn in runs:
+        elapsed, walls = _best_of(fn, repeat)
+        result[name] = elapsed
+        result[name + '_walls'] = len(walls)
+        result[name + '_inliers'] = sum(w.inlier_count for w in walls)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare vectorised and pure-Python RANSAC wall fitting')
+    parser.add_argument('--zip', nargs='*', default=[], help='Local scan package zips')
+    parser.add_argument('--scan', nargs='*', type=int, default=[], help='FloorPlanScan ids (downloaded from S3)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per implementation; the fastest is reported')
+    parser.add_argument('--skip-python', action='store_true', help='Only time the numpy path (large clouds)')
+    args = parser.parse_args()
+
+    if not args.zip and not args.scan:
+        parser.error('give at least one --zip path or --scan id')
+
+    sources = list(_zip_bytes(args.zip))
+    if args.scan:
+        sources += list(_scan_bytes(args.scan))
+
+    print(f'{"scan":<28} {"frames":>6} {"points":>7}  {"numpy":>8} {"walls":>5} {"inl":>6}'
+          f'  {"python":>8} {"walls":>5} {"inl":>6}  {"speedup":>7}')
+    for label, zip_bytes in sources:
+        try:
+            r = bench_scan(label, zip_bytes, repeat=args.repeat, skip_python=args.skip_python)
+        except ValueError as e:
+            print(f'  {label}: failed to parse ({e})')
+            continue
+        line = (f'{r["label"][:28]:<28} {r["frames"]:>6} {r["points"]:>7}  '
+                f'{r["numpy"]:>7.3f}s {r["numpy_walls"]:>5} {r["numpy_inliers"]:>6}')
+        if 'python' in r:
+            speedup = r['python'] / r['numpy'] if r['numpy'] else 0
+            line += (f'  {r["python"]:>7.3f}s {r["python_walls"]:>5} {r["python_inliers"]:>6}'
+                     f'  {speedup:>6.1f}x')
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+completion_worker.py — drains the completion_jobs queue.
+
+Runs as its own supervised process next to gunicorn — the Procfile `worker:`
+entry (a separate Railway service) or the `worker` process group in fly.toml —
+never backgrounded from start.sh, so the platform restarts it if it dies. It
+skips _setup_database() (INSPECTPRO_SKIP_DB_SETUP=1): schema migrations belong
+to the web process alone, and two processes running the same ALTER TABLEs at
+once would fail one of them. Each of
+COMPLETION_WORKER_CONCURRENCY threads repeatedly claims the next inspection's
+due jobs, builds the PDF once and runs its email / Depositary / Drive
+deliveries — see services/completion_jobs.py for the queue semantics.
+
+SIGTERM/SIGINT stop claiming new work; in-flight jobs finish first. A job
+interrupted anyway (hard kill) is re-queued once its lock goes stale.
+
+Usage (from backend/):
+    python3 completion_worker.py
+"""
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+
+# The app module starts the APScheduler jobs on import — those belong to the
+# web process only.
+os.environ['INSPECTPRO_DISABLE_SCHEDULERS'] = '1'
+os.environ['INSPECTPRO_SKIP_DB_SETUP'] = '1'
+
+from app import app  # noqa: E402
+from models import db  # noqa: E402
+from services.completion_jobs import claim_next, run_claimed, recover_stale_jobs  # noqa: E402
+
+CONCURRENCY   = int(os.environ.get('COMPLETION_WORKER_CONCURRENCY', '2'))
+POLL_SECS     = float(os.environ.get('COMPLETION_WORKER_POLL_SECS', '5'))
+RECOVER_EVERY = 60   # seconds between stale-lock sweeps (slot 0 only)
+
+_stop = threading.Event()
+
+
+def _slot(n):
+    worker_id    = f'{socket.gethostname()}:{os.getpid()}:{n}'
+    last_recover = 0.0
+    while not _stop.is_set():
+        claimed = []
+        with app.app_context():
+            try:
+                if n == 0 and time.monotonic() - last_recover > RECOVER_EVERY:
+                    recover_stale_jobs()
+                    last_recover = time.monotonic()
+                inspection_id, claimed = claim_next(worker_id)
+                if claimed:
+                    run_claimed(inspection_id, claimed)
+            except Exception:
+                print(f'[completion] worker {worker_id} error:')
+                print(traceback.format_exc())
+                db.session.rollback()
+            finally:
+                db.session.remove()
+        if not claimed:
+            _stop.wait(POLL_SECS)
+
+
+def main():
+    def _shutdown(signum, _frame):
+        print(f'[completion] signal {signum} — finishing in-flight jobs, then exiting')
+        _stop.set()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    print(f'[completion] worker started — {CONCURRENCY} slot(s), poll every {POLL_SECS}s')
+    threads = [threading.Thread(target=_slot, args=(n,), name=f'completion-{n}')
+               for n in range(max(1, CONCURRENCY))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print('[completion] worker stopped')
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,7 @@ scripts stay standalone-runnable without booting the full Flask app
 """
 
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import JSON, Integer, String, bindparam, create_engine, text
 
 
 def get_engine():
@@ -20,3 +20,24 @@ def get_engine():
     database_url = database_url.replace('postgresql://', 'postgresql+psycopg://')
 
     return create_engine(database_url)
+
+
+def load_report_sections(engine, ids: list) -> dict:
+    """
+    {inspection_id: report dict} for inspections whose report is stored per
+    section (inspections.report_sectioned — see services/report_store.py).
+    Reports still in the legacy inspections.report_data column aren't included.
+    """
+    if not ids:
+        return {}
+    query = (
+        text('SELECT inspection_id, key, data FROM report_sections '
+             'WHERE inspection_id IN :ids ORDER BY inspection_id, position')
+        .bindparams(bindparam('ids', expanding=True))
+        .columns(inspection_id=Integer, key=String, data=JSON)
+    )
+    reports = {}
+    with engine.connect() as conn:
+        for row in conn.execute(query, {'ids': list(ids)}):
+            reports.setdefault(row.inspection_id, {})[row.key] = row.data
+    return reports
@@ -0,0 +1,112 @@
+"""
+backend/learning/bench_corrections.py
+──────────────────────────────────────
+Equivalence check + micro-benchmark for the compiled single-pass transcript
+correction engine in routes/transcribe.py (_correct_transcript) against the
+original one-re.sub-per-rule loop (_correct_transcript_sequential).
+
+Corpus: distinct TranscriptionFillDiff.transcript_excerpt values (real
+Whisper output mined from finished reports), optionally plus golden-fixture
+transcripts. Any transcript where the two engines disagree is printed and the
+script exits non-zero — run it after editing _TRANSCRIPT_CORRECTIONS.
+
+Usage (run from backend/):
+    python -m learning.bench_corrections
+    python -m learning.bench_corrections --limit 5000 --repeat 20 --fixtures
+    python -m learning.bench_corrections --candidate /path/to/candidate_transcribe.py
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import text
+
+from learning._db import get_engine
+from learning.eval_harness import load_fill_module
+
+
+def load_corpus(limit: int = 2000, include_fixtures: bool = False) -> list[str]:
+    engine = get_engine()
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            'SELECT DISTINCT transcript_excerpt FROM transcription_fill_diffs '
+            "WHERE transcript_excerpt IS NOT NULL AND transcript_excerpt <> '' "
+            'LIMIT :limit'
+        ), {'limit': limit}).fetchall()
+        corpus = [r[0] for r in rows]
+        if include_fixtures:
+            rows = conn.execute(text(
+                'SELECT transcript FROM transcription_golden_fixtures '
+                'WHERE is_active = true ORDER BY id DESC LIMIT :limit'
+            ), {'limit': limit}).fetchall()
+            corpus.extend(r[0] for r in rows if r[0])
+    return corpus
+
+
+def _time(fn, corpus: list[str], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for t in corpus:
+            fn(t)
+    return time.perf_counter() - started
+
+
+def run_bench(module, corpus: list[str], repeat: int = 10) -> dict:
+    sequential = module._correct_transcript_sequential
+    compiled = module._correct_transcript
+
+    mismatches = []
+    for t in corpus:
+        expected, actual = sequential(t), compiled(t)
+        if expected != actual:
+            mismatches.append((t, expected, actual))
+
+    sequential_secs = _time(sequential, corpus, repeat)
+    compiled_secs = _time(compiled, corpus, repeat)
+    chars = sum(len(t) for t in corpus)
+
+    return {
+        'transcripts': len(corpus),
+        'chars': chars,
+        'rules': len(module._TRANSCRIPT_CORRECTIONS),
+        'repeat': repeat,
+        'sequential_secs': sequential_secs,
+        'compiled_secs': compiled_secs,
+        'speedup': (sequential_secs / compiled_secs) if compiled_secs else 0.0,
+        'mismatches': mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the compiled transcript correction engine')
+    parser.add_argument('--limit', type=int, default=2000, help='Max transcripts to load per source')
+    parser.add_argument('--repeat', type=int, default=10, help='Timing passes over the corpus')
+    parser.add_argument('--fixtures', action='store_true', help='Also include golden-fixture transcripts')
+    parser.add_argument('--candidate', default=None, help='Path to a candidate transcribe.py to test instead of the live one')
+    args = parser.parse_args()
+
+    corpus = load_corpus(limit=args.limit, include_fixtures=args.fixtures)
+    if not corpus:
+        print('No transcripts found — run learning/mining.py first.')
+        return
+
+    module = load_fill_module(args.candidate)
+    r = run_bench(module, corpus, repeat=args.repeat)
+
+    print(f"{r['transcripts']} transcripts ({r['chars']:,} chars), {r['rules']} rules, {r['repeat']} passes")
+    print(f"  sequential: {r['sequential_secs'] * 1000:8.1f} ms")
+    print(f"  compiled:   {r['compiled_secs'] * 1000:8.1f} ms   ({r['speedup']:.1f}x)")
+
+    if r['mismatches']:
+        print(f"{len(r['mismatches'])} transcript(s) differ between engines:")
+        for t, expected, actual in r['mismatches'][:20]:
+            print(f'  input:      {t[:160]!r}')
+            print(f'  sequential: {expected[:160]!r}')
+            print(f'  compiled:   {actual[:160]!r}')
+        sys.exit(1)
+    print('Outputs identical.')
+
+
+if __name__ == '__main__':
+    main()
@@ -31,7 +31,7 @@ import json
 
 from sqlalchemy import text
 
-from learning._db import get_engine
+from learning._db import get_engine, load_report_sections
 
 _ROOM_FILL_FN_BY_TYPE = {
     'check_out':     '_claude_fill_room_checkout',
@@ -112,7 +112,7 @@ def _has_subs(item_fields: dict) -> bool:
 
 def _candidate_inspections(engine, pool_size: int):
     query = text(
-        "SELECT id, report_data, template_id, inspection_type "
+        "SELECT id, report_data, report_sectioned, template_id, inspection_type "
         "FROM inspections WHERE status = 'complete' "
         "ORDER BY updated_at DESC LIMIT :pool_size"
     )
@@ -144,13 +144,18 @@ def find_candidates(pool_size: int = 100):
     section_cache = {}   # template_id -> {name.lower(): (id, type)}
     items_cache = {}     # section_id -> items list
 
-    for insp in _candidate_inspections(engine, pool_size):
-        if not insp.report_data:
-            continue
-        try:
-            report_data = json.loads(insp.report_data)
-        except (json.JSONDecodeError, TypeError):
-            continue
+    inspections = _candidate_inspections(engine, pool_size)
+    sectioned = load_report_sections(engine, [i.id for i in inspections if i.report_sectioned])
+    for insp in inspections:
+        if insp.report_sectioned:
+            report_data = sectioned.get(insp.id) or {}
+        else:
+            if not insp.report_data:
+                continue
+            try:
+                report_data = json.loads(insp.report_data)
+            except (json.JSONDecodeError, TypeError):
+                continue
 
         log = report_data.get('_transcriptionLog') or []
         if not log:
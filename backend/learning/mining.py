@@ -37,7 +37,7 @@ from datetime import datetime
 
 from sqlalchemy import bindparam, text
 
-from learning._db import get_engine
+from learning._db import get_engine, load_report_sections
 
 _META_KEYS = {'name', '_delete', '_descAction', '_condAction'}
 _ROOM_FILL_FN_BY_TYPE = {
@@ -121,7 +121,7 @@ def _load_inspections(engine, ids: list):
     if not ids:
         return []
     query = text(
-        'SELECT id, updated_at, template_id, inspection_type, report_data '
+        'SELECT id, updated_at, template_id, inspection_type, report_data, report_sectioned '
         'FROM inspections WHERE id IN :ids'
     ).bindparams(bindparam('ids', expanding=True))
     with engine.connect() as conn:
@@ -405,6 +405,7 @@ def run_daily_mining(pool_size: int = 200, force_inspection_id: int | None = Non
         return stats
 
     ledger_starts = {} if force_inspection_id else _ledger_start_indices(engine, [i.id for i in inspections])
+    sectioned = load_report_sections(engine, [i.id for i in inspections if i.report_sectioned])
 
     section_cache = {}   # template_id -> {name.lower(): (id, type)}
     items_cache = {}     # section_id -> items list
@@ -412,12 +413,15 @@ def run_daily_mining(pool_size: int = 200, force_inspection_id: int | None = Non
     with engine.connect() as conn:
         for insp in inspections:
             stats['inspections_scanned'] += 1
-            if not insp.report_data:
-                continue
-            try:
-                report_data = json.loads(insp.report_data)
-            except (json.JSONDecodeError, TypeError):
-                continue
+            if insp.report_sectioned:
+                report_data = sectioned.get(insp.id) or {}
+            else:
+                if not insp.report_data:
+                    continue
+                try:
+                    report_data = json.loads(insp.report_data)
+                except (json.JSONDecodeError, TypeError):
+                    continue
             _strip_media(report_data)
 
             log = report_data.get('_transcriptionLog') or []
@@ -44,7 +44,7 @@ import sys
 # ── Bootstrap Flask app so we can reuse db + models ──────────────────────────
 sys.path.insert(0, os.path.dirname(__file__))
 from app import create_app
-from models import db, Client, Property, Inspection
+from models import db, Client, Property, Inspection, ReportSection
 from utils.s3 import is_configured, upload_base64, is_s3_url, is_base64_uri
 
 
@@ -163,10 +163,14 @@ def migrate_properties(dry_run: bool, limit: int | None, skip_errors: bool):
 def migrate_inspections(dry_run: bool, limit: int | None, skip_errors: bool):
     print('\n── Inspections (report_data photos) ─────────────────────────')
     # Only inspections that actually have photos (contain "data:image")
-    q = Inspection.query.filter(
-        Inspection.report_data.isnot(None),
-        Inspection.report_data.like('%data:image%')
-    )
+    in_sections = (db.session.query(ReportSection.id)
+                   .filter(ReportSection.inspection_id == Inspection.id,
+                           db.cast(ReportSection.data, db.Text).like('%data:image%'))
+                   .exists())
+    q = Inspection.query.filter(db.or_(
+        Inspection.report_blob.like('%data:image%'),
+        db.and_(Inspection.report_sectioned.is_(True), in_sections),
+    ))
     if limit:
         q = q.limit(limit)
     rows = q.all()
@@ -0,0 +1,65 @@
+"""
+migrate_report_summary.py
+──────────────────────────
+Backfills the stored report summary for inspections written before it existed:
+inspections.photo_count (NULL = not computed yet) plus the per-section
+report_sections.size / photo_count. report_size and last_synced_at are
+already backfilled in SQL by app.py's _setup_database(); this fills in what
+needs the JSON parsed. Reports are processed one at a time, so memory stays
+bounded by the largest single report.
+
+Run once after deploy (safe to re-run — only rows with photo_count NULL are touched):
+    python migrate_report_summary.py [--batch 50]
+"""
+
+import argparse
+import os
+
+os.environ['INSPECTPRO_DISABLE_SCHEDULERS'] = '1'
+
+from app import create_app  # noqa: E402
+from models import db, Inspection  # noqa: E402
+from services.report_store import count_photos, load_report, section_stats  # noqa: E402
+
+
+def _summarise(inspection):
+    if inspection.report_sectioned:
+        photos = 0
+        for row in inspection.report_sections:
+            row.size, row.photo_count = section_stats(row.key, row.data)
+            photos += row.photo_count
+        inspection.report_size = max(2, sum(row.size for row in inspection.report_sections))
+        inspection.photo_count = photos
+        return
+    try:
+        rd = load_report(inspection)
+    except (ValueError, TypeError):
+        rd = {}
+    inspection.photo_count = count_photos(rd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill inspection report summary columns')
+    parser.add_argument('--batch', type=int, default=50, help='Inspections per commit')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        done = 0
+        while True:
+            ids = [i for (i,) in db.session.query(Inspection.id)
+                   .filter(Inspection.photo_count.is_(None))
+                   .order_by(Inspection.id).limit(args.batch)]
+            if not ids:
+                break
+            for iid in ids:
+                _summarise(db.session.get(Inspection, iid))
+            db.session.commit()
+            db.session.expunge_all()
+            done += len(ids)
+            print(f'  {done} inspections summarised')
+        print(f'✓ report summary backfilled for {done} inspections')
+
+
+if __name__ == '__main__':
+    main()
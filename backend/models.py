@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.postgresql import JSONB
 import json
 
 db = SQLAlchemy()
@@ -203,11 +204,31 @@ class Inspection(db.Model):
     internal_notes          = db.Column(db.Text)
 
     notes       = db.Column(db.Text)
-    report_data = db.Column(db.Text)  # JSON
+    # Report JSON. Stored per top-level key in report_sections once
+    # report_sectioned is set; report_blob (DB column "report_data") holds the
+    # whole JSON text for reports not yet moved over (or not a JSON object).
+    # Read/write it through the report_data property below or
+    # services/report_store.py — never report_blob directly.
+    report_blob      = db.Column('report_data', db.Text)
+    report_sectioned = db.Column(db.Boolean, default=False, nullable=False)
+    # Bumped on every report write (services/report_store.py) — the base
+    # version mobile delta syncs (PATCH …/report-data) are checked against.
+    report_version = db.Column(db.Integer, default=0, nullable=False)
+    # Report summary, maintained on every report write by services/report_store.py
+    # so lists/history/dashboards never load the report to describe it.
+    # report_size: JSON bytes (0 = no report data); photo_count: NULL until
+    # computed (migrate_report_summary.py backfills rows older than the column).
+    report_size    = db.Column(db.Integer, default=0, nullable=False)
+    photo_count    = db.Column(db.Integer, default=0)
+    last_synced_at = db.Column(db.DateTime)
     # Tracks whether the automatic completion email has been sent.
     # Once True, subsequent complete->active->complete cycles skip the auto email
     # so clients only receive it once.  Manual 'Share PDF' is unaffected.
     completion_email_sent = db.Column(db.Boolean, default=False, nullable=False)
+    # JSON: latest outcome of each post-completion delivery, e.g.
+    # {"email": {"status": "done", "detail": "sent to …", "attempts": 1, "at": "…"}, "drive": {…}}
+    # Written by services/completion_jobs.py; CompletionJob rows hold the full history.
+    delivery_status = db.Column(db.Text)
     invoice_paid  = db.Column(db.Boolean, default=False, nullable=False)
     confirmed    = db.Column(db.Boolean, default=False, nullable=False)
     confirmed_at = db.Column(db.DateTime, nullable=True)
@@ -222,6 +243,38 @@ class Inspection(db.Model):
     inspector = db.relationship('User', foreign_keys=[inspector_id], backref='inspections_as_inspector')
     typist    = db.relationship('User', foreign_keys=[typist_id],    backref='inspections_as_typist')
     template  = db.relationship('Template', foreign_keys=[template_id])
+    report_sections = db.relationship('ReportSection', order_by='ReportSection.position',
+                                      cascade='all, delete-orphan')
+
+    @property
+    def report_data(self):
+        """Whole report as a JSON string (None if empty) — the legacy single-blob view."""
+        if not self.report_sectioned:
+            return self.report_blob
+        return json.dumps({s.key: s.data for s in self.report_sections})
+
+    @report_data.setter
+    def report_data(self, value):
+        from services.report_store import store_report_json
+        store_report_json(self, value)
+
+    @property
+    def has_report_data(self):
+        return (self.report_size or 0) > 0
+
+    @classmethod
+    def has_report(cls):
+        """SQL expression: the inspection has report data (from the stored summary)."""
+        return cls.report_size > 0
+
+    def report_summary(self):
+        """Stored report summary fields for list/history payloads."""
+        return {
+            'has_report_data': self.has_report_data,
+            'report_size':     self.report_size or 0,
+            'photo_count':     self.photo_count,
+            'last_synced_at':  self.last_synced_at.isoformat() if self.last_synced_at else None,
+        }
 
     def to_dict(self):
         return {
@@ -258,15 +311,41 @@ class Inspection(db.Model):
             'internal_notes':          self.internal_notes,
             'notes':                   self.notes,
             'report_data':             self.report_data,
+            'report_version':          self.report_version or 0,
+            **self.report_summary(),
             'invoice_paid':            self.invoice_paid,
             'confirmed':               self.confirmed,
             'confirmed_at':            self.confirmed_at.isoformat() if self.confirmed_at else None,
             'client_booked':           self.client_booked,
+            'delivery_status':         json.loads(self.delivery_status) if self.delivery_status else None,
             'created_at':              self.created_at.isoformat() if self.created_at else None,
             'updated_at':              self.updated_at.isoformat() if self.updated_at else None,
         }
 
 
+class ReportSection(db.Model):
+    """
+    One top-level key of an inspection's report_data — a room, a fixed
+    section, or a metadata key such as _signatures / _roomOrder. Lets sync
+    writes and partial reads touch one section instead of the whole report.
+    """
+    __tablename__ = 'report_sections'
+    __table_args__ = (db.UniqueConstraint('inspection_id', 'key', name='uq_report_section_key'),)
+
+    id            = db.Column(db.Integer, primary_key=True)
+    inspection_id = db.Column(db.Integer, db.ForeignKey('inspections.id', ondelete='CASCADE'),
+                              nullable=False, index=True)
+    key           = db.Column(db.String(255), nullable=False)
+    position      = db.Column(db.Integer, nullable=False, default=0)  # key order within the report
+    data          = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'))
+    # Per-section share of Inspection.report_size / photo_count, so a partial
+    # write can update the inspection totals without re-reading other sections
+    size          = db.Column(db.Integer, nullable=False, default=0)
+    photo_count   = db.Column(db.Integer, nullable=False, default=0)
+    updated_at    = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                              onupdate=lambda: datetime.now(timezone.utc))
+
+
 class Template(db.Model):
     __tablename__ = 'templates'
 
@@ -390,6 +469,9 @@ USD_TO_GBP           = 0.79
 WHISPER_PER_MIN_USD  = 0.006
 HAIKU_IN_PER_1M_USD  = 1.00
 HAIKU_OUT_PER_1M_USD = 5.00
+# Prompt caching: reads bill at 0.1x input, 5-minute cache writes at 1.25x
+HAIKU_CACHE_READ_PER_1M_USD  = 0.10
+HAIKU_CACHE_WRITE_PER_1M_USD = 1.25
 
 
 class TranscriptionUsage(db.Model):
@@ -403,12 +485,16 @@ class TranscriptionUsage(db.Model):
     audio_seconds = db.Column(db.Float, default=0)
     input_tokens  = db.Column(db.Integer, default=0)
     output_tokens = db.Column(db.Integer, default=0)
+    cache_read_tokens  = db.Column(db.Integer, default=0)   # prompt-cache hits (not in input_tokens)
+    cache_write_tokens = db.Column(db.Integer, default=0)   # prompt-cache writes (not in input_tokens)
     section_type  = db.Column(db.String(30), default='room')
 
     def to_dict(self):
         whisper_usd = (self.audio_seconds / 60) * WHISPER_PER_MIN_USD
         claude_usd  = (self.input_tokens  / 1_000_000) * HAIKU_IN_PER_1M_USD + \
-                      (self.output_tokens / 1_000_000) * HAIKU_OUT_PER_1M_USD
+                      (self.output_tokens / 1_000_000) * HAIKU_OUT_PER_1M_USD + \
+                      ((self.cache_read_tokens  or 0) / 1_000_000) * HAIKU_CACHE_READ_PER_1M_USD + \
+                      ((self.cache_write_tokens or 0) / 1_000_000) * HAIKU_CACHE_WRITE_PER_1M_USD
         total_gbp   = (whisper_usd + claude_usd) * USD_TO_GBP
 
         return {
@@ -419,11 +505,69 @@ class TranscriptionUsage(db.Model):
             'audio_seconds': self.audio_seconds,
             'input_tokens':  self.input_tokens,
             'output_tokens': self.output_tokens,
+            'cache_read_tokens':  self.cache_read_tokens or 0,
+            'cache_write_tokens': self.cache_write_tokens or 0,
             'section_type':  self.section_type,
             'cost_gbp':      round(total_gbp, 4),
         }
 
 
+class CompletionJob(db.Model):
+    """
+    Durable queue of post-completion deliveries for an inspection — one row
+    per integration ('email' | 'depositary' | 'drive'). Enqueued by
+    update_inspection() when an inspection goes complete and drained by the
+    standalone completion_worker.py process (services/completion_jobs.py),
+    so a deploy or a killed gunicorn worker can no longer silently drop a
+    completion email.
+
+    status values (free text, like FloorPlanScan.status):
+      pending   — waiting for next_attempt_at
+      running   — claimed by locked_by at locked_at (reclaimed if the lock goes stale)
+      done      — delivered; result holds the integration's return value
+      skipped   — nothing to do (not configured, no recipients, already emailed)
+      failed    — gave up after max_attempts, or a non-retryable error
+    """
+    __tablename__ = 'completion_jobs'
+
+    id              = db.Column(db.Integer, primary_key=True)
+    inspection_id   = db.Column(db.Integer, db.ForeignKey('inspections.id', ondelete='CASCADE'), nullable=False, index=True)
+    integration     = db.Column(db.String(30), nullable=False)
+    status          = db.Column(db.String(20), default='pending', nullable=False, index=True)
+    attempts        = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts    = db.Column(db.Integer, default=5, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    locked_by       = db.Column(db.String(100))
+    locked_at       = db.Column(db.DateTime)
+    last_error      = db.Column(db.Text)
+    result          = db.Column(db.Text)
+    created_at      = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at      = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                                 onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    finished_at     = db.Column(db.DateTime)
+
+    inspection = db.relationship(
+        'Inspection',
+        backref=db.backref('completion_jobs', cascade='all, delete-orphan', lazy=True)
+    )
+
+    def to_dict(self):
+        return {
+            'id':              self.id,
+            'inspection_id':   self.inspection_id,
+            'integration':     self.integration,
+            'status':          self.status,
+            'attempts':        self.attempts,
+            'max_attempts':    self.max_attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error':      self.last_error,
+            'result':          self.result,
+            'created_at':      self.created_at.isoformat() if self.created_at else None,
+            'updated_at':      self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at':     self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
 class FloorPlanScan(db.Model):
     """
     One row per scan session uploaded from the mobile app's floor-plan
@@ -450,6 +594,11 @@ class FloorPlanScan(db.Model):
     s3_key         = db.Column(db.String(512))
     frame_count    = db.Column(db.Integer)
     error_message  = db.Column(db.Text)
+    # Computed inspect/render result (services/floorplan_results.py) — JSON,
+    # valid only while geometry_version matches GEOMETRY_VERSION. Deferred:
+    # it includes the rendered SVG, and scan lists never need it.
+    geometry_version = db.Column(db.String(32))
+    geometry         = db.deferred(db.Column(db.Text))
     created_at     = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at     = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
                                 onupdate=lambda: datetime.now(timezone.utc), nullable=False)
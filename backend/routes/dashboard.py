@@ -4,7 +4,7 @@ from models import db, Inspection, Client, Property, User
 from datetime import datetime, date
 from sqlalchemy import or_, func
 from sqlalchemy.orm import joinedload, selectinload, defer
-import time
+from utils.shared_cache import shared_cache
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -13,36 +13,27 @@ dashboard_bp = Blueprint('dashboard', __name__)
 # creates or updates an inspection — not on every page view. Caching per user
 # for 5 minutes means:
 #   • First load: normal DB query (~200–500ms)
-#   • Every subsequent load within 5 min: instant response from memory
+#   • Every subsequent load within 5 min: served from the cache
 # The cache is keyed by user_id so each user sees their own scoped data.
-# Note: each gunicorn worker has its own cache dict; data can be up to
-# 5 min stale in the rare case two workers are used back-to-back. Acceptable.
-_CACHE: dict = {}
+# It lives in utils/shared_cache.py, shared by every gunicorn worker — a
+# write on one worker invalidates the dashboard for all of them, and a page
+# warmed by one worker is a hit on the others.
 _CACHE_TTL = 300  # seconds (5 minutes)
+_CACHE = shared_cache('dashboard', ttl=_CACHE_TTL)
 
 
 def _cache_get(key: str):
-    entry = _CACHE.get(key)
-    if entry and time.monotonic() - entry['ts'] < _CACHE_TTL:
-        return entry['data']
-    return None
+    """(data or None, token) — hand the token back to _cache_set."""
+    return _CACHE.get(key)
 
 
-def _cache_set(key: str, data):
-    _CACHE[key] = {'data': data, 'ts': time.monotonic()}
-    # Evict old entries to prevent unbounded growth (keep most recent 500 users)
-    if len(_CACHE) > 500:
-        oldest = sorted(_CACHE, key=lambda k: _CACHE[k]['ts'])
-        for k in oldest[:100]:
-            _CACHE.pop(k, None)
+def _cache_set(key: str, data, token):
+    _CACHE.set(key, data, token)
 
 
 def invalidate_dashboard_cache(user_id: int | str | None = None):
     """Call this after any write that changes dashboard data."""
-    if user_id is not None:
-        _CACHE.pop(f'dash:{user_id}', None)
-    else:
-        _CACHE.clear()
+    _CACHE.invalidate(f'dash:{user_id}' if user_id is not None else None)
 
 
 @dashboard_bp.route('/stats', methods=['GET'])
@@ -54,7 +45,7 @@ def get_dashboard_stats():
 
     # Return cached response if fresh
     cache_key = f'dash:{user_id}'
-    cached = _cache_get(cache_key)
+    cached, token = _cache_get(cache_key)
     if cached is not None:
         return jsonify(cached)
 
@@ -105,7 +96,7 @@ def get_dashboard_stats():
     # filter adds. defer() strips large TEXT blobs from the SELECT — report_data
     # alone can be MB per row and is never needed by the dashboard serialiser.
     _eager = [
-        defer(Inspection.report_data),
+        defer(Inspection.report_blob),
         selectinload(Inspection.property).options(
             defer(Property.overview_photo),
             selectinload(Property.client).options(
@@ -143,6 +134,7 @@ def get_dashboard_stats():
                 else (i.created_at.isoformat() if i.created_at else None)
             ),
             'inspection_type': i.inspection_type,
+            'has_report_data': i.has_report_data,
         })
 
     # ── Upcoming: role-filtered, conduct_date >= today ───────────────────────
@@ -171,6 +163,7 @@ def get_dashboard_stats():
             'inspector_name':          i.inspector.name if i.inspector else None,
             'typist_name':             i.typist.name if i.typist else None,
             'created_at':              i.created_at.isoformat() if i.created_at else None,
+            'has_report_data':         i.has_report_data,
         })
 
     payload = {
@@ -191,5 +184,5 @@ def get_dashboard_stats():
         'activity': activity_list,
         'upcoming': upcoming_list,
     }
-    _cache_set(cache_key, payload)
+    _cache_set(cache_key, payload, token)
     return jsonify(payload)
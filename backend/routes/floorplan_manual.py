@@ -29,7 +29,7 @@ from flask import Blueprint, request, jsonify, Response
 from flask_jwt_extended import jwt_required
 from models import db, Inspection, FloorPlanLevel, FloorPlanRoom
 from permissions import get_current_user, is_admin_or_manager
-from services.floorplan_render import render_level_svg
+from services.floorplan_levels import level_etag, level_render_key, level_svg
 
 floorplan_manual_bp = Blueprint('floorplan_manual', __name__)
 
@@ -232,18 +232,28 @@ def delete_room(room_id):
 @floorplan_manual_bp.route('/levels/<int:level_id>/render', methods=['GET'])
 @jwt_required()
 def render_level(level_id):
-    """Returns image/svg+xml directly, for direct <img src> / SvgXml use."""
+    """
+    Returns image/svg+xml directly, for direct <img src> / SvgXml use.
+
+    Cached per level revision (see services/floorplan_levels.py) and sent
+    with an ETag; a client revalidating with a matching If-None-Match gets
+    304 without the level being re-rendered.
+    """
     level = FloorPlanLevel.query.get_or_404(level_id)
     error = _authorize_inspection(level.inspection)
     if error:
         return error
 
-    rooms = [
-        {'corners': [tuple(pt) for pt in r.to_dict()['corners']], 'symbols': r.to_dict()['symbols']}
-        for r in level.rooms
-    ]
-    svg = render_level_svg(rooms)
-    if not svg:
-        return jsonify({'error': 'Not enough geometry to render'}), 422
-
-    return Response(svg, mimetype='image/svg+xml')
+    key  = level_render_key(level.id)
+    etag = level_etag(key)
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        svg = level_svg(level, key)
+        if not svg:
+            return jsonify({'error': 'Not enough geometry to render'}), 422
+        resp = Response(svg, mimetype='image/svg+xml')
+
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'private, no-cache'
+    return resp
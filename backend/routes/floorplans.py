@@ -22,52 +22,69 @@ whoever manages the bucket before treating this as a real privacy guarantee.
 There is no backend processing pipeline yet — status only ever moves
 UPLOADING → UPLOADED (or → FAILED). The full plan's QUEUED →
 RECONSTRUCTING → ... → READY_FOR_REVIEW pipeline is unbuilt (Milestone 2+).
+The diagnostic geometry behind inspect/render is computed once per scan
+(in the background when it's marked UPLOADED) and stored on the row — see
+services/floorplan_results.py.
 """
 
-from flask import Blueprint, request, jsonify, Response
+import traceback
+import zipfile
+from datetime import datetime, timezone
+
+from flask import Blueprint, request, jsonify, Response, current_app
 from flask_jwt_extended import jwt_required
 from models import db, Inspection, FloorPlanScan
 from permissions import require_admin_or_manager, get_current_user, is_admin_or_manager
-from utils.s3 import is_configured, new_key, presign_put, download_bytes
-from services.floorplan_processing import parse_scan_package, summarize
-from services.floorplan_geometry import (
-    estimate_room_footprint, summarize_footprint, build_point_cloud, fit_wall_lines,
-    merge_collinear_walls, find_corners,
+from utils.s3 import is_configured, new_key, presign_put
+from services.floorplan_results import (
+    compute_scan_geometry, load_geometry, save_geometry, queue_geometry,
+    scan_tempfile, fetch_scan_package,
 )
-from services.floorplan_render import render_floorplan_svg
 
 floorplans_bp = Blueprint('floorplans', __name__)
 
 
-def _download_and_parse(scan):
-    """Shared by inspect_scan/render_scan: download + parse a scan's zip.
-    Returns (zip_bytes, parsed, None) on success, or (None, None, error_response)."""
+def _scan_geometry(scan):
+    """
+    Shared by inspect_scan/render_scan: the scan's computed geometry (see
+    services/floorplan_results.py). Served from the stored result when
+    there is one; otherwise streams the zip to a temp file, computes it and
+    stores it for next time. Returns (result, None) on success, or
+    (None, error_response).
+    """
     if scan.status != 'UPLOADED' or not scan.s3_key:
-        return None, None, (jsonify({'error': 'Scan has not been successfully uploaded yet'}), 409)
+        return None, (jsonify({'error': 'Scan has not been successfully uploaded yet'}), 409)
+
+    result = load_geometry(scan)
+    if result is not None:
+        return result, None
+    seen = scan.updated_at
+
+    with scan_tempfile() as package:
+        try:
+            fetch_scan_package(scan.s3_key, package)
+        except Exception as e:
+            return None, (jsonify({'error': f'Failed to download scan package: {e}'}), 502)
+
+        try:
+            result = compute_scan_geometry(package)
+        except (ValueError, zipfile.BadZipFile) as e:
+            return None, (jsonify({'error': f'Failed to parse scan package: {e}'}), 422)
+        except Exception:
+            print(f'[floorplans] geometry failed for scan {scan.id}:')
+            print(traceback.format_exc())
+            return None, (jsonify({'error': 'Failed to compute scan geometry'}), 500)
 
     try:
-        zip_bytes = download_bytes(scan.s3_key)
+        if save_geometry(scan, result, seen):
+            db.session.commit()
+        else:
+            db.session.rollback()
+            print(f'[floorplans] scan {scan.id} changed while computing — result not stored')
     except Exception as e:
-        return None, None, (jsonify({'error': f'Failed to download scan package: {e}'}), 502)
-
-    try:
-        parsed = parse_scan_package(zip_bytes)
-    except ValueError as e:
-        return None, None, (jsonify({'error': f'Failed to parse scan package: {e}'}), 422)
-
-    return zip_bytes, parsed, None
-
-
-def _compute_dense_geometry(zip_bytes, parsed):
-    """Shared by inspect_scan/render_scan: point cloud -> walls -> corners."""
-    dense_cloud = build_point_cloud(zip_bytes, parsed, subsample_step=6)
-    dense_raw_walls = fit_wall_lines(
-        [(p.x, p.z) for p in dense_cloud],
-        min_inliers=max(15, len(dense_cloud) // 200),
-    ) if dense_cloud else []
-    dense_walls = merge_collinear_walls(dense_raw_walls)
-    corners = find_corners(dense_walls)
-    return dense_cloud, dense_walls, corners
+        db.session.rollback()
+        print(f'[floorplans] could not store geometry for scan {scan.id}: {e}')
+    return result, None
 
 
 def _can_view_scan_render(user, scan) -> bool:
@@ -156,12 +173,25 @@ def update_scan(scan_id):
         return jsonify({'error': 'status must be "UPLOADED" or "FAILED"'}), 400
 
     scan.status = status
+    # A re-upload to the same key replaces the package — drop any stored result.
+    # updated_at is bumped explicitly (even if nothing else changed) so a
+    # computation already running against the old package can't store its
+    # result afterwards — see floorplan_results.save_geometry.
+    scan.geometry_version = None
+    scan.geometry = None
+    scan.updated_at = datetime.now(timezone.utc)
     if status == 'FAILED':
         scan.error_message = data.get('errorMessage')
     if 'frameCount' in data:
         scan.frame_count = data.get('frameCount')
 
     db.session.commit()
+
+    # The package is final now — compute its geometry ahead of the first
+    # inspect/render view instead of on it.
+    if status == 'UPLOADED' and scan.s3_key:
+        queue_geometry(current_app._get_current_object(), scan.id)
+
     return jsonify(scan.to_dict())
 
 
@@ -200,45 +230,18 @@ def inspect_scan(scan_id):
     per-pixel density amplifies the error. Still computed for older scans
     (not blocked), but don't trust denseWallLines results predating that fix.
 
+    Computed once per scan and served from the stored result afterwards —
+    see _scan_geometry.
+
     Never returns s3_key — see module docstring's privacy note.
     """
     scan = FloorPlanScan.query.get_or_404(scan_id)
 
-    zip_bytes, parsed, error = _download_and_parse(scan)
+    geometry, error = _scan_geometry(scan)
     if error:
         return error
 
-    result = summarize(parsed)
-    result['footprint'] = summarize_footprint(estimate_room_footprint(parsed))
-
-    dense_cloud, dense_walls, dense_corners = _compute_dense_geometry(zip_bytes, parsed)
-
-    result['densePointCount'] = len(dense_cloud)
-    # nearbyConflictM: distance to the closest other wall detection at a
-    # similar orientation that did NOT merge into this one because its
-    # position disagreed too much — a real signal of ARCore pose drift
-    # (a fixed wall seen at different positions across a scan's duration),
-    # not a bug. A wall with a small/absent conflict is confidently placed;
-    # one with a conflict under ~1m should not be trusted as precise until
-    # this pipeline gets drift correction (see merge_collinear_walls docstring).
-    result['denseWallLines'] = [
-        {
-            'x1': w.x1, 'z1': w.z1, 'x2': w.x2, 'z2': w.z2,
-            'inlierCount': w.inlier_count, 'nearbyConflictM': w.nearby_conflict_m,
-        }
-        for w in dense_walls
-    ]
-
-    # Only confidently-placed walls (nearby_conflict_m None or large) are
-    # used — a corner built from a drift-uncertain wall would fabricate
-    # false precision. On a scan with too few confident, perpendicular
-    # walls, this is honestly empty rather than a forced guess.
-    result['denseCorners'] = [
-        {'x': c.x, 'z': c.z, 'wallA': c.wall_a, 'wallB': c.wall_b, 'angleDeg': c.angle_deg}
-        for c in dense_corners
-    ]
-
-    return jsonify(result)
+    return jsonify(geometry['inspect'])
 
 
 @floorplans_bp.route('/scans/<int:scan_id>/render', methods=['GET'])
@@ -266,13 +269,11 @@ def render_scan(scan_id):
     if not _can_view_scan_render(user, scan):
         return jsonify({'error': 'Forbidden'}), 403
 
-    zip_bytes, parsed, error = _download_and_parse(scan)
+    geometry, error = _scan_geometry(scan)
     if error:
         return error
 
-    dense_cloud, dense_walls, corners = _compute_dense_geometry(zip_bytes, parsed)
-
-    svg = render_floorplan_svg(dense_walls, corners, points=dense_cloud)
+    svg = geometry['svg']
     if not svg:
         return jsonify({'error': 'Not enough geometry to render'}), 422
 
@@ -19,8 +19,10 @@ Routes:
 
   GET /api/gallery/<inspection_id>/photo/<n>
       → Binary JPEG for the nth photo in the WHOLE-REPORT flat list
-        (Pillow-compressed to ≤1600 px / quality 82, or ≤320 px / quality 70
-        with ?thumb=1 for the filmstrip). Cached for 1 hour per (n, thumb).
+        (the 'gallery' rendition, ≤1600 px / quality 82, or the 'thumb'
+        rendition, ≤320 px / quality 70, with ?thumb=1 for the filmstrip —
+        see utils/photo_derivatives.py; rendered once and kept in S3).
+        Cached in-process for 1 hour per (n, thumb).
         Uses the report-wide token, not the per-item one.
 
   GET /api/gallery/<inspection_id>/<sid>/<rid>/debug
@@ -34,13 +36,11 @@ Tokens (no login required — HMAC provides security without a session):
     HMAC-SHA256(JWT_SECRET_KEY, "{inspection_id}:report")[:16]
 """
 
-import io
 import os
 import re
 import json
 import hmac
 import hashlib
-import base64 as _b64
 import html as _html
 import time
 from flask import Blueprint, request, abort, make_response
@@ -107,14 +107,14 @@ def _load_report_data(inspection_id, use_cache=True):
     from models import Inspection
     insp = Inspection.query.get_or_404(inspection_id)
 
+    from services.report_store import load_report
     rd = {}
     parse_error = None
-    if insp.report_data:
-        try:
-            rd = json.loads(insp.report_data) if isinstance(insp.report_data, str) else insp.report_data
-        except Exception as e:
-            parse_error = str(e)
-            print(f'[gallery] ERROR parsing report_data for inspection {inspection_id}: {e}')
+    try:
+        rd = load_report(insp)
+    except Exception as e:
+        parse_error = str(e)
+        print(f'[gallery] ERROR parsing report_data for inspection {inspection_id}: {e}')
 
     label = ''
     try:
@@ -264,39 +264,14 @@ def _collect_all_photos(rd):
     return photos
 
 
-def _compress_photo(src: str, max_px: int = 1600, quality: int = 82) -> bytes:
+def _compress_photo(src: str, thumb: bool = False) -> bytes:
     """
-    Decode a photo src (data URI or URL) and compress it with Pillow.
-    Returns JPEG bytes.  Falls back to raw decoded bytes on any Pillow error.
-    max_px/quality are tuned down for filmstrip thumbnails (see ?thumb=1).
+    JPEG bytes for a photo src (data URI or URL): the 'gallery' rendition, or
+    'thumb' for the filmstrip. Served from the persistent derivative store
+    when already rendered; falls back to raw decoded bytes on any Pillow error.
     """
-    if src.startswith('data:'):
-        # Split on the first comma to get the base64 payload
-        _, b64 = src.split(',', 1)
-        # Normalise: strip whitespace, convert URL-safe chars, fix padding
-        b64 = b64.strip().replace('-', '+').replace('_', '/')
-        b64 += '=' * (4 - len(b64) % 4) if len(b64) % 4 else ''
-        data = _b64.b64decode(b64)
-    else:
-        import urllib.request
-        req  = urllib.request.Request(src, headers={'User-Agent': 'InspectPro/1.0'})
-        data = urllib.request.urlopen(req, timeout=10).read()
-
-    try:
-        from PIL import Image as _PILImg, ImageOps
-        pil = _PILImg.open(io.BytesIO(data)).convert('RGB')
-        try:
-            pil = ImageOps.exif_transpose(pil)
-        except Exception:
-            pass
-        w, h = pil.size
-        if w > max_px or h > max_px:
-            pil.thumbnail((max_px, max_px), _PILImg.LANCZOS)
-        out = io.BytesIO()
-        pil.save(out, format='JPEG', quality=quality, optimize=True)
-        return out.getvalue()
-    except Exception:
-        return data
+    from utils.photo_derivatives import get_derivative
+    return get_derivative(src, 'thumb' if thumb else 'gallery')
 
 
 # ── Gallery HTML ──────────────────────────────────────────────────────────────
@@ -490,10 +465,7 @@ def gallery_photo_flat(inspection_id, n):
         abort(404)
 
     try:
-        data = (
-            _compress_photo(all_photos[n]['src'], max_px=320, quality=70) if thumb
-            else _compress_photo(all_photos[n]['src'])
-        )
+        data = _compress_photo(all_photos[n]['src'], thumb=thumb)
     except Exception as e:
         import traceback
         print(f'[gallery] flat photo {n} error: {e}')
@@ -528,15 +500,16 @@ def gallery_debug(inspection_id, sid, rid):
         abort(403)
 
     from models import Inspection
+    from services.report_store import load_sections
     insp = Inspection.query.get_or_404(inspection_id)
 
+    # Only the one section this item lives in is loaded
     rd = {}
     parse_error = None
-    if insp.report_data:
-        try:
-            rd = json.loads(insp.report_data) if isinstance(insp.report_data, str) else insp.report_data
-        except Exception as e:
-            parse_error = str(e)
+    try:
+        rd = load_sections(insp, [str(sid)])
+    except Exception as e:
+        parse_error = str(e)
 
     sid_key      = str(sid)
     rid_key      = str(rid)
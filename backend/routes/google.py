@@ -575,7 +575,7 @@ def drive_force_sync():
         Inspection.query
         .filter(Inspection.status == 'complete')
         .filter(Inspection.updated_at >= since)
-        .filter(Inspection.report_data.isnot(None))
+        .filter(Inspection.has_report())
         .order_by(Inspection.updated_at.desc())
         .limit(100)
         .all()
@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, Inspection, Property, Client, User, Template, Section, Item
 from permissions import get_current_user, require_admin_or_manager, filter_inspections_for_user, is_admin_or_manager, is_client
 from sqlalchemy.orm import joinedload, selectinload, defer
+from utils.shared_cache import shared_cache
 from datetime import datetime
 import json
 import os
@@ -14,34 +15,26 @@ import uuid as _uuid_mod
 
 # ── Inspections list cache ────────────────────────────────────────────────────
 # Keyed per user so role-based filtering is preserved.
-# Busted on any inspection write.
-_INSP_CACHE: dict = {}
+# Shared by all gunicorn workers (utils/shared_cache.py). Inspection writes
+# evict only the entries they can have changed — see _bust_lists().
 _INSP_CACHE_TTL = 300  # 5 minutes
+_INSP_CACHE = shared_cache('inspections', ttl=_INSP_CACHE_TTL)
 
 
 def _insp_cache_get(key: str):
-    entry = _INSP_CACHE.get(key)
-    if entry and time.monotonic() - entry['ts'] < _INSP_CACHE_TTL:
-        return entry['data']
-    return None
+    """(data or None, token) — hand the token back to _insp_cache_set."""
+    return _INSP_CACHE.get(key)
 
 
-def _insp_cache_set(key: str, data):
-    _INSP_CACHE[key] = {'data': data, 'ts': time.monotonic()}
-    if len(_INSP_CACHE) > 500:
-        oldest = sorted(_INSP_CACHE, key=lambda k: _INSP_CACHE[k]['ts'])
-        for k in oldest[:100]:
-            _INSP_CACHE.pop(k, None)
+def _insp_cache_set(key: str, data, token):
+    _INSP_CACHE.set(key, data, token)
 
 
 def invalidate_inspections_cache(user_id=None):
-    if user_id is not None:
-        _INSP_CACHE.pop(f'insp:{user_id}', None)
-    else:
-        _INSP_CACHE.clear()
+    _INSP_CACHE.invalidate(f'insp:{user_id}' if user_id is not None else None)
 
 
-# Bust dashboard + properties + inspections caches after any inspection write
+# Bust dashboard + properties + inspections caches for every user
 def _bust_dashboard():
     try:
         from routes.dashboard import invalidate_dashboard_cache
@@ -56,6 +49,83 @@ def _bust_dashboard():
     invalidate_inspections_cache()
 
 
+# Inspection columns that appear in (or decide visibility in) the cached
+# inspections list and dashboard. Writes that touch none of them — notably the
+# mobile app's report_data syncs — leave those caches alone (has_report_data
+# flips only on a report's first sync). The dashboard activity feed also shows
+# updated_at; that alone is allowed to be up to one TTL stale rather than
+# re-cooling every manager dashboard on each sync.
+_LIST_FIELDS = (
+    'status', 'inspection_type', 'reference_number', 'conduct_date',
+    'conduct_time_preference', 'scheduled_date', 'inspector_id', 'typist_id',
+    'property_id', 'source_inspection_id', 'has_report_data',
+)
+
+
+def _list_snapshot(inspection):
+    """List-visible field values of an inspection (None for no inspection)."""
+    if inspection is None:
+        return None
+    return {f: getattr(inspection, f) for f in _LIST_FIELDS}
+
+
+def _bust_lists(before, after, overview_changed=False):
+    """
+    Evict the cached list/dashboard entries an inspection write can have changed.
+
+    before / after are _list_snapshot()s taken around the write (before=None
+    for a create, after=None for a delete). Only users whose role filter
+    includes the inspection — admins/managers, its clerk and typist (old and
+    new) and the owning client's users — are evicted, and only when a
+    list-visible field changed. The properties list depends on inspections
+    only through clerk visibility (assigned inspections) and the overview
+    photo lifted out of report_data. Falls back to a global bust on error.
+    """
+    lists_changed = before != after
+    if not lists_changed and not overview_changed:
+        return
+    try:
+        from routes.dashboard import invalidate_dashboard_cache
+        from routes.properties import invalidate_properties_cache
+
+        snaps = [snap for snap in (before, after) if snap]
+        property_ids = {snap['property_id'] for snap in snaps if snap['property_id']}
+        clerk_ids = {snap['inspector_id'] for snap in snaps if snap['inspector_id']}
+        staff_ids = clerk_ids | {snap['typist_id'] for snap in snaps if snap['typist_id']}
+        client_ids = set()
+        if property_ids:
+            client_ids = {cid for (cid,) in db.session.query(Property.client_id)
+                          .filter(Property.id.in_(property_ids)) if cid}
+
+        scopes = [User.role.in_(('admin', 'manager'))]
+        if staff_ids:
+            scopes.append(User.id.in_(staff_ids))
+        if client_ids:
+            scopes.append(db.and_(User.role == 'client', User.client_id.in_(client_ids)))
+        viewers = [uid for (uid,) in db.session.query(User.id).filter(db.or_(*scopes))]
+
+        if lists_changed:
+            for uid in viewers:
+                invalidate_inspections_cache(uid)
+                invalidate_dashboard_cache(uid)
+
+        props_users = set()
+        if before is None or after is None or before['inspector_id'] != after['inspector_id'] \
+                or before['property_id'] != after['property_id']:
+            props_users |= clerk_ids
+        if overview_changed:
+            props_users |= set(viewers)
+            if property_ids:
+                props_users |= {iid for (iid,) in db.session.query(Inspection.inspector_id)
+                                .filter(Inspection.property_id.in_(property_ids))
+                                .distinct() if iid}
+        for uid in props_users:
+            invalidate_properties_cache(uid)
+    except Exception as e:
+        print(f'[cache] targeted invalidation failed, clearing all: {e}')
+        _bust_dashboard()
+
+
 # ── Redistribution job store (file-based, same pattern as pdf_import.py) ─────
 # Background AI-redistribution jobs are tracked via JSON files in /tmp so the
 # status endpoint can check them without shared in-process state.
@@ -107,6 +177,7 @@ def inspection_detail(inspection):
         'status': inspection.status,
         'source_inspection_id': inspection.source_inspection_id,
         'report_data': inspection.report_data,
+        'report_version': inspection.report_version or 0,
         'conduct_date': inspection.conduct_date.isoformat() if inspection.conduct_date else None,
         'conduct_time_preference': inspection.conduct_time_preference,
         'scheduled_date': inspection.scheduled_date.isoformat() if inspection.scheduled_date else None,
@@ -207,7 +278,7 @@ def inspection_detail(inspection):
 def get_inspections():
     user = get_current_user()
     cache_key = f'insp:{user.id}'
-    cached = _insp_cache_get(cache_key)
+    cached, token = _insp_cache_get(cache_key)
     if cached is not None:
         return jsonify(cached)
     # Eager-load all relationships accessed in the list serialiser in a single
@@ -220,7 +291,7 @@ def get_inspections():
     # reason. Client.logo / logo_inverted are base64 blobs that appear in
     # every JOIN row and are similarly never needed by the list serialiser.
     eager = Inspection.query.options(
-        defer(Inspection.report_data),
+        defer(Inspection.report_blob),
         joinedload(Inspection.property).options(
             defer(Property.overview_photo),
             joinedload(Property.client).options(
@@ -253,8 +324,9 @@ def get_inspections():
         'conduct_time_preference': i.conduct_time_preference,
         'scheduled_date': i.scheduled_date.isoformat() if i.scheduled_date else None,
         'created_at': i.created_at.isoformat() if i.created_at else None,
+        'has_report_data': i.has_report_data,
     } for i in inspections]
-    _insp_cache_set(cache_key, data)
+    _insp_cache_set(cache_key, data, token)
     return jsonify(data)
 
 
@@ -301,9 +373,16 @@ def get_inspection(inspection_id):
 @inspections_bp.route('/property/<int:property_id>/history', methods=['GET'])
 @jwt_required()
 def get_property_history(property_id):
+    # has_report_data etc. come from the stored report summary columns, so
+    # neither the report nor the template's legacy content blob is loaded.
     inspections = (
         Inspection.query
-        .options(joinedload(Inspection.template))
+        .options(
+            defer(Inspection.report_blob),
+            defer(Inspection.internal_notes),
+            defer(Inspection.notes),
+            joinedload(Inspection.template).load_only(Template.id, Template.name),
+        )
         .filter_by(property_id=property_id)
         .order_by(Inspection.created_at.desc())
         .all()
@@ -316,7 +395,7 @@ def get_property_history(property_id):
         'source_inspection_id': i.source_inspection_id,
         'conduct_date': i.conduct_date.isoformat() if i.conduct_date else None,
         'created_at': i.created_at.isoformat() if i.created_at else None,
-        'has_report_data': bool(i.report_data),
+        **i.report_summary(),
         'template_id': i.template_id,
         'template_name': i.template.name if i.template else None,
     } for i in inspections])
@@ -469,7 +548,6 @@ def create_inspection():
 
     db.session.add(inspection)
     db.session.commit()
-    _bust_dashboard()
 
     # ── Auto-assign reference number if none was provided ─────────────────
     # The ID is only known after the first commit, so we persist it now so
@@ -477,6 +555,7 @@ def create_inspection():
     if not inspection.reference_number:
         inspection.reference_number = f'INS-{inspection.id}'
         db.session.commit()
+    _bust_lists(None, _list_snapshot(inspection))
 
     # ── Master sheet append (fire-and-forget) ────────────────────────────
     # Skip for PDF imports: they are backdated reference inspections, not
@@ -533,7 +612,7 @@ def create_inspection():
             )
             db.session.add(hu)
             db.session.commit()
-            _bust_dashboard()
+            _bust_lists(None, _list_snapshot(hu))
         except Exception as _hu_exc:
             print(f'[heads_up] auto-create failed (non-fatal): {_hu_exc}')
 
@@ -541,15 +620,13 @@ def create_inspection():
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# PUT /api/inspections/<id>  — update inspection
+# report_data side effects — shared by the full PUT and the delta PATCH
 # ─────────────────────────────────────────────────────────────────────────────
-@inspections_bp.route('/<int:inspection_id>', methods=['PUT'])
-@jwt_required()
-def update_inspection(inspection_id):
-    user = get_current_user()
-    inspection = Inspection.query.get_or_404(inspection_id)
-    data = request.json
-    _sheets_warning = None
+def _write_denied(user, inspection):
+    """
+    Role checks for writing an inspection (full PUT and report_data PATCH).
+    Returns an error response tuple, or None when the write is allowed.
+    """
     # Clients cannot modify inspections via the API
     if user.role == 'client':
         return jsonify({'error': 'Forbidden'}), 403
@@ -563,10 +640,102 @@ def update_inspection(inspection_id):
             return jsonify({'error': 'Forbidden'}), 403
         if inspection.status not in ('assigned', 'active', 'review'):
             return jsonify({'error': 'Clerks can only edit reports in assigned, active or review stage'}), 403
-    # Typists can only update report_data and move to review on their own processing inspections
+    # Typists can only write their own inspections in the Processing stage
     if user.role == 'typist':
         if inspection.typist_id != user.id or inspection.status != 'processing':
             return jsonify({'error': 'Forbidden'}), 403
+    return None
+
+
+def _lift_report_side_data(inspection, rd, keys=None):
+    """
+    Persist the parts of a freshly-synced report_data that live outside it:
+    the property overview photo and in-person signatures. `rd` is the parsed
+    report; `keys` limits the work to the top-level keys a delta touched
+    (None = full upload). Returns True when the property's overview photo changed.
+    """
+    overview_changed = False
+    if not isinstance(rd, dict):
+        return overview_changed
+
+    # ── Extract overview photo from report_data and save to property ──────
+    # The mobile app stores the property overview photo inside report_data
+    # at _overview.items.photo.uri — either a base64 data URI (legacy) or
+    # an S3 HTTPS URL (new flow).  Lift it out and persist on the Property
+    # so the web app can display it regardless of which format was used.
+    if keys is None or '_overview' in keys:
+        try:
+            overview_uri = (rd.get('_overview') or {}).get('items', {}).get('photo', {}).get('uri', '')
+            if overview_uri and (overview_uri.startswith('data:') or overview_uri.startswith('https://')) and inspection.property:
+                if inspection.property.overview_photo != overview_uri:
+                    inspection.property.overview_photo = overview_uri
+                    overview_changed = True
+        except Exception as _ov_err:
+            print(f'[sync] overview photo extraction failed (non-fatal): {_ov_err}')
+
+    # ── Lift in-person signatures out of report_data and persist to DB ──────
+    # The mobile app stores captured signatures at report_data._signatures as:
+    # { clerk: { signer_name, signature_data, signed_at },
+    #   tenant: { ... }, landlord_agent: { ... } }
+    if keys is None or '_signatures' in keys:
+        try:
+            from models import InspectionSignature
+            from datetime import datetime as _dt
+            _sigs_blob = rd.get('_signatures') or {}
+            # Use a savepoint so a failure here only rolls back the signature
+            # writes — it must NOT roll back the status change or other field
+            # updates already pending in the session.
+            with db.session.begin_nested():
+                for _role, _sd in _sigs_blob.items():
+                    if _role not in ('clerk', 'tenant', 'landlord_agent'):
+                        continue
+                    if not (_sd or {}).get('signature_data'):
+                        continue
+                    # Replace any existing in-person record for this role
+                    existing_sig = InspectionSignature.query.filter_by(
+                        inspection_id=inspection.id, role=_role, method='in_person'
+                    ).first()
+                    if existing_sig:
+                        db.session.delete(existing_sig)
+                    _signed_at = None
+                    try:
+                        _signed_at = _dt.fromisoformat(_sd['signed_at'])
+                    except Exception:
+                        _signed_at = _dt.utcnow()
+                    db.session.add(InspectionSignature(
+                        inspection_id  = inspection.id,
+                        role           = _role,
+                        signer_name    = _sd.get('signer_name', ''),
+                        signature_data = _sd['signature_data'],
+                        signed_at      = _signed_at,
+                        method         = 'in_person',
+                    ))
+        except Exception as _sig_err:
+            print(f'[sync] signature extraction failed (non-fatal): {_sig_err}')
+
+    return overview_changed
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PUT /api/inspections/<id>  — update inspection
+# ─────────────────────────────────────────────────────────────────────────────
+@inspections_bp.route('/<int:inspection_id>', methods=['PUT'])
+@jwt_required()
+def update_inspection(inspection_id):
+    user = get_current_user()
+    data = request.json
+    query = Inspection.query.filter_by(id=inspection_id)
+    if 'report_data' in data:
+        # Same row lock as PATCH /report-data — a full replace and a delta
+        # must not both commit the same report_version
+        query = query.with_for_update()
+    inspection = query.first_or_404()
+    _sheets_warning = None
+    denied = _write_denied(user, inspection)
+    if denied:
+        return denied
+    # Typists can only update report_data and move to review
+    if user.role == 'typist':
         allowed_keys = {'report_data', 'status'}
         if not set(data.keys()).issubset(allowed_keys):
             return jsonify({'error': 'Typists can only update report data and status'}), 403
@@ -603,6 +772,9 @@ def update_inspection(inspection_id):
             # Malformed timestamp — skip conflict check rather than blocking sync
             print(f'[conflict] could not parse client_updated_at: {_cua_err}')
 
+    list_before = _list_snapshot(inspection)
+    overview_changed = False
+
     going_complete = (
         'status' in data and
         data['status'] == 'complete' and
@@ -705,65 +877,25 @@ def update_inspection(inspection_id):
             _sheets_debug = {'ok': False, 'detail': str(_inv_exc)}
             print(f'[sheets] invoice_paid sync exception (non-fatal): {_inv_exc}')
     if 'report_data' in data:
-        inspection.report_data = data['report_data']
-        # ── Extract overview photo from report_data and save to property ──────
-        # The mobile app stores the property overview photo inside report_data
-        # at _overview.items.photo.uri — either a base64 data URI (legacy) or
-        # an S3 HTTPS URL (new flow).  Lift it out and persist on the Property
-        # so the web app can display it regardless of which format was used.
+        # Parse once: stored per section (only changed sections are written)
+        # and reused for the overview photo / signature lift-outs
+        from services.report_store import store_report
         try:
             rd = json.loads(data['report_data']) if isinstance(data['report_data'], str) else data['report_data']
-            overview_uri = (rd.get('_overview') or {}).get('items', {}).get('photo', {}).get('uri', '')
-            if overview_uri and (overview_uri.startswith('data:') or overview_uri.startswith('https://')) and inspection.property:
-                inspection.property.overview_photo = overview_uri
-        except Exception as _ov_err:
-            print(f'[sync] overview photo extraction failed (non-fatal): {_ov_err}')
-
-        # ── Lift in-person signatures out of report_data and persist to DB ──────
-        # The mobile app stores captured signatures at report_data._signatures as:
-        # { clerk: { signer_name, signature_data, signed_at },
-        #   tenant: { ... }, landlord_agent: { ... } }
-        try:
-            from models import InspectionSignature
-            from datetime import datetime as _dt
-            rd_sigs = json.loads(data['report_data']) if isinstance(data['report_data'], str) else data['report_data']
-            _sigs_blob = rd_sigs.get('_signatures') or {}
-            # Use a savepoint so a failure here only rolls back the signature
-            # writes — it must NOT roll back the status change or other field
-            # updates already pending in the session.
-            with db.session.begin_nested():
-                for _role, _sd in _sigs_blob.items():
-                    if _role not in ('clerk', 'tenant', 'landlord_agent'):
-                        continue
-                    if not (_sd or {}).get('signature_data'):
-                        continue
-                    # Replace any existing in-person record for this role
-                    existing_sig = InspectionSignature.query.filter_by(
-                        inspection_id=inspection_id, role=_role, method='in_person'
-                    ).first()
-                    if existing_sig:
-                        db.session.delete(existing_sig)
-                    _signed_at = None
-                    try:
-                        _signed_at = _dt.fromisoformat(_sd['signed_at'])
-                    except Exception:
-                        _signed_at = _dt.utcnow()
-                    db.session.add(InspectionSignature(
-                        inspection_id  = inspection_id,
-                        role           = _role,
-                        signer_name    = _sd.get('signer_name', ''),
-                        signature_data = _sd['signature_data'],
-                        signed_at      = _signed_at,
-                        method         = 'in_person',
-                    ))
-        except Exception as _sig_err:
-            print(f'[sync] signature extraction failed (non-fatal): {_sig_err}')
+        except Exception as _rd_err:
+            print(f'[sync] report_data parse failed (non-fatal): {_rd_err}')
+            rd = None
+        if isinstance(rd, dict):
+            store_report(inspection, rd)
+        else:
+            inspection.report_data = data['report_data']
+        overview_changed = _lift_report_side_data(inspection, rd)
 
     # ── Commit all field changes first ───────────────────────────────────────
     # Status is saved before PDF generation so a slow/failing PDF never blocks
     # or rolls back the status update.
     db.session.commit()
-    _bust_dashboard()
+    _bust_lists(list_before, _list_snapshot(inspection), overview_changed)
 
     # ── Sync Google Sheets + Calendar when scheduling fields change ─────────
     _SYNC_FIELDS = {'conduct_date', 'inspector_id', 'inspection_type',
@@ -786,159 +918,25 @@ def update_inspection(inspection_id):
         except Exception as _cal_exc:
             print(f'[calendar] non-fatal exception: {_cal_exc}')
 
-    # ── Generate PDF and email in a background thread ────────────────────────
-    # Runs after commit and completely outside the HTTP request so the client
-    # gets an immediate 200 and the worker is never killed by a slow PDF build.
+    # ── Queue PDF / email / Depositary / Drive delivery ──────────────────────
+    # Runs after commit and completely outside the HTTP request: one durable
+    # CompletionJob row per integration, drained by completion_worker.py
+    # (services/completion_jobs.py) with retries — the client gets an
+    # immediate 200 and a deploy can no longer drop the completion email.
     if going_complete:
-        from flask import current_app
-        import threading
-
-        # Snapshot values needed in the thread before the request context closes
-        _app        = current_app._get_current_object()
-        _insp_id    = inspection_id
-        _prop_addr  = inspection.property.address if inspection.property else 'unknown'
-        _cli_email  = inspection.client_email_override
-        _ten_email  = inspection.tenant_email
-
-        def _generate_and_send():
-            with _app.app_context():
-                try:
-                    from models import db as _db, Inspection as _Inspection
-                    insp   = _db.session.get(_Inspection, _insp_id)
-                    if not insp:
-                        print(f'[pdf] inspection {_insp_id} not found in background thread')
-                        return
-
-                    prop   = insp.property
-                    client = prop.client if prop else None
-
-                    print(f'[pdf] ── background thread: inspection {_insp_id} ──')
-                    print(f'[pdf]   address        : {_prop_addr}')
-                    print(f'[pdf]   client         : {client.name if client else "NONE"}')
-                    print(f'[pdf]   client email   : {client.email if client else "NONE"}')
-                    print(f'[pdf]   email override : {insp.client_email_override!r}')
-                    print(f'[pdf]   tenant email   : {insp.tenant_email!r}')
-
-                    from routes.pdf_generator import generate_inspection_pdf, _get_report_recipients
-                    recipients = _get_report_recipients(insp)
-                    print(f'[pdf]   recipients     : {recipients}')
-
-                    # Generate PDF (always — Drive upload + Depositary also need it)
-                    pdf_bytes = generate_inspection_pdf(_insp_id)
-                    print(f'[pdf] PDF generated OK — {len(pdf_bytes)} bytes')
-
-                    # ── Auto email — only on first completion ─────────
-                    # If completion_email_sent is already True the inspection was
-                    # previously completed, emailed, then re-opened for edits.
-                    # Skip the auto send so the client only ever receives one
-                    # automatic email; any subsequent sends are via Share PDF.
-                    if insp.completion_email_sent:
-                        print(f'[pdf] auto email suppressed — already sent for inspection {_insp_id}')
-                    else:
-                        if not recipients:
-                            print(f'[pdf] WARNING: no recipients resolved — set client email, email override, or tenant email on the inspection.')
-                        else:
-                            # Send — use client object if available; fall back to a stub so the
-                            # email body still renders when client relationship can't be loaded.
-                            from routes.email_service import send_report_complete
-                            effective_client = client
-                            if not effective_client:
-                                class _StubClient:
-                                    name    = 'Client'
-                                    email   = ''
-                                    company = ''
-                                    logo    = None
-                                    primary_color            = '#1E3A8A'
-                                    report_color_override    = None
-                                    report_header_text_color = '#FFFFFF'
-                                    report_body_text_color   = '#1e293b'
-                                    report_orientation       = 'portrait'
-                                    report_disclaimer        = ''
-                                effective_client = _StubClient()
-                                print(f'[pdf] WARNING: no client object — using stub for email body')
-
-                            # ── Large-PDF handling ──────────────────────────
-                            # Resend's limit is 40 MB total (content + attachments).
-                            # A 30 MB PDF encodes to ~40 MB in base64, so we upload
-                            # anything over 25 MB to S3 and send a download link.
-                            _PDF_ATTACH_LIMIT = 25 * 1024 * 1024  # 25 MB
-                            _pdf_dl_url = None
-                            if len(pdf_bytes) > _PDF_ATTACH_LIMIT:
-                                print(f'[pdf] PDF is {len(pdf_bytes)//1024//1024} MB — uploading to S3 for download link')
-                                try:
-                                    from utils.s3 import is_configured as s3_ok, upload_bytes, presign_get, new_key
-                                    if s3_ok():
-                                        import datetime as _dt
-                                        _key = f"reports/inspection-{_insp_id}-{_dt.datetime.now(_dt.timezone.utc).strftime('%Y%m%d%H%M%S')}.pdf"
-                                        upload_bytes(pdf_bytes, _key, content_type='application/pdf')
-                                        _pdf_dl_url = presign_get(_key, expires=604800)  # 7 days (AWS S3 maximum)
-                                        print(f'[pdf] S3 upload OK — presigned URL generated (7-day expiry)')
-                                    else:
-                                        print(f'[pdf] WARNING: PDF too large for email and S3 is not configured — will attempt attachment anyway')
-                                except Exception as _s3_err:
-                                    print(f'[pdf] S3 upload failed (non-fatal): {_s3_err} — will attempt attachment anyway')
-
-                            ok, err = send_report_complete(
-                                insp, effective_client, prop,
-                                pdf_bytes  = None if _pdf_dl_url else pdf_bytes,
-                                recipients = recipients,
-                                pdf_download_url = _pdf_dl_url,
-                            )
-                            if ok:
-                                print(f'[pdf] email sent OK → {recipients}')
-                                # Mark so re-completions don't trigger another auto email
-                                insp.completion_email_sent = True
-                                db.session.commit()
-                            else:
-                                print(f'[pdf] email FAILED: {err}')
-                                if 'credentials not configured' in str(err):
-                                    print(f'[pdf] ACTION REQUIRED: set SMTP_USER and SMTP_PASSWORD in Railway environment variables')
-
-                    # ── Push to The Depositary (check_out inspections only) ────
-                    if insp.inspection_type == 'check_out':
-                        try:
-                            from services.depositary import push_checkout, is_configured
-                            if is_configured():
-                                print(f'[depositary] pushing checkout for inspection {_insp_id}...')
-                                dep_ok, dep_result = push_checkout(insp, pdf_bytes)
-                                if dep_ok:
-                                    print(f'[depositary] push OK — tenancy_id={dep_result}')
-                                else:
-                                    print(f'[depositary] push FAILED: {dep_result}')
-                            else:
-                                print(f'[depositary] not configured — skipping push (set depositary_api_url + depositary_api_key in Settings → Integrations to enable)')
-                        except Exception as dep_err:
-                            print(f'[depositary] push error (non-fatal): {dep_err}')
-
-                    # ── Upload PDF to Google Drive (all inspection types) ─────
-                    try:
-                        from services.google_drive import upload_report, is_drive_connected
-                        if is_drive_connected():
-                            print(f'[google_drive] uploading PDF for inspection {_insp_id}...')
-                            drive_ok, drive_result = upload_report(insp, pdf_bytes)
-                            if drive_ok:
-                                print(f'[google_drive] upload OK — {drive_result["url"]}')
-                                insp.drive_file_id = drive_result['file_id']
-                                db.session.commit()
-                            else:
-                                print(f'[google_drive] upload FAILED: {drive_result}')
-                        else:
-                            print(f'[google_drive] not connected — skipping upload')
-                    except Exception as drive_err:
-                        print(f'[google_drive] upload error (non-fatal): {drive_err}')
-
-                except Exception:
-                    import traceback
-                    print(f'[pdf] EXCEPTION in background PDF thread:')
-                    print(traceback.format_exc())
-
-        # daemon=False — thread must finish before worker exits, so the SMTP send completes.
-        # The 30-second timeout in _send() prevents it from hanging forever.
-        threading.Thread(target=_generate_and_send, daemon=False).start()
+        try:
+            from services.completion_jobs import enqueue_completion
+            enqueue_completion(inspection)
+        except Exception as _q_exc:
+            import traceback
+            print(f'[completion] failed to queue jobs for inspection {inspection_id}: {_q_exc}')
+            print(traceback.format_exc())
+            db.session.rollback()
 
     resp = {
-        'message':    'Inspection updated',
-        'updated_at': inspection.updated_at.isoformat() if inspection.updated_at else None,
+        'message':        'Inspection updated',
+        'updated_at':     inspection.updated_at.isoformat() if inspection.updated_at else None,
+        'report_version': inspection.report_version or 0,
     }
     if _sheets_warning:
         resp['sheets_warning'] = _sheets_warning
@@ -947,6 +945,91 @@ def update_inspection(inspection_id):
     return jsonify(resp)
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# PATCH /api/inspections/<id>/report-data  — delta sync
+# The mobile app uploads only what changed since the report_version it last
+# saw, instead of re-sending the whole (multi-MB) report_data blob:
+#   { "base_version": 12,
+#     "ops":      [ {"op": "replace", "path": "/kitchen/items/oven/condition", "value": "Good"} ],
+#     "sections": { "bathroom": {...}, "_oldRoom": null } }
+# `ops` is a JSON Patch (utils/json_patch.py); `sections` replaces whole
+# top-level keys (null removes one). Either or both may be sent; sections are
+# applied first. A stale base_version gets 409 with the current version — the
+# app then re-downloads (or falls back to a full PUT) before retrying.
+# ─────────────────────────────────────────────────────────────────────────────
+@inspections_bp.route('/<int:inspection_id>/report-data', methods=['PATCH'])
+@jwt_required()
+def patch_report_data(inspection_id):
+    from utils.json_patch import apply_patch, touched_keys, PatchError
+    from services.report_store import load_sections, write_sections
+
+    user = get_current_user()
+    # Row lock: concurrent deltas against the same base serialise here, and the
+    # second one sees the bumped version and gets a 409 instead of a lost update.
+    inspection = (Inspection.query.filter_by(id=inspection_id)
+                  .with_for_update().first_or_404())
+    denied = _write_denied(user, inspection)
+    if denied:
+        db.session.rollback()
+        return denied
+
+    data = request.get_json(silent=True) or {}
+    ops      = data.get('ops') or []
+    sections = data.get('sections') or {}
+    base_version = data.get('base_version')
+    current = inspection.report_version or 0
+    if not isinstance(base_version, int) or isinstance(base_version, bool):
+        db.session.rollback()
+        return jsonify({'error': 'base_version (integer) is required'}), 400
+    if not isinstance(sections, dict):
+        db.session.rollback()
+        return jsonify({'error': 'sections must be an object'}), 400
+    if base_version != current:
+        db.session.rollback()
+        return jsonify({
+            'error':          'report_data has changed since base_version — re-download before syncing',
+            'report_version': current,
+        }), 409
+    if not ops and not sections:
+        db.session.rollback()
+        return jsonify({'report_version': current,
+                        'updated_at': inspection.updated_at.isoformat() if inspection.updated_at else None})
+
+    # Only the top-level sections the delta touches are loaded and written
+    try:
+        touched = set(sections) | touched_keys(ops)
+        rd = load_sections(inspection, touched)
+    except PatchError as e:
+        db.session.rollback()
+        return jsonify({'error': f'Invalid patch: {e}'}), 422
+    except (ValueError, TypeError):
+        db.session.rollback()
+        return jsonify({'error': 'Stored report_data is not valid JSON — use a full sync'}), 409
+
+    for key, value in sections.items():
+        if value is None:
+            rd.pop(key, None)
+        else:
+            rd[key] = value
+    try:
+        apply_patch(rd, ops)
+    except PatchError as e:
+        db.session.rollback()
+        return jsonify({'error': f'Invalid patch: {e}'}), 422
+
+    list_before = _list_snapshot(inspection)
+    write_sections(inspection, {k: rd[k] for k in touched if k in rd},
+                   removed=touched - set(rd))
+    overview_changed = _lift_report_side_data(inspection, rd, keys=touched)
+    db.session.commit()
+    _bust_lists(list_before, _list_snapshot(inspection), overview_changed)
+
+    return jsonify({
+        'report_version': inspection.report_version,
+        'updated_at':     inspection.updated_at.isoformat() if inspection.updated_at else None,
+    })
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # DELETE /api/inspections/<id>
 # ─────────────────────────────────────────────────────────────────────────────
@@ -985,9 +1068,10 @@ def delete_inspection(inspection_id):
     except Exception as _sheets_exc:
         print(f'[sheets] delete row error (non-fatal): {_sheets_exc}')
 
+    list_before = _list_snapshot(inspection)
     db.session.delete(inspection)
     db.session.commit()
-    _bust_dashboard()
+    _bust_lists(list_before, None)
     return '', 204
 
 
@@ -1007,6 +1091,44 @@ def seed_preview(inspection_id):
     return jsonify({'seeded': seeded, 'source_type': source.inspection_type, 'source_template_id': source.template_id})
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# GET  /api/inspections/<id>/completion-jobs
+# POST /api/inspections/<id>/completion-jobs/retry
+#
+# Status of the post-completion deliveries (email / Depositary / Drive) queued
+# by update_inspection() and run by completion_worker.py, and a manual re-queue
+# of any that ended 'failed'.
+# ─────────────────────────────────────────────────────────────────────────────
+@inspections_bp.route('/<int:inspection_id>/completion-jobs', methods=['GET'])
+@jwt_required()
+@require_admin_or_manager
+def completion_jobs_status(inspection_id):
+    from models import CompletionJob
+    Inspection.query.get_or_404(inspection_id)
+    jobs = (CompletionJob.query
+            .filter_by(inspection_id=inspection_id)
+            .order_by(CompletionJob.created_at.desc(), CompletionJob.id.desc())
+            .all())
+    return jsonify({'jobs': [j.to_dict() for j in jobs]})
+
+
+@inspections_bp.route('/<int:inspection_id>/completion-jobs/retry', methods=['POST'])
+@jwt_required()
+@require_admin_or_manager
+def completion_jobs_retry(inspection_id):
+    from models import CompletionJob
+    from datetime import timezone as _tz
+    Inspection.query.get_or_404(inspection_id)
+    failed = CompletionJob.query.filter_by(inspection_id=inspection_id, status='failed').all()
+    for job in failed:
+        job.status          = 'pending'
+        job.attempts        = 0
+        job.next_attempt_at = datetime.now(_tz.utc)
+        job.finished_at     = None
+    db.session.commit()
+    return jsonify({'requeued': [j.id for j in failed]})
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # GET /api/inspections/<id>/preview-pdf
 #
@@ -2379,6 +2501,7 @@ def apply_source_inspection(inspection_id, source_id):
     if not source.report_data:
         return jsonify({'error': 'Source inspection has no report data'}), 400
 
+    list_before = _list_snapshot(inspection)
     inspection.template_id         = source.template_id
     inspection.source_inspection_id = source_id
 
@@ -2401,7 +2524,7 @@ def apply_source_inspection(inspection_id, source_id):
         inspection.report_data = source.report_data
 
     db.session.commit()
-    _bust_dashboard()
+    _bust_lists(list_before, _list_snapshot(inspection))
 
     print(f'[apply-source] inspection {inspection_id} ← source {source_id} '
           f'(template {source.template_id}, type now {inspection.inspection_type})')
@@ -18,11 +18,29 @@ import json
 import os
 import hmac as _hmac
 import hashlib
+import threading
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from utils.disk_cache import DiskCache
+
 APP_BASE_URL = os.environ.get('APP_BASE_URL', 'https://app.lminventories.co.uk')
 
+# Concurrent photo downloads during the prefetch stage of a PDF build.
+IMAGE_PREFETCH_WORKERS = int(os.environ.get('PDF_IMAGE_PREFETCH_WORKERS', '8'))
+
+# Rendered-PDF artifact cache — local disk shared by all gunicorn workers.
+PDF_CACHE_DIR       = os.environ.get('PDF_CACHE_DIR', '/tmp/pdf_cache')
+PDF_CACHE_TTL_SECS  = int(os.environ.get('PDF_CACHE_TTL_DAYS', '7')) * 86400
+PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_MB', '512')) * 1024 * 1024
+_PDF_CACHE = DiskCache(PDF_CACHE_DIR, '.pdf', ttl=PDF_CACHE_TTL_SECS,
+                       max_bytes=PDF_CACHE_MAX_BYTES, tag='pdf')
+
+# Lay the story out once and back-fill Contents page numbers at save time
+# (see _PDFBuilder._build_single_pass). Set to 0 to use the legacy two-pass build.
+PDF_SINGLE_PASS = os.environ.get('PDF_SINGLE_PASS', '1') != '0'
+
 from models import db, Inspection
 
 # ── ReportLab imports ─────────────────────────────────────────────────────────
@@ -38,13 +56,15 @@ from reportlab.platypus import (
 )
 from reportlab.platypus.flowables import HRFlowable, Flowable
 from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen.canvas import Canvas
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Public entry point
 # ─────────────────────────────────────────────────────────────────────────────
 
-def generate_inspection_pdf(inspection_id: int, deadline: float = None) -> bytes:
+def generate_inspection_pdf(inspection_id: int, deadline: float = None,
+                            use_cache: bool = True) -> bytes:
     """
     Generate a PDF for the given inspection and return raw bytes.
     Raises ValueError if the inspection doesn't exist.
@@ -52,13 +72,114 @@ def generate_inspection_pdf(inspection_id: int, deadline: float = None) -> bytes
     deadline: monotonic timestamp (time.monotonic()) after which image fetches
     are skipped rather than attempted. Pass this when calling from a
     time-limited context (e.g. force-sync) to avoid worker timeouts.
+
+    use_cache: serve / store the rendered bytes in the artifact cache keyed by
+    pdf_fingerprint(). A build that dropped any photo (timeout, deadline,
+    fetch error) is never stored, so a later request gets a clean retry.
     """
     inspection = db.session.get(Inspection, inspection_id)
     if not inspection:
         raise ValueError(f'Inspection {inspection_id} not found')
 
+    key = None
+    if use_cache:
+        try:
+            key = pdf_fingerprint(inspection)
+            cached = _PDF_CACHE.get(key)
+            if cached is not None:
+                print(f'[pdf] inspection {inspection_id}: served from artifact cache')
+                return cached
+        except Exception as e:
+            print(f'[pdf] artifact cache lookup failed (non-fatal): {e}')
+            key = None
+
     builder = _PDFBuilder(inspection, deadline=deadline)
-    return builder.build()
+    pdf_bytes = builder.build()
+    if key and not builder._img_skipped:
+        _PDF_CACHE.put(key, pdf_bytes)
+    return pdf_bytes
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rendered-PDF artifact cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Any edit to this module changes the rendered output, so its source is part
+# of every cache key — no manual version bump needed after a deploy.
+with open(__file__, 'rb') as _src:
+    _GENERATOR_VERSION = hashlib.sha256(_src.read()).hexdigest()[:16]
+
+
+# Exactly what _PDFBuilder reads, per source. Deliberately a whitelist:
+# bookkeeping columns (updated_at, delivery_status, completion_email_sent,
+# report_version, …) and rows like the hourly-refreshed Google OAuth tokens
+# change without changing the output, and would invalidate every cached PDF.
+_FP_INSPECTION = ('id', 'inspection_type', 'conduct_date', 'scheduled_date',
+                  'tenant_name', 'tenant_email')
+_FP_PROPERTY   = ('id', 'address', 'overview_photo', 'property_type', 'bedrooms', 'bathrooms')
+_FP_CLIENT     = ('id', 'name', 'email', 'company', 'logo', 'primary_color', 'report_disclaimer',
+                  'report_color_override', 'report_header_text_color', 'report_body_text_color',
+                  'report_orientation', 'report_photo_settings', 'invert_logo')
+_FP_SECTION    = ('id', 'name', 'section_type', 'order_index')
+_FP_ITEM       = ('id', 'name', 'description', 'requires_condition', 'order_index')
+_FP_SIGNATURE  = ('id', 'role', 'method', 'signer_name', 'signature_data', 'signed_at')
+_FP_SETTINGS   = ('logo', 'logo_inverted', 'aiic_logo', 'email', 'report_disclaimer',
+                  'actions_config', 'fixed_sections', 'midterm_sections', 'heads_up_sections')
+
+
+def _row_values(row, fields) -> dict:
+    """The given attributes of an ORM row (None-safe)."""
+    if row is None:
+        return {}
+    return {f: getattr(row, f, None) for f in fields}
+
+
+def pdf_fingerprint(inspection) -> str:
+    """
+    Content hash of everything the rendered PDF depends on: report_data, the
+    render-relevant inspection / property / client columns (the _FP_*
+    whitelists), the clerk's name, the template's sections and items,
+    signatures, the branding and fixed-section system settings, and the
+    generator version.
+    """
+    from models import SystemSetting, InspectionSignature
+    from services.report_store import load_report
+    prop   = inspection.property
+    client = prop.client if prop else None
+    tmpl   = inspection.template
+    sections = []
+    if tmpl:
+        for sec in sorted(tmpl.sections or [], key=lambda x: x.id):
+            sections.append({
+                'section': _row_values(sec, _FP_SECTION),
+                'items':   [_row_values(it, _FP_ITEM) for it in sorted(sec.items or [], key=lambda x: x.id)],
+            })
+    signatures = (InspectionSignature.query
+                  .filter_by(inspection_id=inspection.id)
+                  .order_by(InspectionSignature.id).all())
+    settings = (SystemSetting.query
+                .filter(SystemSetting.key.in_(_FP_SETTINGS))
+                .order_by(SystemSetting.key).all())
+    try:
+        report = load_report(inspection)
+    except (ValueError, TypeError):
+        report = inspection.report_blob
+
+    payload = {
+        'generator':  _GENERATOR_VERSION,
+        'app_base':   APP_BASE_URL,
+        'report':     report,
+        'inspection': _row_values(inspection, _FP_INSPECTION),
+        'property':   _row_values(prop, _FP_PROPERTY),
+        'client':     _row_values(client, _FP_CLIENT),
+        'inspector':  inspection.inspector.name if inspection.inspector else None,
+        'template':   tmpl.id if tmpl else None,
+        'sections':   sections,
+        'signatures': [_row_values(sig, _FP_SIGNATURE) for sig in signatures],
+        'settings':   {r.key: r.value for r in settings},
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -98,33 +219,6 @@ _RED_TXT    = colors.HexColor('#991b1b')
 # Fetch image bytes from URL
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _compress_image(data: bytes, max_px: int = 900, quality: int = 65) -> bytes:
-    """
-    Resize and re-compress image bytes with Pillow before embedding in PDF.
-    Keeps peak memory low — a 5 MB phone JPEG becomes ~80 KB after this.
-    Falls back to the original bytes if Pillow is unavailable or the image
-    can't be decoded (e.g. corrupt data).
-    """
-    try:
-        from PIL import Image as _PILImage
-        pil = _PILImage.open(io.BytesIO(data))
-        pil = pil.convert('RGB')
-        # Preserve EXIF orientation so photos aren't rotated in the PDF
-        try:
-            from PIL import ImageOps
-            pil = ImageOps.exif_transpose(pil)
-        except Exception:
-            pass
-        w, h = pil.size
-        if w > max_px or h > max_px:
-            pil.thumbnail((max_px, max_px), _PILImage.LANCZOS)
-        out = io.BytesIO()
-        pil.save(out, format='JPEG', quality=quality, optimize=True)
-        return out.getvalue()
-    except Exception:
-        return data
-
-
 def _load_image_bytes(url_or_data: str) -> bytes:
     """
     Load image bytes from either:
@@ -142,33 +236,6 @@ def _load_image_bytes(url_or_data: str) -> bytes:
         return urllib.request.urlopen(req, timeout=8).read()
 
 
-def _fetch_image(url: str, max_w_mm: float, max_h_mm: float, link_url: str = None):
-    if not url:
-        return None
-    try:
-        if url.startswith('data:'):
-            # Base64 data URI — decode directly (used for photos synced from mobile)
-            import base64 as _b64
-            _, b64data = url.split(',', 1)
-            data = _b64.b64decode(b64data)
-        else:
-            req  = urllib.request.Request(url, headers={'User-Agent': 'InspectPro/1.0'})
-            data = urllib.request.urlopen(req, timeout=8).read()
-        data = _compress_image(data)
-        buf  = io.BytesIO(data)
-        img  = RLImage(buf)
-        w_pt = max_w_mm * mm
-        h_pt = max_h_mm * mm
-        scale = min(w_pt / img.drawWidth, h_pt / img.drawHeight, 1.0)
-        img.drawWidth  *= scale
-        img.drawHeight *= scale
-        if link_url:
-            return _ClickableImage(img, link_url)
-        return img
-    except Exception:
-        return None
-
-
 # ─────────────────────────────────────────────────────────────────────────────
 # Coloured header-bar flowable
 # ─────────────────────────────────────────────────────────────────────────────
@@ -187,6 +254,30 @@ class _Anchor(Flowable):
         self.canv.bookmarkHorizontal(self.name, 0, 0)
 
 
+class _PageRef(Flowable):
+    """
+    Contents-table page number that is only known once layout has finished.
+    Draws a named form XObject; the single-pass build defines every form just
+    before the canvas is saved (ReportLab resolves forward form references at
+    save time), so the Contents page needs no second layout pass.
+    """
+    def __init__(self, anchor, style, registry):
+        super().__init__()
+        self.anchor    = anchor
+        self.style     = style
+        self.registry  = registry
+        self.form_name = 'pgref_' + hashlib.md5(anchor.encode('utf-8')).hexdigest()[:12]
+
+    def wrap(self, available_w, available_h):
+        self.width  = available_w
+        self.height = self.style.leading
+        self.registry.setdefault(self.form_name, (self.anchor, available_w, self.style))
+        return available_w, self.height
+
+    def draw(self):
+        self.canv.doForm(self.form_name)
+
+
 class _HeaderBar(Flowable):
     def __init__(self, text, bg_color, txt_color, font_size=11, anchor=None):
         super().__init__()
@@ -313,11 +404,11 @@ class _PDFBuilder:
 
         # ── Report data — loaded early so rooms can use _roomNames override ──
         self.rd = {}
-        if inspection.report_data:
-            try:
-                self.rd = json.loads(inspection.report_data) if isinstance(inspection.report_data, str) else inspection.report_data
-            except Exception:
-                pass
+        try:
+            from services.report_store import load_report
+            self.rd = load_report(inspection)
+        except Exception:
+            pass
 
         # ── Rooms — from template.sections filtered by section_type='room' ──
         # report_data keys rooms by String(s.id) — the DB section id.
@@ -417,9 +508,11 @@ class _PDFBuilder:
         self._init_styles()
 
         # Image cache: url/data-uri → compressed JPEG bytes.
-        # Shared across both PDF-build passes so images are only fetched and
-        # compressed once regardless of how many times they appear in the story.
+        # Filled up front by _prefetch_images() and shared across both
+        # PDF-build passes so images are only fetched and compressed once
+        # regardless of how many times they appear in the story.
         self._img_cache: dict = {}
+        self._img_lock = threading.Lock()
 
         self.actions_summary = []
         self.action_groups   = {}
@@ -446,40 +539,126 @@ class _PDFBuilder:
                     _time.sleep(0.5)
         raise last_err
 
+    def _count_skipped(self):
+        with self._img_lock:
+            self._img_skipped += 1
+
+    @staticmethod
+    def _img_key(url: str, rendition: str):
+        """self._img_cache key — the bare URL for the 'pdf' rendition used everywhere else."""
+        return url if rendition == 'pdf' else (rendition, url)
+
+    def _cache_image(self, url: str, rendition: str = 'pdf'):
+        """
+        Load one image's rendition ('pdf' for body photos, 'cover' for the
+        cover-page property photo) into self._img_cache — from the
+        persistent derivative store when it has been rendered before,
+        otherwise downloaded (or decoded) and Pillow-compressed, then stored.
+        Failures and deadline skips are cached as None so neither the other
+        build pass nor a repeat reference re-attempts a doomed fetch.
+        Safe to call from prefetch worker threads.
+        """
+        from utils.photo_derivatives import get_derivative
+        key = self._img_key(url, rendition)
+        if url.startswith('data:'):
+            self._img_cache[key] = get_derivative(url, rendition)
+            return
+        import time as _time
+        if self._img_deadline and _time.monotonic() > self._img_deadline:
+            print(f'[pdf] image skipped — time budget exhausted '
+                  f'(inspection {self.inspection.id}): {url}')
+            self._count_skipped()
+            self._img_cache[key] = None
+            return
+        try:
+            self._img_cache[key] = get_derivative(url, rendition, fetch=self._download_image_bytes)
+        except Exception as e:
+            print(f'[pdf] image fetch failed (inspection {self.inspection.id}): {url} — {e}')
+            self._count_skipped()
+            self._img_cache[key] = None
+
+    def _image_bytes(self, url: str, rendition: str = 'pdf'):
+        """Cached rendition bytes for url (fetched inline if the prefetch missed it), or None."""
+        key = self._img_key(url, rendition)
+        if key not in self._img_cache:
+            self._cache_image(url, rendition)
+        return self._img_cache[key]
+
+    def _referenced_image_urls(self) -> list:
+        """
+        Every photo URL the story can embed, in report order, de-duplicated:
+        item/overview photos of visible rooms and items, plus floor plans.
+        Hidden rooms, items and fixed-section rows are skipped — they never
+        reach the PDF.
+        """
+        urls, seen = [], set()
+
+        def add(url):
+            if isinstance(url, str) and url and url not in seen:
+                seen.add(url)
+                urls.append(url)
+
+        hidden_rooms = set(str(x) for x in (self.rd.get('_hiddenRooms') or []))
+        for sid, section in self.rd.items():
+            if sid.startswith('_') or sid in hidden_rooms or not isinstance(section, dict):
+                continue
+            hidden_items = set(str(x) for x in (section.get('_hiddenItems') or []))
+            hidden_items.update(str(x) for x in (section.get('_hidden') or []))
+            for rid, entry in section.items():
+                if rid in hidden_items or not isinstance(entry, dict):
+                    continue
+                for url in entry.get('_photos') or []:
+                    add(url)
+
+        if not self.is_midterm:
+            for im in ((self.rd.get('_floorplan') or {}).get('images')) or []:
+                add(im.get('uri') or im.get('url'))
+        return urls
+
+    def _prefetch_images(self):
+        """
+        Fetch and compress every referenced photo concurrently before layout,
+        so the build passes only ever hit self._img_cache. Each download keeps
+        the retry and deadline semantics of _download_image_bytes/_cache_image;
+        the pool is bounded by IMAGE_PREFETCH_WORKERS.
+        """
+        pending = [(u, 'pdf') for u in self._referenced_image_urls()]
+        cover_url = self.prop.get('overview_photo')
+        if cover_url:
+            pending.append((cover_url, 'cover'))
+        pending = [(u, r) for u, r in pending if self._img_key(u, r) not in self._img_cache]
+        if not pending:
+            return
+        import time as _time
+        started = _time.monotonic()
+        workers = max(1, min(IMAGE_PREFETCH_WORKERS, len(pending)))
+
+        def _safe(item):
+            # Anything unexpected is left uncached; _image_bytes retries and
+            # reports it inline exactly as before.
+            try:
+                self._cache_image(*item)
+            except Exception:
+                pass
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pdf-img') as pool:
+            list(pool.map(_safe, pending))
+        print(f'[pdf] inspection {self.inspection.id}: prefetched {len(pending)} image(s) '
+              f'in {_time.monotonic() - started:.1f}s ({workers} workers)')
+
     def _fetch_image(self, url: str, max_w_mm: float, max_h_mm: float, link_url: str = None):
         """
-        Instance-level replacement for the module-level _fetch_image().
+        A body photo as a scaled RLImage (or None if it couldn't be loaded).
         Compressed bytes are stored in self._img_cache keyed by URL/data-URI
         so each unique image is only downloaded and Pillow-compressed ONCE,
-        even across the two build passes used for TOC page numbers.
+        even across the two build passes used for TOC page numbers. Most
+        images are already there from _prefetch_images(); anything the walk
+        missed is fetched inline here.
         """
         if not url:
             return None
         try:
-            if url not in self._img_cache:
-                if url.startswith('data:'):
-                    import base64 as _b64
-                    _, b64data = url.split(',', 1)
-                    raw = _b64.b64decode(b64data)
-                    self._img_cache[url] = _compress_image(raw)
-                else:
-                    import time as _time
-                    if self._img_deadline and _time.monotonic() > self._img_deadline:
-                        print(f'[pdf] image skipped — time budget exhausted '
-                              f'(inspection {self.inspection.id}): {url}')
-                        self._img_skipped += 1
-                        # Cache the failure (as None) so the PDF's second build pass
-                        # doesn't burn more time re-attempting an already-doomed fetch.
-                        self._img_cache[url] = None
-                    else:
-                        try:
-                            raw = self._download_image_bytes(url)
-                            self._img_cache[url] = _compress_image(raw)
-                        except Exception as e:
-                            print(f'[pdf] image fetch failed (inspection {self.inspection.id}): {url} — {e}')
-                            self._img_skipped += 1
-                            self._img_cache[url] = None
-            data = self._img_cache[url]
+            data = self._image_bytes(url)
             if data is None:
                 return None
             buf  = io.BytesIO(data)
@@ -494,7 +673,7 @@ class _PDFBuilder:
             return img
         except Exception as e:
             print(f'[pdf] image fetch failed (inspection {self.inspection.id}): {url} — {e}')
-            self._img_skipped += 1
+            self._count_skipped()
             return None
 
     def _photo_unavailable_cell(self):
@@ -802,12 +981,12 @@ class _PDFBuilder:
     # Build
     # ─────────────────────────────────────────────────────────────────────────
 
-    def _make_doc(self, output_buf):
-        """Create a configured BaseDocTemplate writing to output_buf."""
+    def _make_doc(self, output_buf, doc_class=BaseDocTemplate):
+        """Create a configured BaseDocTemplate (or subclass) writing to output_buf."""
         uw  = self._uw()
-        doc = BaseDocTemplate(output_buf, pagesize=self.pagesize,
-                              leftMargin=self.margin, rightMargin=self.margin,
-                              topMargin=self.margin,  bottomMargin=self.margin)
+        doc = doc_class(output_buf, pagesize=self.pagesize,
+                        leftMargin=self.margin, rightMargin=self.margin,
+                        topMargin=self.margin,  bottomMargin=self.margin)
         cover_frame = Frame(0, 0, self.pw, self.ph,
                             leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0)
         cover_template = PageTemplate(id='cover', frames=[cover_frame],
@@ -818,8 +997,11 @@ class _PDFBuilder:
         doc.addPageTemplates([cover_template, main_template])
         return doc
 
-    def _build_story(self, page_map=None):
-        """Assemble the full story list. page_map is passed to _contents() for page numbers."""
+    def _build_story(self, page_map=None, page_refs=None):
+        """
+        Assemble the full story list. page_map (two-pass) or page_refs
+        (single-pass) is passed to _contents() for page numbers.
+        """
         from reportlab.platypus import NextPageTemplate
         story = []
         story += [NextPageTemplate('cover')]
@@ -828,7 +1010,7 @@ class _PDFBuilder:
             # Heads-Up Reports: cover then sections only — no disclaimer, rooms, or action summary
             story += self._fixed_sections()
             return story
-        story += self._contents(page_map=page_map)
+        story += self._contents(page_map=page_map, page_refs=page_refs)
         story += self._disclaimer()
         if not self.is_midterm:
             story += self._floorplan_section()
@@ -842,7 +1024,53 @@ class _PDFBuilder:
         story += self._signatures_page()
         return story
 
-    def build(self) -> bytes:
+    def build(self, single_pass: bool = None) -> bytes:
+        # ── Prefetch: download + compress all photos concurrently ────────────
+        self._prefetch_images()
+
+        if single_pass is None:
+            single_pass = PDF_SINGLE_PASS
+        pdf_bytes = self._build_single_pass() if single_pass else self._build_two_pass()
+        if self._img_skipped:
+            print(f'[pdf] inspection {self.inspection.id}: {self._img_skipped} photo(s) '
+                  f'failed to embed — see [pdf] warnings above for URLs/reasons')
+        return pdf_bytes
+
+    def _build_single_pass(self) -> bytes:
+        """
+        Lay the story out once. Anchor pages are recorded via afterFlowable as
+        the layout runs; the Contents page-number cells are _PageRef forms that
+        are filled in from that map when the canvas is saved.
+        """
+        page_map  = {}
+        page_refs = {}   # form_name → (anchor, width, style), filled by _PageRef.wrap
+
+        class _Doc(BaseDocTemplate):
+            def afterFlowable(self_, flowable):  # noqa: N805
+                if isinstance(flowable, _HeaderBar) and flowable.anchor:
+                    page_map[flowable.anchor] = self_.page
+                elif isinstance(flowable, _Anchor):
+                    page_map[flowable.name] = self_.page
+
+        class _RefCanvas(Canvas):
+            def save(self_):  # noqa: N805
+                for form_name, (anchor, width, style) in page_refs.items():
+                    self_.beginForm(form_name)
+                    pg = page_map.get(anchor)
+                    if pg:
+                        self_.setFont(style.fontName, style.fontSize)
+                        self_.setFillColor(style.textColor)
+                        self_.drawRightString(width, style.leading - style.fontSize, str(pg))
+                    self_.endForm()
+                super().save()
+
+        buf = io.BytesIO()
+        doc = self._make_doc(buf, doc_class=_Doc)
+        doc.build(self._build_story(page_refs=page_refs), canvasmaker=_RefCanvas)
+        return buf.getvalue()
+
+    def _build_two_pass(self) -> bytes:
+        """Legacy build: a throwaway layout pass to learn anchor pages, then the real one."""
         # ── Pass 1: collect anchor → page number via afterFlowable ──────────────
         page_map = {}
 
@@ -877,9 +1105,6 @@ class _PDFBuilder:
         buf = io.BytesIO()
         doc2 = self._make_doc(buf)
         doc2.build(self._build_story(page_map=page_map))
-        if self._img_skipped:
-            print(f'[pdf] inspection {self.inspection.id}: {self._img_skipped} photo(s) '
-                  f'failed to embed — see [pdf] warnings above for URLs/reasons')
         return buf.getvalue()
 
     # ── Cover ─────────────────────────────────────────────────────────────────
@@ -941,13 +1166,12 @@ class _PDFBuilder:
         photo_drawn = False
         if photo_url:
             try:
-                req  = urllib.request.Request(photo_url, headers={'User-Agent': 'InspectPro/1.0'})
-                data = urllib.request.urlopen(req, timeout=8).read()
-                data = _compress_image(data, max_px=1200, quality=70)
-                img  = ImageReader(io.BytesIO(data))
-                canvas.drawImage(img, 0, photo_y, pw, photo_h,
-                                 preserveAspectRatio=False, mask='auto')
-                photo_drawn = True
+                data = self._image_bytes(photo_url, 'cover')
+                if data is not None:
+                    img = ImageReader(io.BytesIO(data))
+                    canvas.drawImage(img, 0, photo_y, pw, photo_h,
+                                     preserveAspectRatio=False, mask='auto')
+                    photo_drawn = True
             except Exception:
                 pass
         if not photo_drawn:
@@ -1217,7 +1441,12 @@ class _PDFBuilder:
 
     # ── Contents ──────────────────────────────────────────────────────────────
 
-    def _contents(self, page_map=None):
+    def _contents(self, page_map=None, page_refs=None):
+        """
+        Contents table. Page numbers come from page_map (second pass of the
+        two-pass build) or are deferred _PageRef cells registered in
+        page_refs (single-pass build); with neither, titles only.
+        """
         import html as _html_mod
 
         rows = []
@@ -1227,7 +1456,9 @@ class _PDFBuilder:
         def add(title, anchor):
             safe  = _html_mod.escape(title)
             title_p = Paragraph(f'<a href="#{anchor}">{safe}</a>', self.s_toc_link)
-            if page_map is not None:
+            if page_refs is not None:
+                rows.append([title_p, _PageRef(anchor, s_pg, page_refs)])
+            elif page_map is not None:
                 pg = page_map.get(anchor)
                 pg_p = Paragraph(str(pg) if pg else '', s_pg)
                 rows.append([title_p, pg_p])
@@ -1251,7 +1482,7 @@ class _PDFBuilder:
         add('Signatures', 'anchor_signatures')
 
         uw  = self._uw()
-        if page_map is not None:
+        if page_map is not None or page_refs is not None:
             col_widths = [uw - 14*mm, 14*mm]
         else:
             col_widths = [uw]
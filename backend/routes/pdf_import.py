@@ -19,9 +19,11 @@ import os
 import io
 import re
 import json
+import time
 import uuid
 import base64
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 
@@ -38,6 +40,14 @@ MAX_TOKENS_CHUNK  = 8192    # per-chunk ceiling — full model output capacity
 MIN_IMAGE_PX      = 100     # skip images smaller than 100 px in either dimension
 MAX_IMAGES_TOTAL  = 150     # hard cap to avoid runaway S3 uploads
 
+# Chunked extraction runs several Claude calls at once. Bounded so one large
+# import can't exhaust the org's Sonnet rate limit for everyone else; 429/529
+# responses are retried with backoff (see _call_claude).
+CHUNK_PARALLELISM     = int(os.environ.get('PDF_IMPORT_CHUNK_PARALLELISM', '3'))
+RATE_LIMIT_RETRIES    = 4
+RATE_LIMIT_BASE_DELAY = 5     # seconds — doubled per retry unless retry-after says otherwise
+IMAGE_UPLOAD_PARALLELISM = int(os.environ.get('PDF_IMPORT_UPLOAD_PARALLELISM', '8'))
+
 # Scanned/flattened-page fallback — see _rasterize_page_fallback.
 MIN_PAGE_TEXT_CHARS_FALLBACK = 40    # per-page (not whole-document like MIN_TEXT_CHARS) —
                                       # below this a page is treated as having no real text layer
@@ -88,7 +98,14 @@ _ROOM_HEADER_RE = re.compile(
 
 
 def _page_text_spans(page):
-    """Return list of (fitz.Rect, text_string) for all text spans on a page."""
+    """
+    Return list of (fitz.Rect, text_string, is_bold) for all non-empty text
+    spans on a page.
+
+    Bold detection: PDF flag bit 4 OR font name contains "bold" (ReportLab
+    embeds Helvetica-Bold whose name reliably contains "bold", so the font-name
+    check is the primary signal for L&M PDFs; the flag is a fallback for others).
+    """
     try:
         import fitz
         spans = []
@@ -99,7 +116,9 @@ def _page_text_spans(page):
                 for span in line.get('spans', []):
                     txt = span.get('text', '').strip()
                     if txt:
-                        spans.append((fitz.Rect(span['bbox']), txt))
+                        is_bold = (bool(span.get('flags', 0) & 16)
+                                   or 'bold' in span.get('font', '').lower())
+                        spans.append((fitz.Rect(span['bbox']), txt, is_bold))
         return spans
     except Exception:
         return []
@@ -117,7 +136,7 @@ def _extract_image_ref(page, xref, text_spans, margin=70):
             return None
         ir = img_rects[0]
         candidates = []
-        for span_rect, txt in text_spans:
+        for span_rect, txt, _ in text_spans:
             h_overlap = span_rect.x0 < ir.x1 + margin and span_rect.x1 > ir.x0 - margin
             v_near    = (ir.y0 - margin) < span_rect.y1 and span_rect.y0 < (ir.y1 + margin)
             if h_overlap and v_near:
@@ -457,9 +476,95 @@ def _extract_pdf_text(raw_bytes):
     return '\n'.join(page_texts[i] for i in sorted(page_texts))
 
 
+# ── Parsed PDF session ────────────────────────────────────────────────────────
+
+class _ParsedPDF:
+    """
+    One parse of an uploaded PDF, shared by every pass of an import job.
+
+    Image extraction, fixed-section detection and room-position detection all
+    need the PyMuPDF document and the same per-page text spans / image lists.
+    Opening the document once here and memoising those per page replaces the
+    three separate fitz.open() + get_text('dict') walks each job used to do.
+
+    page_texts is still produced by pdfplumber — the Claude prompts and the
+    TOC / room-heading heuristics are tuned to its layout-aware output — but
+    it is computed once and reused by the request handler and the job thread.
+
+    The PyMuPDF document is not thread-safe. Memo population is guarded by
+    _lock, and the job only touches the document from one thread at a time:
+    the image-extraction side thread is joined before the span passes run.
+    """
+
+    def __init__(self, raw_bytes):
+        self.raw_bytes   = raw_bytes
+        self.doc         = None
+        self._lock       = threading.RLock()
+        self._page_texts = None
+        self._spans      = {}
+        self._images     = {}
+        self._xref_pages = None
+        try:
+            import fitz  # PyMuPDF
+            self.doc = fitz.open(stream=raw_bytes, filetype='pdf')
+        except ImportError:
+            print('[pdf-import] PyMuPDF not installed — span/image passes disabled')
+        except Exception as e:
+            print(f'[pdf-import] PyMuPDF could not open PDF: {e}')
+
+    @property
+    def page_count(self):
+        return len(self.doc) if self.doc is not None else 0
+
+    def page_texts(self):
+        """{page_num (0-based): text} from pdfplumber, extracted once."""
+        if self._page_texts is None:
+            self._page_texts = _extract_pdf_text_by_page(self.raw_bytes)
+        return self._page_texts
+
+    def page(self, pn):
+        return self.doc[pn]
+
+    def spans(self, pn):
+        """Memoised _page_text_spans for page pn."""
+        with self._lock:
+            if pn not in self._spans:
+                self._spans[pn] = _page_text_spans(self.doc[pn])
+            return self._spans[pn]
+
+    def images(self, pn):
+        """Memoised page.get_images(full=True) for page pn."""
+        with self._lock:
+            if pn not in self._images:
+                self._images[pn] = self.doc[pn].get_images(full=True)
+            return self._images[pn]
+
+    def xref_page_count(self):
+        """{xref: number of pages the image appears on}."""
+        with self._lock:
+            if self._xref_pages is None:
+                counts = {}
+                for pn in range(self.page_count):
+                    for im in self.images(pn):
+                        counts[im[0]] = counts.get(im[0], 0) + 1
+                self._xref_pages = counts
+            return self._xref_pages
+
+    def close(self):
+        with self._lock:
+            if self.doc is not None:
+                try:
+                    self.doc.close()
+                except Exception:
+                    pass
+                self.doc = None
+            self._spans.clear()
+            self._images.clear()
+
+
 # ── PDF image extraction ──────────────────────────────────────────────────────
 
-def _rasterize_page_fallback(page, page_num, prefix):
+def _rasterize_page_fallback(page, page_num, prefix, upload=None):
     """
     Render a full page to a JPEG and upload it as a single synthetic photo
     entry. Used when a page has no usable embedded images and no extracted
@@ -476,9 +581,13 @@ def _rasterize_page_fallback(page, page_num, prefix):
 
     Never raises — extraction must degrade gracefully like the rest of this
     file. Returns None on any failure.
+
+    upload: optional (bytes, key, content_type) -> url callable; defaults to
+    a synchronous utils.s3.upload_bytes.
     """
     try:
         from utils.s3 import upload_bytes, new_key
+        upload = upload or upload_bytes
         pix = page.get_pixmap(dpi=FALLBACK_RENDER_DPI)
         try:
             img_bytes = pix.tobytes('jpg')
@@ -489,7 +598,7 @@ def _rasterize_page_fallback(page, page_num, prefix):
             img_bytes = pix.tobytes('png')
             ext, ctype = 'png', 'image/png'
         key = new_key(prefix, ext)
-        url = upload_bytes(img_bytes, key, ctype)
+        url = upload(img_bytes, key, ctype)
         print(f'[pdf-import] page {page_num}: no text/embedded images — '
               f'rasterized whole page as fallback photo ({pix.width}x{pix.height}px)')
         return {'url': url, 'ref': None, 'y': None, 'page': page_num}
@@ -498,9 +607,9 @@ def _rasterize_page_fallback(page, page_num, prefix):
         return None
 
 
-def _extract_pdf_images(raw_bytes, job_id, page_texts=None):
+def _extract_pdf_images(pdf, job_id, page_texts=None):
     """
-    Extract embedded images from a PDF and upload to S3.
+    Extract embedded images from a _ParsedPDF and upload to S3.
 
     Returns:
       page_images : {page_num (0-based): [{'url': str, 'ref': str|None}, ...]}
@@ -525,18 +634,22 @@ def _extract_pdf_images(raw_bytes, job_id, page_texts=None):
       rasterized and uploaded as a single fallback photo — see
       _rasterize_page_fallback. Pages where normal extraction already found
       images are never rasterized, so working PDFs are unaffected.
+
+    S3 uploads:
+      Each image's public URL is derived from its key up front, and the PUT
+      itself is handed to a pool of IMAGE_UPLOAD_PARALLELISM threads, so
+      decoding the next image overlaps with uploading the previous ones. All
+      uploads are joined before returning; any image whose upload failed is
+      dropped from the result (and from the cover photo).
     """
     try:
-        from utils.s3 import is_configured, upload_bytes, new_key
+        from utils.s3 import is_configured, upload_bytes, new_key, public_url
         if not is_configured():
             return {}, None
     except Exception:
         return {}, None
 
-    try:
-        import fitz  # PyMuPDF
-    except ImportError:
-        print('[pdf-import] PyMuPDF not installed — skipping image extraction')
+    if pdf is None or pdf.doc is None:
         return {}, None
 
     page_images = {}
@@ -544,23 +657,27 @@ def _extract_pdf_images(raw_bytes, job_id, page_texts=None):
     seen_xrefs  = set()
     total       = 0
     prefix      = f'pdf-import/{job_id}'
+    uploads     = []   # (url, future)
+    upload_pool = ThreadPoolExecutor(max_workers=IMAGE_UPLOAD_PARALLELISM,
+                                     thread_name_prefix='pdf-import-s3')
+
+    def _upload_async(data, key, content_type):
+        uploads.append((public_url(key), upload_pool.submit(upload_bytes, data, key, content_type)))
+        return uploads[-1][0]
 
     try:
-        doc = fitz.open(stream=raw_bytes, filetype='pdf')
+        doc = pdf.doc
 
         # Pre-scan: count how many pages each image xref appears on.
         # xrefs seen on 3+ pages are repeated elements (headers, logos) — skip them.
-        xref_page_count: dict = {}
-        for pn in range(len(doc)):
-            for im in doc[pn].get_images():
-                xref_page_count[im[0]] = xref_page_count.get(im[0], 0) + 1
+        xref_page_count = pdf.xref_page_count()
 
-        for page_num in range(len(doc)):
+        for page_num in range(pdf.page_count):
             if total >= MAX_IMAGES_TOTAL:
                 break
-            page          = doc[page_num]
-            img_list      = page.get_images(full=True)
-            text_spans    = _page_text_spans(page)
+            page          = pdf.page(page_num)
+            img_list      = pdf.images(page_num)
+            text_spans    = pdf.spans(page_num)
             entries       = []
             page_had_image = False   # true once ANY image is successfully extracted
                                       # on this page — even if diverted to cover_photo
@@ -599,7 +716,7 @@ def _extract_pdf_images(raw_bytes, job_id, page_texts=None):
                     ext       = base_image.get('ext', 'jpeg')
                     ctype     = 'image/jpeg' if ext in ('jpeg', 'jpg') else f'image/{ext}'
                     key       = new_key(prefix, ext)
-                    url       = upload_bytes(img_bytes, key, ctype)
+                    url       = _upload_async(img_bytes, key, ctype)
                     total    += 1
                     page_had_image = True
 
@@ -642,16 +759,32 @@ def _extract_pdf_images(raw_bytes, job_id, page_texts=None):
                     and page_text_len < MIN_PAGE_TEXT_CHARS_FALLBACK
                     and total < MAX_IMAGES_TOTAL
                     and (img_list or page.get_drawings())):
-                fallback = _rasterize_page_fallback(page, page_num, prefix)
+                fallback = _rasterize_page_fallback(page, page_num, prefix, upload=_upload_async)
                 if fallback:
                     entries.append(fallback)
                     total += 1
 
             if entries:
                 page_images[page_num] = entries
-        doc.close()
     except Exception as e:
         print(f'[pdf-import] image extraction error: {e}')
+    finally:
+        upload_pool.shutdown(wait=True)
+
+    failed = set()
+    for url, fut in uploads:
+        try:
+            fut.result()
+        except Exception as e:
+            failed.add(url)
+            print(f'[pdf-import] S3 upload failed for {url}: {e}')
+    if failed:
+        page_images = {
+            pn: kept for pn, entries in page_images.items()
+            if (kept := [e for e in entries if e['url'] not in failed])
+        }
+        if cover_photo in failed:
+            cover_photo = None
 
     return page_images, cover_photo
 
@@ -717,7 +850,7 @@ def _room_name_on_page(rname_norm, page_text):
     return False
 
 
-def _find_fixed_section_pages(raw_bytes, page_texts):
+def _find_fixed_section_pages(pdf, page_texts):
     """
     Find the first bold occurrence of each fixed section heading (Keys, Meters).
     Returns {'keys': (page_num, y0), 'meter_readings': (page_num, y0)} for each found.
@@ -727,47 +860,28 @@ def _find_fixed_section_pages(raw_bytes, page_texts):
         'keys':           re.compile(r'^keys?$', re.IGNORECASE),
         'meter_readings': re.compile(r'^(utility\s+meter|meter\s+read)', re.IGNORECASE),
     }
-    try:
-        import fitz
-    except ImportError:
+    if pdf is None or pdf.doc is None:
         return {}
 
     result = {}
-    doc = None
     try:
-        doc = fitz.open(stream=raw_bytes, filetype='pdf')
-        for pn in range(len(doc)):
+        for pn in range(pdf.page_count):
             if _is_toc_page(page_texts.get(pn, '')):
                 continue
-            for block in doc[pn].get_text('dict').get('blocks', []):
-                if block.get('type') != 0:
+            for rect, txt, is_bold in pdf.spans(pn):
+                if not is_bold or len(txt) > 60:
                     continue
-                for line in block.get('lines', []):
-                    for span in line.get('spans', []):
-                        txt = span.get('text', '').strip()
-                        if not txt or len(txt) > 60:
-                            continue
-                        is_bold = (bool(span.get('flags', 0) & 16)
-                                   or 'bold' in span.get('font', '').lower())
-                        if not is_bold:
-                            continue
-                        for sec_type, pat in _PATTERNS.items():
-                            if sec_type not in result and pat.match(txt):
-                                result[sec_type] = (pn, fitz.Rect(span['bbox']).y0)
+                for sec_type, pat in _PATTERNS.items():
+                    if sec_type not in result and pat.match(txt):
+                        result[sec_type] = (pn, rect.y0)
             if len(result) == len(_PATTERNS):
                 break
     except Exception as e:
         print(f'[pdf-import] _find_fixed_section_pages: {e}')
-    finally:
-        if doc:
-            try:
-                doc.close()
-            except Exception:
-                pass
     return result
 
 
-def _find_room_positions(raw_bytes, page_texts, room_names):
+def _find_room_positions(pdf, page_texts, room_names):
     """
     Use PyMuPDF text spans to find (page_num, y0) for each room heading.
     Returns {rname: (page_num, y0)} — rooms not found are absent from the dict.
@@ -783,38 +897,18 @@ def _find_room_positions(raw_bytes, page_texts, room_names):
             TOC pages and reject pure-digit suffixes (same guards as
             _room_name_on_page).
     """
-    try:
-        import fitz
-    except ImportError:
+    if pdf is None or pdf.doc is None:
         return {}
 
     result = {}
-    doc = None
+    page_count = pdf.page_count
     try:
-        doc = fitz.open(stream=raw_bytes, filetype='pdf')
-
         # Pre-scan all pages — collect (rect, txt, norm, is_bold) per page
-        page_span_data = {}
-        for pn in range(len(doc)):
-            page_dict = doc[pn].get_text('dict')
-            entries = []
-            for block in page_dict.get('blocks', []):
-                if block.get('type') != 0:
-                    continue
-                for line in block.get('lines', []):
-                    for span in line.get('spans', []):
-                        txt = span.get('text', '').strip()
-                        if not txt or len(txt) > 80:
-                            continue
-                        # Bold detection: PDF flag bit 4 OR font name contains "bold"
-                        # (ReportLab embeds Helvetica-Bold whose name reliably
-                        # contains "bold", so the font-name check is the primary
-                        # signal for L&M PDFs; the flag is a fallback for others)
-                        is_bold = (bool(span.get('flags', 0) & 16)
-                                   or 'bold' in span.get('font', '').lower())
-                        entries.append((fitz.Rect(span['bbox']), txt,
-                                        _norm_room(txt), is_bold))
-            page_span_data[pn] = entries
+        page_span_data = {
+            pn: [(rect, txt, _norm_room(txt), is_bold)
+                 for rect, txt, is_bold in pdf.spans(pn) if len(txt) <= 80]
+            for pn in range(page_count)
+        }
 
         def _matches(txt_norm, rname_norm):
             if txt_norm == rname_norm:
@@ -830,7 +924,7 @@ def _find_room_positions(raw_bytes, page_texts, room_names):
             rname_norm = _norm_room(rname)
             if not rname or not rname_norm:
                 continue
-            for pn in range(len(doc)):
+            for pn in range(page_count):
                 for rect, txt, txt_norm, is_bold in page_span_data.get(pn, []):
                     if not is_bold or not txt_norm:
                         continue
@@ -846,7 +940,7 @@ def _find_room_positions(raw_bytes, page_texts, room_names):
             rname_norm = _norm_room(rname)
             if not rname or not rname_norm or rname in result:
                 continue
-            for pn in range(len(doc)):
+            for pn in range(page_count):
                 pt = page_texts.get(pn, '')
                 if _is_toc_page(pt):
                     continue
@@ -861,12 +955,6 @@ def _find_room_positions(raw_bytes, page_texts, room_names):
 
     except Exception as e:
         print(f'[pdf-import] _find_room_positions: {e}')
-    finally:
-        if doc:
-            try:
-                doc.close()
-            except Exception:
-                pass
 
     return result
 
@@ -1061,22 +1149,53 @@ def _split_into_chunks(text, max_chars=MAX_CHUNK_CHARS):
 
 # ── Claude call helpers ───────────────────────────────────────────────────────
 
+_usage_lock = threading.Lock()   # usage_acc is shared by concurrent chunk calls
+
+
+def _rate_limit_delay(exc, attempt):
+    """
+    Seconds to wait before retrying exc, or None if it isn't a rate-limit /
+    overload error worth retrying. Honours the API's retry-after header.
+    """
+    status = getattr(exc, 'status_code', None)
+    if status not in (429, 503, 529):
+        return None
+    response = getattr(exc, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    try:
+        return min(float(retry_after), 60.0)
+    except (TypeError, ValueError):
+        return RATE_LIMIT_BASE_DELAY * (2 ** attempt)
+
+
 def _call_claude(client, messages, max_tokens, usage_acc=None):
     """
     Single Claude call, returns parsed JSON dict or raises.
     usage_acc: optional {'input_tokens', 'output_tokens', 'calls'} dict that is
     incremented with the actual token usage reported by the API — used for
     per-inspection cost tracking in Settings > Transcription.
+    Rate-limit (429) and overload (529) responses are retried with backoff.
     """
-    response = client.messages.create(
-        model='claude-sonnet-4-6',
-        max_tokens=max_tokens,
-        messages=messages,
-    )
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            response = client.messages.create(
+                model='claude-sonnet-4-6',
+                max_tokens=max_tokens,
+                messages=messages,
+            )
+            break
+        except Exception as e:
+            delay = _rate_limit_delay(e, attempt)
+            if delay is None or attempt == RATE_LIMIT_RETRIES:
+                raise
+            print(f'[pdf-import] rate limited ({getattr(e, "status_code", "?")}), '
+                  f'retrying in {delay:.0f}s (attempt {attempt + 1}/{RATE_LIMIT_RETRIES})')
+            time.sleep(delay)
     if usage_acc is not None and response.usage:
-        usage_acc['input_tokens']  += response.usage.input_tokens or 0
-        usage_acc['output_tokens'] += response.usage.output_tokens or 0
-        usage_acc['calls']         += 1
+        with _usage_lock:
+            usage_acc['input_tokens']  += response.usage.input_tokens or 0
+            usage_acc['output_tokens'] += response.usage.output_tokens or 0
+            usage_acc['calls']         += 1
     raw = response.content[0].text.strip()
     raw = raw.replace('```json', '').replace('```', '').strip()
     return json.loads(raw)
@@ -1128,12 +1247,66 @@ def _merge_results(results):
     return {'rooms': merged_rooms, 'fixedSections': merged_fixed}
 
 
+def _extract_chunks(client, job_id, chunks, template_structure, usage_acc,
+                    inspection_id, filename):
+    """
+    Run the per-chunk Claude calls concurrently (CHUNK_PARALLELISM at a time)
+    and return the parsed results in CHUNK order, so _merge_results stays
+    deterministic regardless of completion order. Chunks whose JSON fails to
+    parse are skipped rather than failing the whole job. Job progress is
+    updated as each chunk completes ("4 of 6 done").
+    """
+    total    = len(chunks)
+    results  = [None] * total
+    done     = [0]
+    progress = threading.Lock()
+
+    def _one(i, chunk):
+        print('[pdf-import] job ' + job_id + ' chunk ' + str(i + 1) + '/' + str(total) + ' (' + str(len(chunk)) + ' chars)')
+        chunk_prompt = (
+            CHUNK_PROMPT_TEMPLATE
+            .replace('__TEMPLATE_STRUCTURE__', template_structure)
+            .replace('__CHUNK_TEXT__', chunk)
+        )
+        messages = [{'role': 'user', 'content': chunk_prompt}]
+        try:
+            chunk_result = _call_claude(client, messages, MAX_TOKENS_CHUNK, usage_acc)
+            chunk_rooms = len(chunk_result.get('rooms', []))
+            chunk_items = sum(len(r.get('items', [])) for r in chunk_result.get('rooms', []))
+            print('[pdf-import] job ' + job_id + ' chunk ' + str(i + 1) + ' → ' + str(chunk_rooms) + ' rooms, ' + str(chunk_items) + ' items')
+            results[i] = chunk_result
+        except json.JSONDecodeError as e:
+            # Skip bad chunks rather than failing the whole job
+            print('[pdf-import] job ' + job_id + ' chunk ' + str(i + 1) + ' JSON error (skipping): ' + str(e))
+        finally:
+            with progress:
+                done[0] += 1
+                _write_job(job_id, {
+                    'status': 'processing',
+                    'progress': 'Analysed ' + str(done[0]) + ' of ' + str(total) + ' chunks…',
+                    'inspection_id': inspection_id,
+                    'filename': filename,
+                })
+
+    with ThreadPoolExecutor(max_workers=max(1, min(CHUNK_PARALLELISM, total))) as pool:
+        # list() re-raises the first non-JSON error (e.g. auth, exhausted retries)
+        list(pool.map(_one, range(total), chunks))
+
+    return [r for r in results if r is not None]
+
+
 # ── Background worker ─────────────────────────────────────────────────────────
 
 def _run_import_job(job_id, api_key, extracted_text, pdf_b64, template_structure,
                     use_text_mode, inspection_id, filename,
-                    page_texts=None, raw_bytes=None):
-    """Runs in a daemon thread. Writes result to a temp file when complete."""
+                    page_texts=None, pdf=None):
+    """
+    Runs in a daemon thread. Writes result to a temp file when complete.
+
+    pdf is the request's _ParsedPDF (None when no raw bytes were uploaded);
+    this job owns it from here on and closes it when finished.
+    """
+    image_pool = None
     try:
         from anthropic import Anthropic
         client = Anthropic(api_key=api_key)
@@ -1142,25 +1315,17 @@ def _run_import_job(job_id, api_key, extracted_text, pdf_b64, template_structure
         # result as _usage and logged against the inspection at apply time.
         usage_acc = {'input_tokens': 0, 'output_tokens': 0, 'calls': 0}
 
-        # ── Image extraction (before Claude, mapping deferred until after) ────
-        # S3 uploads happen here before the long Claude call.
-        # Room mapping is done AFTER Claude so we can use Claude's room names.
+        # ── Image extraction (concurrent with Claude, mapping deferred) ──────
+        # Image decode + S3 uploads are independent of the AI extraction until
+        # room mapping, so they run on a side thread while the Claude calls
+        # below are in flight, and are joined just before mapping (which needs
+        # Claude's room names).
         page_images     = {}
         cover_photo_url = None
-        if raw_bytes:
-            try:
-                _write_job(job_id, {
-                    'status':        'processing',
-                    'progress':      'Extracting photos…',
-                    'inspection_id': inspection_id,
-                    'filename':      filename,
-                })
-                page_images, cover_photo_url = _extract_pdf_images(raw_bytes, job_id, page_texts=page_texts)
-                img_count = sum(len(v) for v in page_images.values())
-                print(f'[pdf-import] job {job_id}: extracted {img_count} images, '
-                      f'cover={cover_photo_url is not None}')
-            except Exception as img_e:
-                print(f'[pdf-import] job {job_id} image extraction error: {img_e}')
+        image_future    = None
+        if pdf is not None:
+            image_pool   = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdf-import-images')
+            image_future = image_pool.submit(_extract_pdf_images, pdf, job_id, page_texts)
 
         if not use_text_mode:
             # Document mode: send raw PDF — no chunking possible
@@ -1201,37 +1366,40 @@ def _run_import_job(job_id, api_key, extracted_text, pdf_b64, template_structure
             chunks = _split_into_chunks(extracted_text)
             print('[pdf-import] job ' + job_id + ' text mode, chunked: ' + str(len(chunks)) + ' chunks from ' + str(len(extracted_text)) + ' chars')
 
-            results = []
-            for i, chunk in enumerate(chunks):
-                print('[pdf-import] job ' + job_id + ' chunk ' + str(i + 1) + '/' + str(len(chunks)) + ' (' + str(len(chunk)) + ' chars)')
-                _write_job(job_id, {
-                    'status': 'processing',
-                    'progress': 'Analysing chunk ' + str(i + 1) + ' of ' + str(len(chunks)) + '…',
-                    'inspection_id': inspection_id,
-                    'filename': filename,
-                })
-                chunk_prompt = (
-                    CHUNK_PROMPT_TEMPLATE
-                    .replace('__TEMPLATE_STRUCTURE__', template_structure)
-                    .replace('__CHUNK_TEXT__', chunk)
-                )
-                messages = [{'role': 'user', 'content': chunk_prompt}]
-                try:
-                    chunk_result = _call_claude(client, messages, MAX_TOKENS_CHUNK, usage_acc)
-                    chunk_rooms = len(chunk_result.get('rooms', []))
-                    chunk_items = sum(len(r.get('items', [])) for r in chunk_result.get('rooms', []))
-                    print('[pdf-import] job ' + job_id + ' chunk ' + str(i + 1) + ' → ' + str(chunk_rooms) + ' rooms, ' + str(chunk_items) + ' items')
-                    results.append(chunk_result)
-                except json.JSONDecodeError as e:
-                    print('[pdf-import] job ' + job_id + ' chunk ' + str(i + 1) + ' JSON error (skipping): ' + str(e))
-                    # Skip bad chunks rather than failing the whole job
-                    continue
+            _write_job(job_id, {
+                'status': 'processing',
+                'progress': 'Analysing ' + str(len(chunks)) + ' chunks…',
+                'inspection_id': inspection_id,
+                'filename': filename,
+            })
+            results = _extract_chunks(client, job_id, chunks, template_structure,
+                                      usage_acc, inspection_id, filename)
 
             if not results:
                 raise ValueError('All chunks failed to parse — no usable data extracted')
 
             parsed = _merge_results(results)
 
+        # ── Join image extraction ─────────────────────────────────────────
+        if image_future is not None:
+            try:
+                if not image_future.done():
+                    _write_job(job_id, {
+                        'status':        'processing',
+                        'progress':      'Finishing photo extraction…',
+                        'inspection_id': inspection_id,
+                        'filename':      filename,
+                    })
+                page_images, cover_photo_url = image_future.result()
+                img_count = sum(len(v) for v in page_images.values())
+                print(f'[pdf-import] job {job_id}: extracted {img_count} images, '
+                      f'cover={cover_photo_url is not None}')
+            except Exception as img_e:
+                print(f'[pdf-import] job {job_id} image extraction error: {img_e}')
+            finally:
+                image_pool.shutdown(wait=False)
+                image_pool = None
+
         # ── Map images to rooms / fixed sections ─────────────────────────
         # Done AFTER Claude so we can use the actual room names Claude extracted.
         room_photos     = {}
@@ -1252,9 +1420,9 @@ def _run_import_job(job_id, api_key, extracted_text, pdf_b64, template_structure
                 # Find room heading positions (bold spans) — used for both
                 # first_room_page detection and within-page y-splitting.
                 room_positions = {}
-                if raw_bytes and parsed.get('rooms'):
+                if pdf is not None and parsed.get('rooms'):
                     try:
-                        room_positions = _find_room_positions(raw_bytes, pt, parsed['rooms'])
+                        room_positions = _find_room_positions(pdf, pt, parsed['rooms'])
                         print(f'[pdf-import] job {job_id}: located {len(room_positions)} '
                               f'room positions via spans')
                     except Exception as pos_e:
@@ -1269,9 +1437,9 @@ def _run_import_job(job_id, api_key, extracted_text, pdf_b64, template_structure
 
                 # Fixed section heading positions: {type: (page_num, y0)}
                 fixed_sec_info = {}
-                if raw_bytes:
+                if pdf is not None:
                     try:
-                        fixed_sec_info = _find_fixed_section_pages(raw_bytes, pt)
+                        fixed_sec_info = _find_fixed_section_pages(pdf, pt)
                         print(f'[pdf-import] job {job_id}: fixed section positions: '
                               + str({k: v[0] for k, v in fixed_sec_info.items()}))
                     except Exception as fsp_e:
@@ -1403,6 +1571,14 @@ def _run_import_job(job_id, api_key, extracted_text, pdf_b64, template_structure
             'filename': filename,
         })
 
+    finally:
+        # An early error can leave image extraction running on the side
+        # thread — let it finish before the shared document is closed.
+        if image_pool is not None:
+            image_pool.shutdown(wait=True)
+        if pdf is not None:
+            pdf.close()
+
 
 # ── Routes ────────────────────────────────────────────────────────────────────
 
@@ -1464,7 +1640,8 @@ def pdf_import():
             print(f'[pdf-import] Drive upload error (non-fatal): {drive_err}')
 
     # Text extraction (page-by-page so the thread can use it for photo mapping)
-    page_texts     = _extract_pdf_text_by_page(raw_bytes)
+    pdf            = _ParsedPDF(raw_bytes)
+    page_texts     = pdf.page_texts()
     extracted_text = '\n'.join(page_texts[i] for i in sorted(page_texts))
     use_text_mode  = len(extracted_text) >= MIN_TEXT_CHARS
 
@@ -1483,7 +1660,7 @@ def pdf_import():
     thread = threading.Thread(
         target=_run_import_job,
         args=(job_id, api_key, extracted_text, pdf_b64, template_structure,
-              use_text_mode, inspection_id, filename, page_texts, raw_bytes),
+              use_text_mode, inspection_id, filename, page_texts, pdf),
         daemon=True,
     )
     thread.start()
@@ -118,7 +118,6 @@ def list_orphaned_photos(inspection_id):
     if not is_configured():
         return jsonify({'error': 'Photo storage is not configured on this server'}), 503
 
-    import json
     from models import db, Inspection
     from utils.s3 import list_objects
 
@@ -126,12 +125,11 @@ def list_orphaned_photos(inspection_id):
     if not insp:
         return jsonify({'error': 'Inspection not found'}), 404
 
-    rd = {}
-    if insp.report_data:
-        try:
-            rd = json.loads(insp.report_data) if isinstance(insp.report_data, str) else insp.report_data
-        except Exception:
-            rd = {}
+    from services.report_store import load_report
+    try:
+        rd = load_report(insp)
+    except Exception:
+        rd = {}
 
     # Collect every photo URL/URI referenced anywhere in report_data, however
     # deeply nested (room items, _extra rows, _overview, fixed sections, subs).
@@ -200,21 +198,23 @@ def reassign_orphaned_photos(inspection_id):
     if bad_keys:
         return jsonify({'error': f'Key(s) do not belong to this inspection: {bad_keys}'}), 400
 
-    import json
     from models import db, Inspection
 
     insp = db.session.get(Inspection, inspection_id)
     if not insp:
         return jsonify({'error': 'Inspection not found'}), 404
 
-    rd = {}
-    if insp.report_data:
-        try:
-            rd = json.loads(insp.report_data) if isinstance(insp.report_data, str) else insp.report_data
-        except Exception:
-            rd = {}
-
-    rd.setdefault(section_key, {})
+    # Only the one section this item lives in is read and rewritten — under
+    # the inspection's row lock, so a concurrent sync can't slip in between
+    from services.report_store import load_sections, lock_report, write_sections
+    lock_report(insp)
+    try:
+        rd = load_sections(insp, [section_key])
+    except Exception:
+        rd = {}
+
+    if not isinstance(rd.get(section_key), dict):
+        rd[section_key] = {}
     rd[section_key].setdefault(item_id, {})
     photos = rd[section_key][item_id].get('_photos')
     if not isinstance(photos, list):
@@ -228,7 +228,7 @@ def reassign_orphaned_photos(inspection_id):
             added.append(url)
     rd[section_key][item_id]['_photos'] = photos
 
-    insp.report_data = json.dumps(rd)
+    write_sections(insp, {section_key: rd[section_key]})
     db.session.commit()
 
     return jsonify({'ok': True, 'added': len(added), 'photos': photos})
@@ -3,38 +3,30 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, Property, Client
 from permissions import get_current_user, filter_properties_for_user, is_admin_or_manager, is_client
 from sqlalchemy.orm import joinedload, selectinload, defer
-import time
+from utils.shared_cache import shared_cache
 
 properties_bp = Blueprint('properties', __name__)
 
 # ── Properties list cache ──────────────────────────────────────────────────────
 # Keyed per user so each user sees their own scoped data.
-# Busted on any property or inspection write.
-_PROP_CACHE: dict = {}
+# Busted on any property or inspection write. Shared by all gunicorn workers
+# (utils/shared_cache.py).
 _PROP_CACHE_TTL = 300  # 5 minutes
+_PROP_CACHE = shared_cache('properties', ttl=_PROP_CACHE_TTL)
 
 
 def _prop_cache_get(key: str):
-    entry = _PROP_CACHE.get(key)
-    if entry and time.monotonic() - entry['ts'] < _PROP_CACHE_TTL:
-        return entry['data']
-    return None
+    """(data or None, token) — hand the token back to _prop_cache_set."""
+    return _PROP_CACHE.get(key)
 
 
-def _prop_cache_set(key: str, data):
-    _PROP_CACHE[key] = {'data': data, 'ts': time.monotonic()}
-    if len(_PROP_CACHE) > 500:
-        oldest = sorted(_PROP_CACHE, key=lambda k: _PROP_CACHE[k]['ts'])
-        for k in oldest[:100]:
-            _PROP_CACHE.pop(k, None)
+def _prop_cache_set(key: str, data, token):
+    _PROP_CACHE.set(key, data, token)
 
 
 def invalidate_properties_cache(user_id=None):
     """Call after any write that changes property or inspection data."""
-    if user_id is not None:
-        _PROP_CACHE.pop(f'props:{user_id}', None)
-    else:
-        _PROP_CACHE.clear()
+    _PROP_CACHE.invalidate(f'props:{user_id}' if user_id is not None else None)
 
 
 def _property_query_slim():
@@ -103,13 +95,13 @@ def _property_list_item(p):
 def get_properties():
     user = get_current_user()
     cache_key = f'props:{user.id}'
-    cached = _prop_cache_get(cache_key)
+    cached, token = _prop_cache_get(cache_key)
     if cached is not None:
         return jsonify(cached)
     query = filter_properties_for_user(_property_query_slim(), user)
     properties = query.all()
     data = [_property_list_item(p) for p in properties]
-    _prop_cache_set(cache_key, data)
+    _prop_cache_set(cache_key, data, token)
     return jsonify(data)
 
 @properties_bp.route('/<int:property_id>', methods=['GET'])
@@ -1,11 +1,18 @@
 import os
+import io
 import json
-import tempfile
+import fcntl
+import time
+import uuid
+import hashlib
 import base64
+import threading
 import anthropic
-from flask import Blueprint, request, jsonify
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, TranscriptionUsage
+from utils.disk_cache import DiskCache
 from routes.inspections import _AS_INVENTORY_RE
 
 transcribe_bp = Blueprint('transcribe', __name__)
@@ -103,13 +110,59 @@ _TRANSCRIPT_CORRECTIONS = [
     (_re.compile(r'\bdelete-item\b', _re.I),      'delete item'),
 ]
 
-def _correct_transcript(text: str) -> str:
-    """Apply known Whisper mishearing corrections for property inspection vocabulary."""
+def _compile_corrections(rules):
+    """
+    Fold an ordered (pattern, replacement) list into one alternation so a
+    transcript is scanned once instead of once per rule.
+
+    Each rule becomes a named group (?P<_rN>...) carrying its own flags, in
+    list order, and the dispatch table maps the group name back to its rule.
+    Literal replacements are returned directly; replacements with
+    backreferences (\\1) are expanded by re-matching the rule's own pattern
+    against the matched text, so nested group numbering doesn't matter.
+
+    Equivalent to applying the rules one after another as long as every
+    replacement is a fixed point of the later rules (true of the list above —
+    later "pin"/normalise entries map their own output to itself).
+    learning/bench_corrections.py checks this against real transcripts.
+    """
+    alternatives = []
+    dispatch = {}
+    for i, (pattern, replacement) in enumerate(rules):
+        name = f'_r{i}'
+        flags = 'i' if pattern.flags & _re.I else ''
+        body = f'(?{flags}:{pattern.pattern})' if flags else f'(?:{pattern.pattern})'
+        alternatives.append(f'(?P<{name}>{body})')
+        dispatch[name] = (pattern, replacement, '\\' in replacement)
+    combined = _re.compile('|'.join(alternatives))
+
+    def _replace(m):
+        pattern, replacement, has_backrefs = dispatch[m.lastgroup]
+        if not has_backrefs:
+            return replacement
+        return pattern.fullmatch(m.group()).expand(replacement)
+
+    def apply(text: str) -> str:
+        return combined.sub(_replace, text)
+
+    return apply
+
+
+_apply_transcript_corrections = _compile_corrections(_TRANSCRIPT_CORRECTIONS)
+
+
+def _correct_transcript_sequential(text: str) -> str:
+    """Reference implementation — one re.sub per rule. Kept for benchmarking/equivalence checks."""
     for pattern, replacement in _TRANSCRIPT_CORRECTIONS:
         text = pattern.sub(replacement, text)
     return text
 
 
+def _correct_transcript(text: str) -> str:
+    """Apply known Whisper mishearing corrections for property inspection vocabulary."""
+    return _apply_transcript_corrections(text)
+
+
 # ── Inspection vocabulary dictionaries ────────────────────────────────────
 # Injected into AI prompts so the model reliably recognises condition signals
 # and description terms across all property inspection item types.
@@ -502,6 +555,46 @@ _APPLIANCE_FORMATTING_RULE = (
 )
 
 
+
+# ── Cached prompt prefix ──────────────────────────────────────────────────
+# The two vocabulary blocks above are ~5k tokens and identical on every fill
+# call. They are sent once as a system block marked for Anthropic prompt
+# caching, so every fill function shares one warm prefix (cache reads bill at
+# ~10% of input price and skip re-processing). Prompts that used to inline the
+# vocabulary now carry _VOCABULARY_POINTER instead. Keep this text stable —
+# any edit invalidates the cache for every caller.
+_PROMPT_REFERENCE = (
+    'You fill UK property inspection report fields from a clerk\'s dictation. '
+    'The reference vocabulary below applies to every request; the user message '
+    'gives the task, the items and the transcript.\n'
+    + _CONDITION_WORDS
+    + _DESCRIPTION_VOCABULARY
+)
+
+_CACHED_SYSTEM = [{
+    'type':          'text',
+    'text':          _PROMPT_REFERENCE,
+    'cache_control': {'type': 'ephemeral'},
+}]
+
+_VOCABULARY_POINTER = (
+    'Use the CONDITION VOCABULARY and DESCRIPTION VOCABULARY in the system prompt to '
+    'recognise condition signals and description terms.'
+)
+
+
+def _usage_tokens(message) -> dict:
+    """TranscriptionUsage token kwargs from an Anthropic message (zeros if missing)."""
+    usage = getattr(message, 'usage', None) if message else None
+    if not usage:
+        return {'input_tokens': 0, 'output_tokens': 0, 'cache_read_tokens': 0, 'cache_write_tokens': 0}
+    return {
+        'input_tokens':       usage.input_tokens or 0,
+        'output_tokens':      usage.output_tokens or 0,
+        'cache_read_tokens':  getattr(usage, 'cache_read_input_tokens', 0) or 0,
+        'cache_write_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+    }
+
 # ── Edit-mode detection ────────────────────────────────────────────────────
 # Clerks can prefix a recording with trigger phrases to amend existing fields
 # rather than filling only-if-empty.
@@ -565,11 +658,83 @@ def _detect_edit_mode(transcript: str):
 
 # ── Helpers ────────────────────────────────────────────────────────────────
 
+# ── Transcript cache ───────────────────────────────────────────────────────
+# The app re-sends identical clips when a clerk re-presses "AI Transcribe" or
+# when duplicate clip rows are restored after a remount. Whisper output for
+# identical bytes is stable enough to reuse, so raw transcripts are cached on
+# disk keyed by SHA-256(audio + mime). Disk (not a per-process dict) so every
+# gunicorn worker shares the same entries — same reasoning as JOBS_DIR in
+# pdf_import.py. The raw text is stored and _correct_transcript() re-applied on
+# every hit, so correction-list changes take effect without flushing the cache.
+TRANSCRIPT_CACHE_DIR         = os.environ.get('TRANSCRIPT_CACHE_DIR', '/tmp/transcript_cache')
+TRANSCRIPT_CACHE_TTL_SECS    = int(os.environ.get('TRANSCRIPT_CACHE_TTL_DAYS', '14')) * 86400
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.environ.get('TRANSCRIPT_CACHE_MAX_ENTRIES', '5000'))
+_TRANSCRIPT_CACHE = DiskCache(TRANSCRIPT_CACHE_DIR, '.json', ttl=TRANSCRIPT_CACHE_TTL_SECS,
+                              max_entries=TRANSCRIPT_CACHE_MAX_ENTRIES, tag='transcribe')
+
+
+def _transcript_cache_key(audio_hash, mime_base: str) -> str:
+    """audio_hash is a hashlib.sha256 object already fed with the audio bytes."""
+    h = audio_hash.copy()
+    h.update(b'\0' + mime_base.encode('utf-8'))
+    return h.hexdigest()
+
+
+def _transcript_cache_get(key: str):
+    """Return (raw_transcript, duration_seconds) or None."""
+    data = _TRANSCRIPT_CACHE.get(key)
+    if data is None:
+        return None
+    try:
+        entry = json.loads(data)
+        return entry.get('transcript', ''), float(entry.get('duration') or 0)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _transcript_cache_put(key: str, raw_transcript: str, duration_seconds: float):
+    entry = {'transcript': raw_transcript, 'duration': duration_seconds}
+    _TRANSCRIPT_CACHE.put(key, json.dumps(entry).encode('utf-8'))
+
+
 def _whisper_transcribe(audio_bytes: bytes, mime_type: str) -> tuple[str, float]:
     """
     Send audio bytes to OpenAI Whisper, return (transcript, duration_seconds).
-    Uses verbose_json to get actual duration rather than estimating from byte count.
+    Thin wrapper over _whisper_transcribe_stream for base64/JSON callers.
+    """
+    return _whisper_transcribe_stream(io.BytesIO(audio_bytes), mime_type)
+
+
+def _whisper_transcribe_stream(audio_file, mime_type: str) -> tuple[str, float]:
     """
+    Send a seekable binary file object to OpenAI Whisper, return
+    (transcript, duration_seconds). Uses verbose_json to get actual duration
+    rather than estimating from byte count.
+
+    The file is read in chunks (to hash it) and then handed to the OpenAI
+    client as-is, so multipart uploads and resumable-upload files are never
+    materialised in memory. Identical audio is served from the transcript
+    cache (with its recorded duration, so TranscriptionUsage still logs the
+    real clip length).
+    """
+    # Strip codec suffix e.g. "audio/webm;codecs=opus" → "audio/webm"
+    mime_base = mime_type.split(';')[0].strip().lower() if mime_type else 'audio/webm'
+
+    audio_hash = hashlib.sha256()
+    audio_file.seek(0)
+    while True:
+        chunk = audio_file.read(_UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        audio_hash.update(chunk)
+    audio_file.seek(0)
+
+    cache_key = _transcript_cache_key(audio_hash, mime_base)
+    cached = _transcript_cache_get(cache_key)
+    if cached is not None:
+        print(f'[transcribe] cache hit {cache_key[:12]} ({cached[1]:.1f}s audio)')
+        return _correct_transcript(cached[0]), cached[1]
+
     import openai
 
     client = openai.OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
@@ -587,41 +752,162 @@ def _whisper_transcribe(audio_bytes: bytes, mime_type: str) -> tuple[str, float]
         'audio/aac':   'm4a',
         'video/webm':  'webm',  # some browsers report video/webm for audio
     }
-    # Strip codec suffix e.g. "audio/webm;codecs=opus" → "audio/webm"
-    mime_base = mime_type.split(';')[0].strip().lower() if mime_type else 'audio/webm'
     ext = ext_map.get(mime_base, 'webm')
     print(f'[transcribe] mime_base: {repr(mime_base)} → ext: {ext}')
 
-    with tempfile.NamedTemporaryFile(suffix=f'.{ext}', delete=False) as tmp:
-        tmp.write(audio_bytes)
-        tmp_path = tmp.name
+    # Whisper infers the container from the filename, so pass an explicit name
+    # alongside the stream rather than writing a suffixed temp file.
+    response = client.audio.transcriptions.create(
+        model='whisper-1',
+        file=(f'audio.{ext}', audio_file),
+        language='en',
+        response_format='verbose_json',
+        prompt=(
+            'UK property inventory inspection dictation. '
+            'Speaker describes item appearance and condition. '
+            'Key vocabulary: serial number, skirting board, coving, architrave, '
+            'induction hob, extractor fan, UPVC, double glazed, thermostatic, TRV, '
+            'fair wear and tear, in good order, in fair order, in poor order. '
+            'Commands to preserve exactly: '
+            '"Delete item", "Not Applicable", "Not seen", "Add sub item", '
+            '"Additional item", "Add additional item", "Return to", '
+            '"Amend description", "Amend condition", '
+            '"Add to description", "Add to condition", "Amend", "Add". '
+            'Transcribe all words accurately, including technical property terms.'
+        )
+    )
+    raw_transcript = str(response.text).strip()
+    duration_seconds = float(response.duration or 0)
+    _transcript_cache_put(cache_key, raw_transcript, duration_seconds)
+    return _correct_transcript(raw_transcript), duration_seconds
+
+
+# ── Binary / resumable audio uploads ──────────────────────────────────────
+# Base64-in-JSON inflates audio by a third and forces the whole body to be
+# materialised (JSON string, then decoded bytes) inside a sync worker. Two
+# alternatives are accepted by /item and /room:
+#   • multipart/form-data — the usual JSON fields go in a 'payload' form field,
+#     audio goes in file parts ('audio' for /item, repeated 'clips' for /room).
+#     werkzeug spools parts over 500KB to temp files, so RAM stays bounded.
+#   • resumable uploads — POST /upload → {uploadId}, then PUT raw chunks to
+#     /upload/<id> with X-Upload-Offset; reference it as {"uploadId": ...} in
+#     place of "audio". GET /upload/<id> reports bytes received for resuming.
+TRANSCRIBE_UPLOADS_DIR = os.environ.get('TRANSCRIBE_UPLOADS_DIR', '/tmp/transcribe_uploads')
+UPLOAD_TTL_SECS        = 6 * 3600   # abandoned uploads are purged after this
+UPLOAD_MAX_BYTES       = 25 * 1024 * 1024   # Whisper's per-file limit — larger is useless
+_UPLOAD_CHUNK_BYTES    = 64 * 1024
+_UPLOAD_ID_RE          = _re.compile(r'^[0-9a-f]{32}$')
+os.makedirs(TRANSCRIBE_UPLOADS_DIR, exist_ok=True)
+
+
+def _upload_path(upload_id: str):
+    """Return the on-disk path for an upload id, or None if the id is malformed."""
+    if not upload_id or not _UPLOAD_ID_RE.match(str(upload_id)):
+        return None
+    return os.path.join(TRANSCRIBE_UPLOADS_DIR, f'{upload_id}.bin')
+
+
+def _clip_upload_ids(clips: list) -> list:
+    return [c['uploadId'] for c in clips if isinstance(c, dict) and c.get('uploadId')]
+
+
+def _discard_uploads(upload_ids):
+    """Delete upload files once their audio has been transcribed (best effort)."""
+    for upload_id in upload_ids:
+        path = _upload_path(upload_id)
+        if not path:
+            continue
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
 
+def _purge_stale_uploads():
+    now = time.time()
     try:
-        with open(tmp_path, 'rb') as f:
-            response = client.audio.transcriptions.create(
-                model='whisper-1',
-                file=f,
-                language='en',
-                response_format='verbose_json',
-                prompt=(
-                    'UK property inventory inspection dictation. '
-                    'Speaker describes item appearance and condition. '
-                    'Key vocabulary: serial number, skirting board, coving, architrave, '
-                    'induction hob, extractor fan, UPVC, double glazed, thermostatic, TRV, '
-                    'fair wear and tear, in good order, in fair order, in poor order. '
-                    'Commands to preserve exactly: '
-                    '"Delete item", "Not Applicable", "Not seen", "Add sub item", '
-                    '"Additional item", "Add additional item", "Return to", '
-                    '"Amend description", "Amend condition", '
-                    '"Add to description", "Add to condition", "Amend", "Add". '
-                    'Transcribe all words accurately, including technical property terms.'
-                )
-            )
-        raw_transcript = str(response.text).strip()
-        duration_seconds = float(response.duration or 0)
-        return _correct_transcript(raw_transcript), duration_seconds
-    finally:
-        os.unlink(tmp_path)
+        for de in os.scandir(TRANSCRIBE_UPLOADS_DIR):
+            try:
+                if now - de.stat().st_mtime > UPLOAD_TTL_SECS:
+                    os.unlink(de.path)
+            except OSError:
+                pass
+    except OSError:
+        pass
+
+
+def _read_transcribe_request():
+    """
+    Return (data, files) for either a JSON body or a multipart/form-data body.
+    files is None for JSON requests. data is None if the body is unusable.
+    """
+    if request.mimetype == 'multipart/form-data':
+        try:
+            data = json.loads(request.form.get('payload') or '{}')
+        except ValueError:
+            return None, None
+        return data, request.files
+    return request.get_json(silent=True), None
+
+
+def _transcribe_clip_source(clip: dict) -> tuple[str, float]:
+    """
+    Transcribe one clip from whichever source it carries:
+      'stream'   — an open file object (multipart part)
+      'uploadId' — a completed resumable upload
+      'audio'    — legacy base64 string
+    """
+    mime_type = clip.get('mimeType', 'audio/m4a')
+    if clip.get('stream') is not None:
+        return _whisper_transcribe_stream(clip['stream'], mime_type)
+    if clip.get('uploadId'):
+        path = _upload_path(clip['uploadId'])
+        if not path or not os.path.exists(path):
+            raise FileNotFoundError(f"unknown uploadId {clip['uploadId']!r}")
+        with open(path, 'rb') as f:
+            return _whisper_transcribe_stream(f, mime_type)
+    audio_b64 = clip.get('audio')
+    if not audio_b64:
+        return '', 0.0
+    return _whisper_transcribe(base64.b64decode(audio_b64), mime_type)
+
+
+# Room dictations arrive as several pause/resume clips. Each Whisper call is a
+# network round-trip with no shared state, so they are fanned out over a small
+# thread pool. Bounded so one long room cannot open dozens of OpenAI
+# connections from a single gunicorn worker.
+_WHISPER_MAX_WORKERS = int(os.environ.get('WHISPER_MAX_WORKERS', '4'))
+
+
+def _transcribe_clips(clips: list) -> list:
+    """
+    Transcribe room clips concurrently and return one result per clip, in the
+    original clip order:
+        {'index': i, 'text': str, 'seconds': float, 'latency_ms': int}
+
+    Each clip is a dict understood by _transcribe_clip_source. Clips with no
+    audio, invalid base64 or a Whisper error come back with text='' so the
+    caller's ordering and duplicate-dropping logic still sees every position.
+    """
+    def _one(i, clip):
+        started = time.perf_counter()
+        text, secs = '', 0.0
+        try:
+            text, secs = _transcribe_clip_source(clip)
+        except Exception as e:
+            print(f'[transcribe/room] clip {i} whisper error: {e}')
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        print(f'[transcribe/room] clip {i}: {latency_ms}ms, {secs:.1f}s audio')
+        return {'index': i, 'text': text or '', 'seconds': secs, 'latency_ms': latency_ms}
+
+    if not clips:
+        return []
+    workers = max(1, min(_WHISPER_MAX_WORKERS, len(clips)))
+    if workers == 1:
+        return [_one(i, clip) for i, clip in enumerate(clips)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, so transcripts stay in clip order
+        return list(pool.map(_one, range(len(clips)), clips))
 
 
 def _claude_fill_item(transcript: str, item_label: str, room_name: str, section_type: str = 'room', edit_mode: str = 'normal', is_check_out: bool = False, is_damage_report: bool = False) -> dict:
@@ -777,7 +1063,7 @@ If no condition is mentioned, default condition to "In good order".
 
 """ + _multi_component_rule("description or condition") + """
 
-""" + _CONDITION_WORDS + """
+""" + _VOCABULARY_POINTER + """
 Return ONLY valid JSON, no markdown:
 {"_subs": [{"description": "...", "condition": "..."}]}"""
         else:
@@ -813,7 +1099,7 @@ DEFAULT CONDITION RULE — this is critical:
 """ + _multi_component_rule("description or condition") + """
 
 """ + _APPLIANCE_FORMATTING_RULE + """
-""" + _CONDITION_WORDS + """
+""" + _VOCABULARY_POINTER + """
 Return ONLY valid JSON, no markdown:
 {"description": "...", "condition": "..."}"""
 
@@ -843,6 +1129,7 @@ CRITICAL LANGUAGE RULES:
 
     message = client.messages.create(
         model='claude-haiku-4-5',
+        system=_CACHED_SYSTEM,
         max_tokens=300,
         messages=[{'role': 'user', 'content': prompt}]
     )
@@ -962,8 +1249,7 @@ Then parse everything AFTER the item name using these command formats:
 If no field/command word is given after the item name (just "amend"/"add" with content), that
 still selects overwrite-both or append-both respectively, per the formats above.
 
-{_CONDITION_WORDS}
-{_DESCRIPTION_VOCABULARY}
+{_VOCABULARY_POINTER}
 
 Return ONLY valid JSON, no markdown. Use the exact shape below, omitting keys that don't apply
 (e.g. a plain amend has no "_subs"; an "add sub item" command has no _descAction/_condAction):
@@ -974,6 +1260,7 @@ Return ONLY valid JSON, no markdown. Use the exact shape below, omitting keys th
 
     message = client.messages.create(
         model='claude-haiku-4-5',
+        system=_CACHED_SYSTEM,
         max_tokens=500,
         messages=[{'role': 'user', 'content': prompt}]
     )
@@ -1004,6 +1291,74 @@ def transcribe_status():
     })
 
 
+@transcribe_bp.route('/upload', methods=['POST'])
+@jwt_required()
+def create_upload():
+    """Start a resumable audio upload. Returns {uploadId, received: 0}."""
+    _purge_stale_uploads()
+    upload_id = uuid.uuid4().hex
+    open(_upload_path(upload_id), 'wb').close()
+    return jsonify({'uploadId': upload_id, 'received': 0}), 201
+
+
+@transcribe_bp.route('/upload/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_upload(upload_id):
+    """Bytes received so far — the client resumes its PUTs from this offset."""
+    path = _upload_path(upload_id)
+    if not path or not os.path.exists(path):
+        return jsonify({'error': 'Upload not found'}), 404
+    return jsonify({'uploadId': upload_id, 'received': os.path.getsize(path)})
+
+
+@transcribe_bp.route('/upload/<upload_id>', methods=['PUT'])
+@jwt_required()
+def append_upload(upload_id):
+    """
+    Append a raw binary chunk (request body) to an upload.
+    X-Upload-Offset must equal the bytes already received; on mismatch a 409
+    carries the correct offset so the client can resume without re-sending.
+    The body is streamed to disk in 64KB pieces — never held in memory.
+
+    The offset check and the append happen under an exclusive flock, so two
+    PUTs racing at the same offset can't both append. An upload may not grow
+    past UPLOAD_MAX_BYTES (413; the partial chunk is discarded).
+    """
+    path = _upload_path(upload_id)
+    if not path:
+        return jsonify({'error': 'Upload not found'}), 404
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)   # no O_CREAT: a purged upload stays gone
+    except FileNotFoundError:
+        return jsonify({'error': 'Upload not found'}), 404
+
+    with os.fdopen(fd, 'ab') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        received = os.fstat(f.fileno()).st_size
+        try:
+            offset = int(request.headers.get('X-Upload-Offset', received))
+        except ValueError:
+            return jsonify({'error': 'Invalid X-Upload-Offset'}), 400
+        if offset != received:
+            return jsonify({'error': 'Offset mismatch', 'uploadId': upload_id, 'received': received}), 409
+        if received + (request.content_length or 0) > UPLOAD_MAX_BYTES:
+            return jsonify({'error': 'Upload too large', 'maxBytes': UPLOAD_MAX_BYTES}), 413
+
+        size = received
+        while True:
+            chunk = request.stream.read(_UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > UPLOAD_MAX_BYTES:   # chunked body without a Content-Length
+                f.flush()
+                os.ftruncate(f.fileno(), received)
+                return jsonify({'error': 'Upload too large', 'maxBytes': UPLOAD_MAX_BYTES}), 413
+            f.write(chunk)
+        f.flush()
+    return jsonify({'uploadId': upload_id, 'received': size})
+
+
 @transcribe_bp.route('/item', methods=['POST'])
 @jwt_required()
 def transcribe_item():
@@ -1020,6 +1375,10 @@ def transcribe_item():
       "rowId":      "456"
     }
 
+    Instead of "audio", the body may reference a resumable upload with
+    "uploadId", or be sent as multipart/form-data with the JSON above in a
+    'payload' field and the audio as an 'audio' file part.
+
     Response JSON:
     {
       "transcript":  "White painted panel door...",
@@ -1029,12 +1388,14 @@ def transcribe_item():
       "rowId":       "456"
     }
     """
-    data = request.get_json()
+    data, files = _read_transcribe_request()
     if not data:
         return jsonify({'error': 'No data provided'}), 400
 
     audio_b64    = data.get('audio')
-    mime_type    = data.get('mimeType', 'audio/webm')
+    audio_part   = files.get('audio') if files else None
+    upload_id    = data.get('uploadId')
+    mime_type    = data.get('mimeType') or (audio_part.mimetype if audio_part else None) or 'audio/webm'
     item_label   = data.get('itemLabel', 'Item')
     room_name    = data.get('roomName', '')
     section_id   = data.get('sectionId')
@@ -1044,12 +1405,13 @@ def transcribe_item():
     is_damage_report  = bool(data.get('isDamageReport', False))
     all_items         = data.get('allItems') or []  # [{id, name}, ...] — room's full item list, for "Return to [item]" resolution
 
-    if not audio_b64:
+    if not audio_b64 and not audio_part and not upload_id:
         return jsonify({'error': 'No audio data'}), 400
 
     # Debug: log what we received
     print(f'[transcribe/item] mimeType received: {repr(mime_type)}')
-    print(f'[transcribe/item] audio_b64 length: {len(audio_b64)}')
+    if audio_b64:
+        print(f'[transcribe/item] audio_b64 length: {len(audio_b64)}')
 
     if not os.environ.get('OPENAI_API_KEY'):
         return jsonify({'error': 'OPENAI_API_KEY not configured on server'}), 503
@@ -1057,13 +1419,23 @@ def transcribe_item():
     if not os.environ.get('ANTHROPIC_API_KEY'):
         return jsonify({'error': 'ANTHROPIC_API_KEY not configured on server'}), 503
 
-    try:
-        audio_bytes = base64.b64decode(audio_b64)
-    except Exception:
-        return jsonify({'error': 'Invalid base64 audio data'}), 400
+    if audio_part:
+        audio_source = {'stream': audio_part.stream, 'mimeType': mime_type}
+    elif upload_id:
+        upload_path = _upload_path(upload_id)
+        if not upload_path or not os.path.exists(upload_path):
+            return jsonify({'error': 'Upload not found'}), 404
+        audio_source = {'uploadId': upload_id, 'mimeType': mime_type}
+    else:
+        try:
+            audio_source = {'stream': io.BytesIO(base64.b64decode(audio_b64)), 'mimeType': mime_type}
+        except Exception:
+            return jsonify({'error': 'Invalid base64 audio data'}), 400
 
     try:
-        raw_transcript, audio_secs = _whisper_transcribe(audio_bytes, mime_type)
+        raw_transcript, audio_secs = _transcribe_clip_source(audio_source)
+        if upload_id:
+            _discard_uploads([upload_id])
 
         if not raw_transcript:
             return jsonify({'error': 'No speech detected in recording'}), 422
@@ -1082,8 +1454,7 @@ def transcribe_item():
                     inspection_id = int(data.get('inspectionId')) if data.get('inspectionId') else None,
                     user_id       = int(get_jwt_identity()),
                     audio_seconds = audio_secs,
-                    input_tokens  = resolved_msg.usage.input_tokens  if resolved_msg and resolved_msg.usage else 0,
-                    output_tokens = resolved_msg.usage.output_tokens if resolved_msg and resolved_msg.usage else 0,
+                    **_usage_tokens(resolved_msg),
                     section_type  = section_type,
                 )
                 db.session.add(usage)
@@ -1150,8 +1521,7 @@ def transcribe_item():
                 inspection_id = int(data.get('inspectionId')) if data.get('inspectionId') else None,
                 user_id       = int(get_jwt_identity()),
                 audio_seconds = audio_secs,
-                input_tokens  = filled_msg.usage.input_tokens  if filled_msg and filled_msg.usage else 0,
-                output_tokens = filled_msg.usage.output_tokens if filled_msg and filled_msg.usage else 0,
+                **_usage_tokens(filled_msg),
                 section_type  = section_type,
             )
             db.session.add(usage)
@@ -1290,8 +1660,7 @@ Rules:
                 inspection_id = inspection_id,
                 user_id       = int(get_jwt_identity()),
                 audio_seconds = 0,
-                input_tokens  = message.usage.input_tokens  if message.usage else 0,
-                output_tokens = message.usage.output_tokens if message.usage else 0,
+                **_usage_tokens(message),
                 section_type  = 'photo',
             )
             db.session.add(usage_log)
@@ -1333,6 +1702,8 @@ def transcribe_usage():
     WHISPER_PER_MIN_USD   = 0.006          # Whisper-1 ($0.006/min)
     HAIKU_IN_PER_1M_USD   = 1.00           # claude-haiku-4-5 input
     HAIKU_OUT_PER_1M_USD  = 5.00           # claude-haiku-4-5 output
+    HAIKU_CACHE_READ_PER_1M_USD  = 0.10    # prompt-cache read (0.1x input)
+    HAIKU_CACHE_WRITE_PER_1M_USD = 1.25    # prompt-cache write, 5-min TTL (1.25x input)
     # Photo classification uses claude-opus-4-5 — apply Opus-tier pricing
     OPUS_IN_PER_1M_USD    = 15.00          # claude-opus-4-5 input
     OPUS_OUT_PER_1M_USD   = 75.00          # claude-opus-4-5 output
@@ -1353,9 +1724,14 @@ def transcribe_usage():
         else:
             # Whisper + Haiku pricing (item / room / full)
             whisper = (r.audio_seconds / 60) * WHISPER_PER_MIN_USD
-            claude  = (r.input_tokens  / 1_000_000) * HAIKU_IN_PER_1M_USD + \
-                      (r.output_tokens / 1_000_000) * HAIKU_OUT_PER_1M_USD
-            return whisper + claude
+            return whisper + _haiku_usd(r.input_tokens, r.output_tokens,
+                                        r.cache_read_tokens or 0, r.cache_write_tokens or 0)
+
+    def _haiku_usd(in_toks, out_toks, cache_read, cache_write):
+        return (in_toks     / 1_000_000) * HAIKU_IN_PER_1M_USD + \
+               (out_toks    / 1_000_000) * HAIKU_OUT_PER_1M_USD + \
+               (cache_read  / 1_000_000) * HAIKU_CACHE_READ_PER_1M_USD + \
+               (cache_write / 1_000_000) * HAIKU_CACHE_WRITE_PER_1M_USD
 
     # ── Overall summary ────────────────────────────────────────────────────
     item_count  = sum(1 for r in rows if r.call_type == 'item')
@@ -1371,9 +1747,13 @@ def transcribe_usage():
     total_audio_secs = sum(r.audio_seconds for r in trans_rows)
 
     whisper_usd     = sum((r.audio_seconds / 60) * WHISPER_PER_MIN_USD for r in trans_rows)
-    haiku_usd       = sum((r.input_tokens / 1_000_000) * HAIKU_IN_PER_1M_USD +
-                          (r.output_tokens / 1_000_000) * HAIKU_OUT_PER_1M_USD
+    haiku_usd       = sum(_haiku_usd(r.input_tokens, r.output_tokens,
+                                     r.cache_read_tokens or 0, r.cache_write_tokens or 0)
                           for r in trans_rows)
+    cache_read_tokens  = sum(r.cache_read_tokens  or 0 for r in trans_rows)
+    cache_write_tokens = sum(r.cache_write_tokens or 0 for r in trans_rows)
+    # What the cached reads would have cost as ordinary input tokens
+    cache_saved_usd = (cache_read_tokens / 1_000_000) * (HAIKU_IN_PER_1M_USD - HAIKU_CACHE_READ_PER_1M_USD)
     photo_opus_usd  = sum((r.input_tokens / 1_000_000) * OPUS_IN_PER_1M_USD +
                           (r.output_tokens / 1_000_000) * OPUS_OUT_PER_1M_USD
                           for r in photo_rows)
@@ -1387,6 +1767,7 @@ def transcribe_usage():
     by_insp = defaultdict(lambda: {
         'trans_seconds': 0.0,
         'trans_in': 0, 'trans_out': 0,
+        'trans_cache_read': 0, 'trans_cache_write': 0,
         'photo_in': 0, 'photo_out': 0,
         'pdf_in':   0, 'pdf_out':   0,
         'item_calls': 0, 'room_calls': 0, 'photo_calls': 0, 'pdf_calls': 0,
@@ -1400,6 +1781,8 @@ def transcribe_usage():
             g['trans_seconds'] += r.audio_seconds
             g['trans_in']      += r.input_tokens
             g['trans_out']     += r.output_tokens
+            g['trans_cache_read']  += r.cache_read_tokens  or 0
+            g['trans_cache_write'] += r.cache_write_tokens or 0
             if r.call_type == 'item':
                 g['item_calls'] += 1
             else:
@@ -1433,8 +1816,8 @@ def transcribe_usage():
                               key=lambda x: x[1]['latest_at'] or datetime.min,
                               reverse=True):
         w_usd  = (g['trans_seconds'] / 60) * WHISPER_PER_MIN_USD
-        hk_usd = (g['trans_in']  / 1_000_000) * HAIKU_IN_PER_1M_USD + \
-                 (g['trans_out'] / 1_000_000) * HAIKU_OUT_PER_1M_USD
+        hk_usd = _haiku_usd(g['trans_in'], g['trans_out'],
+                            g['trans_cache_read'], g['trans_cache_write'])
         op_usd = (g['photo_in']  / 1_000_000) * OPUS_IN_PER_1M_USD  + \
                  (g['photo_out'] / 1_000_000) * OPUS_OUT_PER_1M_USD
         pd_usd = (g['pdf_in']    / 1_000_000) * SONNET_IN_PER_1M_USD + \
@@ -1483,6 +1866,9 @@ def transcribe_usage():
         'audio_minutes':    round(total_audio_secs / 60, 1),
         'whisper_cost_gbp': round(whisper_usd   * USD_TO_GBP, 4),
         'claude_cost_gbp':  round(haiku_usd     * USD_TO_GBP, 4),
+        'cache_read_tokens':  cache_read_tokens,
+        'cache_write_tokens': cache_write_tokens,
+        'cache_saved_gbp':    round(cache_saved_usd * USD_TO_GBP, 4),
         'photo_cost_gbp':   round(photo_opus_usd * USD_TO_GBP, 4),
         'pdf_cost_gbp':     round(pdf_sonnet_usd * USD_TO_GBP, 4),
         'pdf_avg_cost_gbp': round(pdf_avg_usd    * USD_TO_GBP, 4),
@@ -2458,8 +2844,7 @@ If no amendment phrase — omit the action flags entirely (default behaviour = f
 "Amend [item]" with no field specified → set BOTH _descAction and _condAction to "overwrite".
 "Add to [item]" with no field specified → set BOTH _descAction and _condAction to "append".
 
-{_CONDITION_WORDS}
-{_DESCRIPTION_VOCABULARY}
+{_VOCABULARY_POINTER}
 {retry_note}
 Return ONLY valid JSON — no markdown, no extra text.
 Items without sub-items use the flat shape. Items WITH sub-items include the "_subs" array.
@@ -2491,6 +2876,7 @@ The "_delete" flag is only included when the clerk says "Delete Item" or "Not Ap
 
     message = client.messages.create(
         model='claude-haiku-4-5',
+        system=_CACHED_SYSTEM,
         max_tokens=8000,
         messages=[{'role': 'user', 'content': prompt}]
     )
@@ -2933,6 +3319,7 @@ Return ONLY valid JSON matching that shape — no markdown, no extra text, real
 
     message = client.messages.create(
         model='claude-haiku-4-5',
+        system=_CACHED_SYSTEM,
         max_tokens=3000,
         messages=[{'role': 'user', 'content': prompt}]
     )
@@ -2958,7 +3345,7 @@ def transcribe_room():
 
     Request JSON:
     {
-      "clips":       [{"audio": "<base64>", "mimeType": "audio/m4a"}, ...],
+      "clips":       [{"audio": "<base64>", "mimeType": "audio/m4a"}, ...],   # or {"uploadId": ...}
       "sectionName": "Living Room",
       "sectionKey":  "123",
       "items": [
@@ -2967,6 +3354,9 @@ def transcribe_room():
       ]
     }
 
+    Also accepts multipart/form-data: the JSON above (without "clips") in a
+    'payload' field plus one 'clips' file part per clip, in recording order.
+
     Response JSON:
     {
       "transcript": "Ceiling. Good condition, white painted...",
@@ -2975,45 +3365,81 @@ def transcribe_room():
       }
     }
     """
-    data = request.get_json()
+    data, files = _read_transcribe_request()
     if not data:
         return jsonify({'error': 'No data provided'}), 400
 
+    params, error = _room_request_params(data, files)
+    if error:
+        return jsonify({'error': error[0]}), error[1]
+
+    result, status = _run_room_transcription(params, user_id=int(get_jwt_identity()))
+    if status == 200:
+        _discard_uploads(_clip_upload_ids(params['clips']))
+    return jsonify(result), status
+
+
+def _room_request_params(data: dict, files):
+    """
+    Parse and validate a /room (or /room-job) body.
+    Returns (params, None) or (None, (error_message, http_status)).
+    """
     clips              = data.get('clips', [])
-    section_name       = data.get('sectionName', 'Room')
-    section_type       = data.get('sectionType', 'room')   # 'room' | fixed-section types
+    if files:
+        clips = [{'stream': part.stream, 'mimeType': part.mimetype or 'audio/m4a'}
+                 for part in files.getlist('clips')]
     items              = data.get('items', [])
-    is_check_out       = bool(data.get('isCheckOut', False))
-    is_damage_report   = bool(data.get('isDamageReport', False))
-    processed_item_ids = data.get('processedItemIds') or []
-    inspection_id      = int(data['inspectionId']) if data.get('inspectionId') else None
 
     if not clips:
-        return jsonify({'error': 'No audio clips provided'}), 400
+        return None, ('No audio clips provided', 400)
     if not items:
-        return jsonify({'error': 'No items provided'}), 400
+        return None, ('No items provided', 400)
 
     if not os.environ.get('OPENAI_API_KEY'):
-        return jsonify({'error': 'OPENAI_API_KEY not configured on server'}), 503
+        return None, ('OPENAI_API_KEY not configured on server', 503)
     if not os.environ.get('ANTHROPIC_API_KEY'):
-        return jsonify({'error': 'ANTHROPIC_API_KEY not configured on server'}), 503
+        return None, ('ANTHROPIC_API_KEY not configured on server', 503)
 
-    # Transcribe each clip with Whisper, collect actual durations
+    return {
+        'clips':              clips,
+        'section_name':       data.get('sectionName', 'Room'),
+        'section_type':       data.get('sectionType', 'room'),   # 'room' | fixed-section types
+        'items':              items,
+        'is_check_out':       bool(data.get('isCheckOut', False)),
+        'is_damage_report':   bool(data.get('isDamageReport', False)),
+        'processed_item_ids': data.get('processedItemIds') or [],
+        'inspection_id':      int(data['inspectionId']) if data.get('inspectionId') else None,
+    }, None
+
+
+def _run_room_transcription(params: dict, user_id: int, progress=None):
+    """
+    Whisper every clip, fill the room with Claude and log usage.
+    Returns (response_body, http_status). Shared by the synchronous /room
+    endpoint and the /room-job worker pool; needs an app context (usage log)
+    but no request context. progress, if given, is called with a short
+    human-readable stage string.
+    """
+    clips              = params['clips']
+    section_name       = params['section_name']
+    section_type       = params['section_type']
+    items              = params['items']
+    is_check_out       = params['is_check_out']
+    is_damage_report   = params['is_damage_report']
+    processed_item_ids = params['processed_item_ids']
+    inspection_id      = params['inspection_id']
+
+    if progress:
+        progress(f'Transcribing {len(clips)} clip(s)…')
+
+    # Transcribe every clip with Whisper (concurrently), collect actual durations
+    clip_results = _transcribe_clips(clips)
     transcripts = []
     total_audio_secs = 0.0
-    for i, clip in enumerate(clips):
-        audio_b64 = clip.get('audio')
-        mime_type = clip.get('mimeType', 'audio/m4a')
-        if not audio_b64:
-            continue
-        try:
-            audio_bytes = base64.b64decode(audio_b64)
-            text, secs = _whisper_transcribe(audio_bytes, mime_type)
-            if text:
-                transcripts.append(text.strip())
-                total_audio_secs += secs
-        except Exception as e:
-            print(f'[transcribe/room] clip {i} whisper error: {e}')
+    for r in clip_results:
+        if r['text']:
+            transcripts.append(r['text'].strip())
+            total_audio_secs += r['seconds']
 
     # Drop consecutive identical clip transcripts — duplicate clip rows can be
     # restored from the mobile app's local DB after a remount, and a duplicated
@@ -3026,8 +3452,10 @@ def transcribe_room():
         deduped.append(t)
     full_transcript = ' '.join(deduped)
     if not full_transcript:
-        return jsonify({'error': 'No speech detected in recording'}), 422
+        return {'error': 'No speech detected in recording'}, 422
 
+    if progress:
+        progress('Filling room…')
     try:
         if section_type == 'room':
             if is_check_out:
@@ -3052,17 +3480,16 @@ def transcribe_room():
             filled, fill_msg = _claude_fill_fixed_section(full_transcript, section_name, section_type, items)
     except Exception as e:
         print(f'[transcribe/room] claude error: {e}')
-        return jsonify({'error': f'AI fill error: {str(e)}'}), 500
+        return {'error': f'AI fill error: {str(e)}'}, 500
 
     # Log usage — previously missing for room-mode transcriptions
     try:
         usage_log = TranscriptionUsage(
             call_type     = 'room',
             inspection_id = inspection_id,
-            user_id       = int(get_jwt_identity()),
+            user_id       = user_id,
             audio_seconds = total_audio_secs,
-            input_tokens  = fill_msg.usage.input_tokens  if fill_msg and fill_msg.usage else 0,
-            output_tokens = fill_msg.usage.output_tokens if fill_msg and fill_msg.usage else 0,
+            **_usage_tokens(fill_msg),
             section_type  = section_type,
         )
         db.session.add(usage_log)
@@ -3070,9 +3497,239 @@ def transcribe_room():
     except Exception:
         pass  # never let logging break the response
 
-    return jsonify({
+    return {
         'transcript': full_transcript,
         'filled':     filled,
+        'clipTimings': [
+            {'index': r['index'], 'latencyMs': r['latency_ms'], 'audioSeconds': r['seconds']}
+            for r in clip_results
+        ],
+    }, 200
+
+
+# ── Room transcription jobs ───────────────────────────────────────────────
+# /room holds a sync gunicorn worker for every Whisper call plus up to three
+# Claude fills. /room-job runs the same pipeline on a small per-process worker
+# pool and returns a job id at once; the app polls /room-job-status/<id>, the
+# same shape as /pdf-import + /pdf-import-status. Job state lives in files
+# under ROOM_JOBS_DIR so any worker can answer a poll and /room-jobs can
+# report queue depth across all workers.
+ROOM_JOBS_DIR      = '/tmp/room_transcribe_jobs'
+ROOM_JOB_WORKERS   = int(os.environ.get('ROOM_JOB_WORKERS', '2'))
+ROOM_JOB_QUEUE_MAX = int(os.environ.get('ROOM_JOB_QUEUE_MAX', '6'))   # waiting jobs per process
+ROOM_JOB_TTL_SECS  = 3600   # results never polled are purged after an hour
+os.makedirs(ROOM_JOBS_DIR, exist_ok=True)
+
+_room_job_lock    = threading.Lock()
+_room_job_pool    = None
+_room_job_pid     = None   # pool is created lazily per process — threads don't survive fork
+_room_job_pending = 0      # queued + running in this process
+
+
+def _room_job_path(job_id):
+    return os.path.join(ROOM_JOBS_DIR, job_id + '.json')
+
+def _write_room_job(job_id, data):
+    # write-then-rename so a concurrent poll never reads a half-written file
+    tmp = _room_job_path(job_id) + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, _room_job_path(job_id))
+
+def _read_room_job(job_id):
+    path = _room_job_path(job_id)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _delete_room_job(job_id):
+    try:
+        os.remove(_room_job_path(job_id))
+    except OSError:
+        pass
+
+
+def _purge_stale_room_jobs():
+    now = time.time()
+    try:
+        for de in os.scandir(ROOM_JOBS_DIR):
+            try:
+                if now - de.stat().st_mtime > ROOM_JOB_TTL_SECS:
+                    os.unlink(de.path)
+            except OSError:
+                pass
+    except OSError:
+        pass
+
+
+def _get_room_job_pool():
+    global _room_job_pool, _room_job_pid
+    if _room_job_pool is None or _room_job_pid != os.getpid():
+        _room_job_pool = ThreadPoolExecutor(max_workers=ROOM_JOB_WORKERS,
+                                            thread_name_prefix='room-job')
+        _room_job_pid = os.getpid()
+    return _room_job_pool
+
+
+def _run_room_job(app, job_id, params, user_id, owned_upload_ids):
+    global _room_job_pending
+    job = _read_room_job(job_id) or {}
+    try:
+        def _progress(msg):
+            job.update({'status': 'processing', 'progress': msg})
+            job.setdefault('started_at', time.time())
+            _write_room_job(job_id, job)
+
+        with app.app_context():
+            result, status = _run_room_transcription(params, user_id, progress=_progress)
+        if status == 200:
+            job.update({'status': 'done', 'result': result})
+            _discard_uploads(_clip_upload_ids(params['clips']))
+        else:
+            job.update({'status': 'error', 'error': result.get('error', 'Unknown error'),
+                        'http_status': status})
+    except Exception as e:
+        import traceback
+        print(f'[transcribe/room-job] {job_id} failed: {e}')
+        print(traceback.format_exc())
+        job.update({'status': 'error', 'error': str(e), 'http_status': 500})
+    finally:
+        job['finished_at'] = time.time()
+        _write_room_job(job_id, job)
+        _discard_uploads(owned_upload_ids)
+        with _room_job_lock:
+            _room_job_pending -= 1
+
+
+@transcribe_bp.route('/room-job', methods=['POST'])
+@jwt_required()
+def submit_room_job():
+    """
+    Asynchronous /room. Same request body (JSON or multipart); returns
+    {job_id} with 202 as soon as the job is queued. 503 with Retry-After when
+    this worker's queue is full.
+    """
+    global _room_job_pending
+    data, files = _read_transcribe_request()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+
+    params, error = _room_request_params(data, files)
+    if error:
+        return jsonify({'error': error[0]}), error[1]
+
+    with _room_job_lock:
+        if _room_job_pending >= ROOM_JOB_WORKERS + ROOM_JOB_QUEUE_MAX:
+            resp = jsonify({'error': 'Transcription queue is full — please retry shortly'})
+            resp.headers['Retry-After'] = '15'
+            return resp, 503
+        _room_job_pending += 1
+
+    try:
+        # Multipart parts belong to this request and vanish with it, so spool
+        # them into upload files the job can reopen (and delete when done).
+        owned_upload_ids = []
+        clips = []
+        for clip in params['clips']:
+            if clip.get('stream') is not None:
+                upload_id = uuid.uuid4().hex
+                with open(_upload_path(upload_id), 'wb') as f:
+                    while True:
+                        chunk = clip['stream'].read(_UPLOAD_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                owned_upload_ids.append(upload_id)
+                clip = {'uploadId': upload_id, 'mimeType': clip.get('mimeType', 'audio/m4a')}
+            clips.append(clip)
+        params['clips'] = clips
+
+        _purge_stale_room_jobs()
+        job_id = str(uuid.uuid4())
+        _write_room_job(job_id, {
+            'status':        'queued',
+            'progress':      'Waiting for a transcription worker…',
+            'inspection_id': params['inspection_id'],
+            'section_name':  params['section_name'],
+            'queued_at':     time.time(),
+        })
+        _get_room_job_pool().submit(
+            _run_room_job, current_app._get_current_object(), job_id, params,
+            int(get_jwt_identity()), owned_upload_ids,
+        )
+    except Exception:
+        with _room_job_lock:
+            _room_job_pending -= 1
+        raise
+
+    print(f'[transcribe/room-job] queued {job_id} ({len(clips)} clips, pending={_room_job_pending})')
+    return jsonify({'job_id': job_id}), 202
+
+
+@transcribe_bp.route('/room-job-status/<job_id>', methods=['GET'])
+@jwt_required()
+def room_job_status(job_id):
+    if not job_id or len(job_id) > 40 or not _re.match(r'^[0-9a-f-]+$', job_id):
+        return jsonify({'error': 'Invalid job ID'}), 400
+
+    job = _read_room_job(job_id)
+    if not job:
+        return jsonify({'status': 'not_found'}), 404
+
+    status = job.get('status')
+    if status in ('queued', 'processing'):
+        return jsonify({
+            'status':        status,
+            'progress':      job.get('progress', ''),
+            'inspection_id': job.get('inspection_id'),
+            'section_name':  job.get('section_name', ''),
+        })
+    _delete_room_job(job_id)
+    if status == 'done':
+        return jsonify({
+            'status':        'done',
+            'result':        job['result'],
+            'inspection_id': job.get('inspection_id'),
+            'section_name':  job.get('section_name', ''),
+        })
+    return jsonify({
+        'status':        'error',
+        'error':         job.get('error', 'Unknown error'),
+        'http_status':   job.get('http_status', 500),
+        'inspection_id': job.get('inspection_id'),
+        'section_name':  job.get('section_name', ''),
+    })
+
+
+@transcribe_bp.route('/room-jobs', methods=['GET'])
+@jwt_required()
+def room_jobs_overview():
+    """Queue depth across all workers (from the shared job files)."""
+    counts = {'queued': 0, 'processing': 0, 'done': 0, 'error': 0}
+    oldest_queued = None
+    try:
+        for de in os.scandir(ROOM_JOBS_DIR):
+            if not de.name.endswith('.json'):
+                continue
+            try:
+                with open(de.path) as f:
+                    job = json.load(f)
+            except (OSError, ValueError):
+                continue
+            st = job.get('status')
+            if st in counts:
+                counts[st] += 1
+            if st == 'queued' and job.get('queued_at'):
+                oldest_queued = min(oldest_queued or job['queued_at'], job['queued_at'])
+    except OSError:
+        pass
+    return jsonify({
+        **counts,
+        'oldest_queued_secs':      round(time.time() - oldest_queued, 1) if oldest_queued else None,
+        'workers_per_process':     ROOM_JOB_WORKERS,
+        'queue_limit_per_process': ROOM_JOB_QUEUE_MAX,
+        'pending_this_process':    _room_job_pending,
     })
 
 
@@ -3666,8 +4323,7 @@ CRITICAL JSON FORMATTING:
             inspection_id = inspection_id,
             user_id       = int(get_jwt_identity()),
             audio_seconds = 0,
-            input_tokens  = message.usage.input_tokens  if message.usage else 0,
-            output_tokens = message.usage.output_tokens if message.usage else 0,
+            **_usage_tokens(message),
             section_type  = 'condition_summary',
         )
         db.session.add(usage_log)
@@ -0,0 +1,361 @@
+"""
+services/completion_jobs.py
+───────────────────────────
+Durable post-completion fan-out: report email, The Depositary push (check-outs)
+and Google Drive upload.
+
+update_inspection() used to do all of this in an untracked threading.Thread
+inside the gunicorn worker — a burst of completions meant N concurrent
+ReportLab builds competing with request traffic, and a deploy or worker kill
+mid-thread silently dropped the email. Now it only calls
+enqueue_completion(), which writes one CompletionJob row per integration;
+the standalone completion_worker.py process claims and runs them.
+
+Semantics:
+  • Claiming uses SELECT … FOR UPDATE SKIP LOCKED, so any number of worker
+    processes/threads can drain the table without double-delivery.
+  • All due jobs for one inspection are claimed together and share one PDF
+    build (which the artifact cache in routes/pdf_generator.py also reuses);
+    the deliveries themselves then run concurrently, so time-to-delivery is
+    the slowest integration rather than the sum of all of them.
+  • Each delivery's latest outcome is merged into inspections.delivery_status.
+  • A failed delivery is retried with exponential backoff
+    (COMPLETION_RETRY_BASE_SECS × 2^n, capped at COMPLETION_RETRY_MAX_SECS)
+    up to the integration's MAX_ATTEMPTS, then marked failed.
+  • A job left 'running' for COMPLETION_JOB_LOCK_TIMEOUT_SECS (its worker
+    died) is returned to 'pending' by recover_stale_jobs().
+
+Usage:
+    from services.completion_jobs import enqueue_completion
+    enqueue_completion(inspection)          # from the request, after commit
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+
+from flask import current_app
+
+from models import db, Inspection, CompletionJob
+
+
+RETRY_BASE_SECS   = int(os.environ.get('COMPLETION_RETRY_BASE_SECS', '60'))
+RETRY_MAX_SECS    = int(os.environ.get('COMPLETION_RETRY_MAX_SECS', '3600'))
+LOCK_TIMEOUT_SECS = int(os.environ.get('COMPLETION_JOB_LOCK_TIMEOUT_SECS', '900'))
+
+INTEGRATIONS = ('email', 'depositary', 'drive')
+MAX_ATTEMPTS = {'email': 6, 'depositary': 5, 'drive': 5}
+
+# Resend's limit is 40 MB total (content + attachments). A 30 MB PDF encodes
+# to ~40 MB in base64, so anything over 25 MB is sent as an S3 download link.
+PDF_ATTACH_LIMIT = 25 * 1024 * 1024
+
+
+class Skipped(Exception):
+    """Nothing to deliver (not configured, no recipients, already sent)."""
+
+
+class PermanentError(Exception):
+    """Delivery failed in a way a retry cannot fix (e.g. missing credentials)."""
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Enqueue
+# ─────────────────────────────────────────────────────────────────────────────
+
+def enqueue_completion(inspection) -> list:
+    """
+    Queue every applicable integration for a newly completed inspection.
+    A still-pending job for the same integration is reset rather than
+    duplicated. Commits.
+    """
+    jobs = []
+    for name in INTEGRATIONS:
+        if name == 'depositary' and inspection.inspection_type != 'check_out':
+            continue
+        job = (CompletionJob.query
+               .filter_by(inspection_id=inspection.id, integration=name, status='pending')
+               .first())
+        if job:
+            job.next_attempt_at = _now()
+            job.attempts        = 0
+            job.last_error      = None
+        else:
+            job = CompletionJob(inspection_id=inspection.id, integration=name,
+                                max_attempts=MAX_ATTEMPTS[name], next_attempt_at=_now())
+            db.session.add(job)
+        jobs.append(job)
+    db.session.commit()
+    print(f'[completion] queued {[j.integration for j in jobs]} for inspection {inspection.id}')
+    return jobs
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Claim / finish (worker side)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def recover_stale_jobs() -> int:
+    """Return jobs whose worker died mid-run to the queue. Commits."""
+    cutoff = _now() - timedelta(seconds=LOCK_TIMEOUT_SECS)
+    stale = (CompletionJob.query
+             .filter(CompletionJob.status == 'running', CompletionJob.locked_at < cutoff)
+             .with_for_update(skip_locked=True)
+             .all())
+    for job in stale:
+        print(f'[completion] job {job.id} ({job.integration}) lock expired — re-queueing')
+        job.status          = 'pending'
+        job.locked_by       = None
+        job.next_attempt_at = _now()
+    db.session.commit()
+    return len(stale)
+
+
+def claim_next(worker_id: str):
+    """
+    Claim every due pending job of the inspection at the head of the queue.
+    Returns (inspection_id, [job_id, ...]) or (None, []). Commits.
+    """
+    now = _now()
+    head = (CompletionJob.query
+            .filter(CompletionJob.status == 'pending', CompletionJob.next_attempt_at <= now)
+            .order_by(CompletionJob.next_attempt_at, CompletionJob.id)
+            .with_for_update(skip_locked=True)
+            .first())
+    if not head:
+        db.session.rollback()
+        return None, []
+
+    jobs = (CompletionJob.query
+            .filter(CompletionJob.inspection_id == head.inspection_id,
+                    CompletionJob.status == 'pending',
+                    CompletionJob.next_attempt_at <= now)
+            .with_for_update(skip_locked=True)
+            .all())
+    for job in jobs:
+        job.status    = 'running'
+        job.locked_by = worker_id
+        job.locked_at = now
+        job.attempts  = (job.attempts or 0) + 1
+    db.session.commit()
+    return head.inspection_id, [j.id for j in jobs]
+
+
+def _finish(job, status, result=None, error=None):
+    job.status      = status
+    job.result      = result
+    job.last_error  = error
+    job.locked_by   = None
+    job.finished_at = _now()
+
+
+def _reschedule(job, error):
+    """Back off and retry, or give up once max_attempts is reached."""
+    if job.attempts >= job.max_attempts:
+        print(f'[completion] job {job.id} ({job.integration}) FAILED after {job.attempts} attempts: {error}')
+        _finish(job, 'failed', error=error)
+        return
+    delay = min(RETRY_MAX_SECS, RETRY_BASE_SECS * (2 ** max(0, job.attempts - 1)))
+    print(f'[completion] job {job.id} ({job.integration}) attempt {job.attempts} failed: {error} '
+          f'— retrying in {delay}s')
+    job.status          = 'pending'
+    job.last_error      = error
+    job.locked_by       = None
+    job.next_attempt_at = _now() + timedelta(seconds=delay)
+
+
+def _outcome(job):
+    return {
+        'status':          job.status,
+        'detail':          job.last_error or job.result,
+        'attempts':        job.attempts,
+        'at':              _now().isoformat(),
+        'next_attempt_at': job.next_attempt_at.isoformat() if job.status == 'pending' and job.next_attempt_at else None,
+    }
+
+
+def _record_outcomes(inspection_id, outcomes):
+    """Merge {integration: outcome} into inspections.delivery_status. Commits."""
+    insp = (db.session.query(Inspection)
+            .filter_by(id=inspection_id)
+            .with_for_update()
+            .populate_existing()
+            .one_or_none())
+    if not insp:
+        db.session.rollback()
+        return
+    try:
+        current = json.loads(insp.delivery_status) if insp.delivery_status else {}
+    except (TypeError, ValueError):
+        current = {}
+    current.update(outcomes)
+    insp.delivery_status = json.dumps(current)
+    db.session.commit()
+
+
+def _run_one(job, insp, pdf_bytes):
+    """Run one delivery and persist the job row. Returns its outcome dict."""
+    handler = _HANDLERS[job.integration]
+    try:
+        result = handler(insp, pdf_bytes)
+        _finish(job, 'done', result=str(result) if result is not None else None)
+        print(f'[completion] job {job.id} ({job.integration}) done')
+    except Skipped as e:
+        _finish(job, 'skipped', result=str(e))
+        print(f'[completion] job {job.id} ({job.integration}) skipped: {e}')
+    except PermanentError as e:
+        _finish(job, 'failed', error=str(e))
+        print(f'[completion] job {job.id} ({job.integration}) FAILED (not retryable): {e}')
+    except Exception as e:
+        _reschedule(job, str(e) or type(e).__name__)
+    db.session.commit()
+    return _outcome(job)
+
+
+def run_claimed(inspection_id: int, job_ids: list):
+    """
+    Build the PDF once, then run the claimed deliveries against it
+    concurrently and record their outcomes on the inspection. Commits.
+    """
+    jobs = CompletionJob.query.filter(CompletionJob.id.in_(job_ids)).all()
+    insp = db.session.get(Inspection, inspection_id)
+    if not insp:
+        for job in jobs:
+            _finish(job, 'failed', error='inspection not found')
+        db.session.commit()
+        return
+
+    print(f'[completion] ── inspection {inspection_id}: {[j.integration for j in jobs]} ──')
+    try:
+        from routes.pdf_generator import generate_inspection_pdf
+        pdf_bytes = generate_inspection_pdf(inspection_id)
+        print(f'[completion] PDF generated OK — {len(pdf_bytes)} bytes')
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        for job in jobs:
+            _reschedule(job, f'PDF generation failed: {e}')
+        db.session.commit()
+        _record_outcomes(inspection_id, {j.integration: _outcome(j) for j in jobs})
+        return
+
+    # Each delivery runs in its own app context, so it gets its own scoped
+    # session and its own copy of the inspection — the integrations commit
+    # independent columns (completion_email_sent, drive_file_id,
+    # depositary_tenancy_id) and never share ORM state across threads.
+    app = current_app._get_current_object()
+    db.session.commit()   # release row locks / snapshot before fanning out
+
+    def _deliver(job_id):
+        with app.app_context():
+            try:
+                job = db.session.get(CompletionJob, job_id)
+                own = db.session.get(Inspection, inspection_id)
+                return job.integration, _run_one(job, own, pdf_bytes)
+            finally:
+                db.session.remove()
+
+    with ThreadPoolExecutor(max_workers=len(job_ids), thread_name_prefix='completion-delivery') as pool:
+        outcomes = dict(pool.map(_deliver, job_ids))
+    _record_outcomes(inspection_id, outcomes)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Integrations — each returns a short result string, or raises
+# Skipped / PermanentError / any other exception (retried).
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _deliver_email(insp, pdf_bytes):
+    # Auto email only on first completion. If completion_email_sent is already
+    # True the inspection was completed, emailed, then re-opened for edits —
+    # the client only ever receives one automatic email; later sends are via
+    # Share PDF.
+    if insp.completion_email_sent:
+        raise Skipped('auto email already sent for this inspection')
+
+    from routes.pdf_generator import _get_report_recipients
+    recipients = _get_report_recipients(insp)
+    if not recipients:
+        raise Skipped('no recipients — set client email, email override, or tenant email')
+
+    prop   = insp.property
+    client = prop.client if prop else None
+    if not client:
+        # Fall back to a stub so the email body still renders when the client
+        # relationship can't be loaded.
+        class _StubClient:
+            name    = 'Client'
+            email   = ''
+            company = ''
+            logo    = None
+            primary_color            = '#1E3A8A'
+            report_color_override    = None
+            report_header_text_color = '#FFFFFF'
+            report_body_text_color   = '#1e293b'
+            report_orientation       = 'portrait'
+            report_disclaimer        = ''
+        client = _StubClient()
+        print('[completion] WARNING: no client object — using stub for email body')
+
+    pdf_dl_url = None
+    if len(pdf_bytes) > PDF_ATTACH_LIMIT:
+        print(f'[completion] PDF is {len(pdf_bytes)//1024//1024} MB — uploading to S3 for download link')
+        try:
+            from utils.s3 import is_configured as s3_ok, upload_bytes, presign_get
+            if s3_ok():
+                key = f"reports/inspection-{insp.id}-{_now().strftime('%Y%m%d%H%M%S')}.pdf"
+                upload_bytes(pdf_bytes, key, content_type='application/pdf')
+                pdf_dl_url = presign_get(key, expires=604800)  # 7 days (AWS S3 maximum)
+            else:
+                print('[completion] WARNING: PDF too large for email and S3 is not configured — attaching anyway')
+        except Exception as s3_err:
+            print(f'[completion] S3 upload failed (non-fatal): {s3_err} — attaching anyway')
+
+    from routes.email_service import send_report_complete
+    ok, err = send_report_complete(
+        insp, client, prop,
+        pdf_bytes        = None if pdf_dl_url else pdf_bytes,
+        recipients       = recipients,
+        pdf_download_url = pdf_dl_url,
+    )
+    if not ok:
+        if 'credentials not configured' in str(err):
+            raise PermanentError(f'{err} — set SMTP_USER and SMTP_PASSWORD')
+        raise RuntimeError(f'email send failed: {err}')
+
+    # Mark so re-completions don't trigger another auto email
+    insp.completion_email_sent = True
+    db.session.commit()
+    return f'sent to {", ".join(recipients)}'
+
+
+def _deliver_depositary(insp, pdf_bytes):
+    from services.depositary import push_checkout, is_configured
+    if not is_configured():
+        raise Skipped('not configured (set depositary_api_url + depositary_api_key in Settings → Integrations)')
+    ok, result = push_checkout(insp, pdf_bytes)
+    if not ok:
+        raise RuntimeError(f'push failed: {result}')
+    return f'tenancy_id={result}'
+
+
+def _deliver_drive(insp, pdf_bytes):
+    from services.google_drive import upload_report, is_drive_connected
+    if not is_drive_connected():
+        raise Skipped('Google Drive not connected')
+    ok, result = upload_report(insp, pdf_bytes)
+    if not ok:
+        raise RuntimeError(f'upload failed: {result}')
+    insp.drive_file_id = result['file_id']
+    db.session.commit()
+    return result.get('url')
+
+
+_HANDLERS = {
+    'email':      _deliver_email,
+    'depositary': _deliver_depositary,
+    'drive':      _deliver_drive,
+}
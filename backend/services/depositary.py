@@ -100,9 +100,8 @@ def _build_payload(inspection) -> dict:
     # items as damaged during check-out.
     dilapidations = []
     try:
-        rd = {}
-        if inspection.report_data:
-            rd = json.loads(inspection.report_data) if isinstance(inspection.report_data, str) else inspection.report_data
+        from services.report_store import load_sections
+        rd = load_sections(inspection, ['_actions'])
         for action in (rd.get('_actions') or []):
             dilapidations.append({
                 'room':        action.get('room', ''),
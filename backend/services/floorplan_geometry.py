@@ -23,15 +23,20 @@ represents camera-to-world or needs inverting, (c) intrinsics/depth image
 alignment — not the quaternion math itself.
 """
 
-import io
 import math
 import random
 import statistics
-import zipfile
 from dataclasses import dataclass, field
 from typing import Optional
 
-from services.floorplan_processing import ParsedScan, iter_depth_pixels
+try:
+    import numpy as np
+except ImportError:  # per-pixel fallback in build_point_cloud
+    np = None
+
+from services.floorplan_processing import (
+    ParsedScan, can_decode_array, decode_depth_frame, iter_depth_pixels, open_scan_zip,
+)
 
 
 def quaternion_rotate_vector(qx: float, qy: float, qz: float, qw: float,
@@ -125,6 +130,21 @@ def backproject_pixel(u: int, v: int, depth_mm: float, scaled_intrinsics: dict)
     return (x, y, z)
 
 
+def quaternion_rotation_matrix(qx: float, qy: float, qz: float, qw: float) -> list:
+    """
+    quaternion_rotate_vector as a 3x3 matrix (rows = rotated basis vectors),
+    so a whole (N, 3) array of camera-local points rotates as one
+    `points @ matrix`. Built from quaternion_rotate_vector itself — the
+    formula is linear in v — so both paths agree exactly, unit quaternion
+    or not.
+    """
+    return [
+        quaternion_rotate_vector(qx, qy, qz, qw, 1.0, 0.0, 0.0),
+        quaternion_rotate_vector(qx, qy, qz, qw, 0.0, 1.0, 0.0),
+        quaternion_rotate_vector(qx, qy, qz, qw, 0.0, 0.0, 1.0),
+    ]
+
+
 @dataclass
 class WorldPoint:
     frame_index: int
@@ -133,27 +153,58 @@ class WorldPoint:
     z: float
 
 
-def build_point_cloud(zip_bytes: bytes, parsed: ParsedScan, subsample_step: int = 4) -> list:
+def _frame_points_array(raw: bytes, frame, scaled: dict, quat: tuple, translation: tuple,
+                        subsample_step: int) -> list:
+    """
+    One frame of build_point_cloud with whole-frame array ops: decode, take
+    every subsample_step-th row/column by slicing, drop sentinels, then
+    backproject (same formula as backproject_pixel) and rotate/translate all
+    remaining pixels at once. Points come out in the same row-major order as
+    the per-pixel loop.
+    """
+    values, _ = decode_depth_frame(raw, frame.depth.width, frame.depth.height, frame.depth.row_stride)
+    depth = values[::subsample_step, ::subsample_step] & 0x1FFF
+    rows, cols = np.nonzero(depth)
+    if rows.size == 0:
+        return []
+
+    depth_m = depth[rows, cols] / 1000.0
+    u = cols * subsample_step
+    v = rows * subsample_step
+    cam = np.column_stack((
+        depth_m * (u - scaled['cx']) / scaled['fx'],
+        depth_m * (scaled['cy'] - v) / scaled['fy'],
+        -depth_m,
+    ))
+    world = cam @ np.array(quaternion_rotation_matrix(*quat)) + np.array(translation, dtype=float)
+    return [WorldPoint(frame_index=frame.index, x=x, y=y, z=z) for x, y, z in world.tolist()]
+
+
+def build_point_cloud(source, parsed: ParsedScan, subsample_step: int = 4) -> list:
     """
     Full per-pixel point cloud (not just one ray per frame): for each frame
     with valid pose + depth + intrinsics, backprojects a subsampled grid of
     valid depth pixels into world space.
 
-    Needs zip_bytes again (not just the already-parsed ParsedScan) because
+    Needs the package again (not just the already-parsed ParsedScan) because
     per-frame depth grids aren't retained after parse_scan_package computes
-    their aggregate stats — re-reads each depth file from the zip.
+    their aggregate stats — re-reads each depth file from the zip, one at a
+    time. `source` is anything open_scan_zip accepts (bytes, path, or file).
 
     subsample_step=4 keeps this fast and the output size reasonable (a
     160x90 frame has 14400 pixels; step=4 keeps ~900 candidates per frame
     before sentinel-filtering) — same idea as Google's sample's own
     uniform-subsampling approach, just a fixed step here rather than
     computed from a target point budget.
+
+    Frames are processed as arrays (_frame_points_array) when numpy is
+    available; the per-pixel loop below is the fallback.
     """
     if not parsed.intrinsics:
         return []
 
     points = []
-    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+    with open_scan_zip(source) as zf:
         names = set(zf.namelist())
         for f in parsed.frames:
             if f.depth is None:
@@ -178,6 +229,12 @@ def build_point_cloud(zip_bytes: bytes, parsed: ParsedScan, subsample_step: int
                 continue
             raw = zf.read(depth_file)
 
+            if can_decode_array(depth_width, f.depth.row_stride):
+                points.extend(_frame_points_array(
+                    raw, f, scaled, fwd_rot_args, (tx, ty, tz), subsample_step,
+                ))
+                continue
+
             for x, y, depth_mm, _raw_value in iter_depth_pixels(raw, depth_width, depth_height, f.depth.row_stride):
                 if depth_mm == 0:
                     continue
@@ -361,7 +418,106 @@ def fit_wall_lines(points: list, distance_threshold: float = 0.15,
     guaranteed-good result — expect it to work better on scans with more
     frames actually facing a real wall (as opposed to furniture, the floor,
     or an open doorway).
+
+    With numpy available this runs _fit_wall_lines_array: candidate lines
+    are scored in batches with one matrix op, and `iterations` becomes an
+    upper bound — sampling stops once enough hypotheses have been tried to
+    hit RANSAC_CONFIDENCE given the best inlier ratio so far (a dominant
+    wall in a dense cloud needs a handful, not 300). Still deterministic
+    for a given seed, but it draws from numpy's generator, so the walls can
+    differ slightly from the pure-Python fallback's.
     """
+    if np is not None:
+        return _fit_wall_lines_array(points, distance_threshold, min_inliers,
+                                     max_walls, iterations, seed)
+    return _fit_wall_lines_py(points, distance_threshold, min_inliers,
+                              max_walls, iterations, seed)
+
+
+# Adaptive RANSAC stopping: keep sampling until a 2-point hypothesis drawn
+# entirely from the best line's inliers would have been seen with this
+# probability — the standard N = log(1 - p) / log(1 - w^2) bound.
+RANSAC_CONFIDENCE = 0.999
+# Hypotheses scored per matrix op, capped so batch x points stays within
+# RANSAC_MAX_CELLS (dense clouds run to ~100k points).
+RANSAC_BATCH = 64
+RANSAC_MAX_CELLS = 2_000_000
+
+
+def _ransac_budget(inlier_count: int, n: int, cap: int) -> int:
+    w = inlier_count / n
+    if w >= 1.0:
+        return 0
+    if w <= 0.0:
+        return cap
+    return min(cap, math.ceil(math.log(1 - RANSAC_CONFIDENCE) / math.log(1 - w * w)))
+
+
+def _fit_wall_lines_array(points: list, distance_threshold: float, min_inliers: int,
+                          max_walls: int, iterations: int, seed: int) -> list:
+    """fit_wall_lines over an (N, 2) array — see fit_wall_lines."""
+    pts = np.asarray(points, dtype=float).reshape(-1, 2)
+    alive = np.ones(len(pts), dtype=bool)
+    rng = np.random.default_rng(seed)
+    walls = []
+
+    while np.count_nonzero(alive) >= min_inliers and len(walls) < max_walls:
+        idx = np.flatnonzero(alive)
+        remaining = pts[idx]
+        n = len(remaining)
+        if n < 2:
+            break
+        batch = max(1, min(RANSAC_BATCH, RANSAC_MAX_CELLS // n))
+
+        best_count = 0
+        best_normal = best_origin = best_dir = None
+        tried, budget = 0, iterations
+        while tried < budget:
+            size = min(batch, budget - tried)
+            # distinct index pairs, like rng.sample(remaining, 2)
+            i = rng.integers(0, n, size)
+            j = rng.integers(0, n - 1, size)
+            j += j >= i
+            p1 = remaining[i]
+            d = remaining[j] - p1
+            length = np.hypot(d[:, 0], d[:, 1])
+            ok = length >= 1e-9
+            u = np.divide(d, length[:, None], out=np.zeros_like(d), where=ok[:, None])
+            normals = np.column_stack((-u[:, 1], u[:, 0]))
+
+            # |(p - p1) . n| for every point x hypothesis -> (n, size)
+            dist = np.abs(remaining @ normals.T - np.einsum('ij,ij->i', p1, normals))
+            counts = np.count_nonzero(dist <= distance_threshold, axis=0)
+            counts[~ok] = 0
+            k = int(np.argmax(counts))
+            if counts[k] > best_count:
+                best_count = int(counts[k])
+                best_normal, best_origin, best_dir = normals[k], p1[k], u[k]
+                budget = max(tried + size, _ransac_budget(best_count, n, iterations))
+            tried += size
+
+        if best_normal is None or best_count < min_inliers:
+            break
+
+        inlier = np.abs((remaining - best_origin) @ best_normal) <= distance_threshold
+        t = (remaining[inlier] - best_origin) @ best_dir
+        t_min, t_max = float(t.min()), float(t.max())
+        ox, oz = float(best_origin[0]), float(best_origin[1])
+        ux, uz = float(best_dir[0]), float(best_dir[1])
+
+        walls.append(WallLineSegment(
+            x1=ox + t_min * ux, z1=oz + t_min * uz,
+            x2=ox + t_max * ux, z2=oz + t_max * uz,
+            inlier_count=int(np.count_nonzero(inlier)),
+        ))
+        alive[idx[inlier]] = False
+
+    return walls
+
+
+def _fit_wall_lines_py(points: list, distance_threshold: float, min_inliers: int,
+                       max_walls: int, iterations: int, seed: int) -> list:
+    """Pure-Python fit_wall_lines (no numpy) — one hypothesis at a time, fixed iteration count."""
     rng = random.Random(seed)
     remaining = list(points)
     walls = []
@@ -0,0 +1,70 @@
+"""
+services/floorplan_levels.py — cached SVG rendering of a manual floor-plan
+level (routes/floorplan_manual.py).
+
+Rendering a level parses every FloorPlanRoom.data blob and recomputes the
+arcs/normals for each door and window, and levels are viewed far more often
+than they're edited. The SVG is cached in the shared cross-worker cache
+(utils/shared_cache.py) under a key that changes whenever the level's output
+could change:
+
+    <level id>:<room count>:<latest room updated_at>:v<LEVEL_RENDER_VERSION>
+
+so an edit, add or delete produces a new key and stale entries are never
+served — nothing needs explicit invalidation. The same key, hashed, is the
+ETag render_level hands out; computing it is one aggregate query, so a
+revalidation that matches (304) doesn't load or parse any room data.
+
+Usage:
+    key = level_render_key(level.id)
+    svg = level_svg(level, key)        # '' if nothing renderable
+"""
+
+import hashlib
+import json
+import os
+
+from models import db, FloorPlanRoom
+from services.floorplan_render import render_level_svg
+from utils.shared_cache import shared_cache
+
+# Bump whenever render_level_svg's output changes for the same input.
+LEVEL_RENDER_VERSION = '1'
+
+LEVEL_SVG_TTL = int(os.environ.get('LEVEL_SVG_CACHE_TTL', '86400'))
+
+_CACHE = shared_cache('level_svg', ttl=LEVEL_SVG_TTL, max_entries=200)
+
+
+def level_render_key(level_id: int) -> str:
+    """Cache key / ETag source for a level's current rendering."""
+    count, latest = (db.session.query(db.func.count(FloorPlanRoom.id),
+                                      db.func.max(FloorPlanRoom.updated_at))
+                     .filter(FloorPlanRoom.level_id == level_id).one())
+    stamp = latest.isoformat() if latest else '-'
+    return f'{level_id}:{count}:{stamp}:v{LEVEL_RENDER_VERSION}'
+
+
+def level_etag(key: str) -> str:
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def _render(level) -> str:
+    rooms = []
+    for r in level.rooms:
+        parsed = json.loads(r.data)
+        rooms.append({
+            'corners': [tuple(pt) for pt in parsed.get('corners', [])],
+            'symbols': parsed.get('symbols', []),
+        })
+    return render_level_svg(rooms)
+
+
+def level_svg(level, key: str = None) -> str:
+    """The level's SVG ('' if no room has 3+ corners), rendered at most once per key."""
+    key = key or level_render_key(level.id)
+    svg, token = _CACHE.get(key)
+    if svg is None:
+        svg = _render(level)
+        _CACHE.set(key, svg, token)
+    return svg
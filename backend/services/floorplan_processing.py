@@ -18,6 +18,10 @@ Checked against a real device-captured scan (S21 Ultra, 2026-08-12, 50 frames):
     documented format rather than contradicting it.
   - the first couple of frames in a scan can have all-zero depth (sensor not
     yet warmed up) — this is real, expected behavior, not a parse bug.
+
+Depth frames are decoded as whole NumPy arrays (decode_depth_frame) when
+numpy is installed; iter_depth_pixels is the per-pixel pure-Python fallback
+and produces identical stats, just ~100x slower on a 200-frame scan.
 """
 
 import io
@@ -28,6 +32,11 @@ import zipfile
 from dataclasses import dataclass, field
 from typing import Optional
 
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback below (iter_depth_pixels)
+    np = None
+
 # Fraction of image width/height (centered) used for the robust
 # "center depth" reading — see parse_depth_bytes.
 CENTER_PATCH_FRACTION = 0.1
@@ -86,6 +95,83 @@ def iter_depth_pixels(raw: bytes, width: int, height: int, row_stride: int):
             yield x, y, value & 0x1FFF, value
 
 
+def can_decode_array(width: int, row_stride: int) -> bool:
+    """True if decode_depth_frame can handle this frame layout (numpy installed, sane stride)."""
+    return np is not None and row_stride >= width * 2
+
+
+def decode_depth_frame(raw: bytes, width: int, height: int, row_stride: int):
+    """
+    Array version of iter_depth_pixels: returns (values, total_count) where
+    values is a (height, width) uint16 array of raw DEPTH16 values (mask with
+    0x1FFF for depth_mm, as iter_depth_pixels does) and total_count is the
+    number of pixels actually present in the buffer.
+
+    Row padding beyond width*2 bytes is sliced off per row. A truncated buffer
+    is zero-padded, so missing pixels read as the 0 sentinel — they're just
+    not counted in total_count, matching iter_depth_pixels skipping them.
+    Requires can_decode_array(width, row_stride).
+    """
+    if not raw:
+        return np.zeros((height, width), dtype='<u2'), 0
+    needed = height * row_stride
+    count = min(len(raw), needed)
+    last = (count - 1) % row_stride
+    if count < needed and last < width * 2 and last % 2 == 0:
+        count -= 1  # drop a trailing half-pixel, as iter_depth_pixels does
+    buf = np.frombuffer(raw, dtype=np.uint8, count=count)
+    if buf.size < needed:
+        buf = np.concatenate([buf, np.zeros(needed - buf.size, dtype=np.uint8)])
+    rows = buf.reshape(height, row_stride)[:, :width * 2]
+    values = np.ascontiguousarray(rows).view('<u2')
+
+    if height == 0 or width == 0:
+        total_count = 0
+    elif len(raw) >= (height - 1) * row_stride + width * 2:
+        total_count = width * height
+    else:
+        offsets = (np.arange(height)[:, None] * row_stride) + (np.arange(width)[None, :] * 2)
+        total_count = int(np.count_nonzero(offsets + 2 <= len(raw)))
+    return values, total_count
+
+
+def _parse_depth_array(raw: bytes, width: int, height: int, row_stride: int) -> DepthFrameStats:
+    """parse_depth_bytes over a decoded array — same stats, whole-frame ops."""
+    values, total_count = decode_depth_frame(raw, width, height, row_stride)
+    if total_count == 0:
+        raise ValueError('No depth pixels decoded (empty or truncated buffer)')
+
+    depth = values & 0x1FFF
+    valid = depth > 0  # 0 = sentinel: no confident depth measurement
+    raw_valid = values[valid]
+    depth_valid = depth[valid]
+    valid_count = int(raw_valid.size)
+
+    # Same half-open float bounds as the pure-Python path, as index masks
+    cx0 = width * (0.5 - CENTER_PATCH_FRACTION / 2)
+    cx1 = width * (0.5 + CENTER_PATCH_FRACTION / 2)
+    cy0 = height * (0.5 - CENTER_PATCH_FRACTION / 2)
+    cy1 = height * (0.5 + CENTER_PATCH_FRACTION / 2)
+    xs, ys = np.arange(width), np.arange(height)
+    patch = depth[(ys >= cy0) & (ys < cy1)][:, (xs >= cx0) & (xs < cx1)]
+    patch = patch[patch > 0]
+
+    return DepthFrameStats(
+        width=width,
+        height=height,
+        row_stride=row_stride,
+        valid_pixel_count=valid_count,
+        total_pixel_count=total_count,
+        raw_min=int(raw_valid.min()) if valid_count else None,
+        raw_max=int(raw_valid.max()) if valid_count else None,
+        raw_mean=(int(raw_valid.sum(dtype=np.int64)) / valid_count) if valid_count else None,
+        depth_mm_min=int(depth_valid.min()) if valid_count else None,
+        depth_mm_max=int(depth_valid.max()) if valid_count else None,
+        depth_mm_mean=(int(depth_valid.sum(dtype=np.int64)) / valid_count) if valid_count else None,
+        center_depth_mm=float(np.median(patch)) if patch.size else None,
+    )
+
+
 def parse_depth_bytes(raw: bytes, width: int, height: int, row_stride: int) -> DepthFrameStats:
     """
     Unpack a DEPTH16 buffer into aggregate stats.
@@ -103,6 +189,9 @@ def parse_depth_bytes(raw: bytes, width: int, height: int, row_stride: int) -> D
     small square patch centered on the image. Intended as a "what's roughly
     straight ahead" reading for forward-ray geometry estimation.
     """
+    if can_decode_array(width, row_stride):
+        return _parse_depth_array(raw, width, height, row_stride)
+
     raw_min = None
     raw_max = None
     raw_sum = 0
@@ -160,15 +249,31 @@ def parse_depth_bytes(raw: bytes, width: int, height: int, row_stride: int) -> D
     )
 
 
-def parse_scan_package(zip_bytes: bytes) -> ParsedScan:
+def open_scan_zip(source) -> zipfile.ZipFile:
+    """
+    Open a scan package given as bytes, a filesystem path, or a seekable
+    binary file object. Paths/files are read member by member from disk, so
+    only the entry currently being read (one depth frame) is held in memory
+    — see floorplan_results.scan_package for the S3 → temp file side. A file
+    object passed in is left open for the caller (ZipFile only closes files
+    it opened itself).
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return zipfile.ZipFile(source)
+
+
+def parse_scan_package(source) -> ParsedScan:
     """
     Parse a scan package zip (manifest.json + optional intrinsics.json +
-    depth/*.bin files) into a ParsedScan. Raises ValueError if manifest.json
-    is missing or unparsable.
+    depth/*.bin files) into a ParsedScan. `source` is anything
+    open_scan_zip accepts; each depth frame is read, reduced to stats and
+    dropped before the next one. Raises ValueError if manifest.json is
+    missing or unparsable.
     """
     warnings = []
 
-    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+    with open_scan_zip(source) as zf:
         names = set(zf.namelist())
 
         if 'manifest.json' not in names:
@@ -0,0 +1,210 @@
+"""
+services/floorplan_results.py — computed geometry for an uploaded scan,
+persisted on the FloorPlanScan row.
+
+An UPLOADED scan package never changes, but inspect_scan and render_scan used
+to re-download it from S3, re-parse every depth frame and re-run the dense
+point-cloud → RANSAC → corners pipeline on every request. The result of that
+pipeline (the inspect payload plus the rendered SVG) is now computed once and
+stored in floor_plan_scans.geometry, tagged with GEOMETRY_VERSION:
+
+  scan_package(key)                  → the package streamed from S3 into a temp
+                                       file (context manager; scan_tempfile +
+                                       fetch_scan_package when the download
+                                       needs its own error handling)
+  compute_scan_geometry(source)      → {'inspect': {...}, 'svg': '...'}
+  load_geometry(scan)                → stored result, or None if missing/stale
+  save_geometry(scan, result, seen)  → store it if the scan is unchanged since
+                                       computing started (caller commits)
+  queue_geometry(app, scan_id)       → compute in the background — called when
+                                       update_scan marks a scan UPLOADED
+
+Bump GEOMETRY_VERSION whenever parsing, geometry or rendering output changes;
+stored results from an older version are ignored and recomputed on next view.
+
+A computation can outlive its package: a scan re-marked UPLOADED (a re-upload
+to the same key) while one is running must not end up with the old package's
+result. Writers note the scan's updated_at before downloading and store only
+if it's unchanged (a conditional UPDATE); update_scan always bumps it.
+
+Scan packages are the largest objects the workers handle, so they're never
+held in memory whole: scan_package streams the S3 object to a temp file on
+disk, and the parse/point-cloud passes read it one depth frame at a time.
+"""
+
+import json
+import os
+import tempfile
+import traceback
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional
+
+from services.floorplan_processing import parse_scan_package, summarize
+from services.floorplan_geometry import (
+    estimate_room_footprint, summarize_footprint, build_point_cloud, fit_wall_lines,
+    merge_collinear_walls, find_corners,
+)
+from services.floorplan_render import render_floorplan_svg
+from models import db, FloorPlanScan
+from utils.s3 import download_to_file
+
+GEOMETRY_VERSION = '1'
+
+# Background precompute — one worker per gunicorn process is plenty; scans
+# are uploaded a few times a day, and a request for a scan that isn't done
+# yet just computes it inline.
+GEOMETRY_WORKERS = int(os.environ.get('FLOORPLAN_GEOMETRY_WORKERS', '1'))
+
+# Where downloaded packages are spooled (None = the system temp dir). Files
+# are unlinked as soon as the computation finishes.
+SCAN_TMP_DIR = os.environ.get('FLOORPLAN_SCAN_TMP_DIR') or None
+
+_pool     = None
+_pool_pid = None
+
+
+@contextmanager
+def scan_tempfile():
+    """Yield an empty temp file to spool a scan package into; removed on exit."""
+    with tempfile.TemporaryFile(prefix='scan-', suffix='.zip', dir=SCAN_TMP_DIR) as f:
+        yield f
+
+
+def fetch_scan_package(key: str, f) -> None:
+    """Download the scan package at `key` into f and rewind it. Raises on any S3 error."""
+    download_to_file(key, f)
+    f.seek(0)
+
+
+@contextmanager
+def scan_package(key: str):
+    """Yield an open temp file holding the scan package at `key`, rewound to the start."""
+    with scan_tempfile() as f:
+        fetch_scan_package(key, f)
+        yield f
+
+
+def _compute_dense_geometry(source, parsed):
+    """Point cloud -> walls -> corners."""
+    dense_cloud = build_point_cloud(source, parsed, subsample_step=6)
+    dense_raw_walls = fit_wall_lines(
+        [(p.x, p.z) for p in dense_cloud],
+        min_inliers=max(15, len(dense_cloud) // 200),
+    ) if dense_cloud else []
+    dense_walls = merge_collinear_walls(dense_raw_walls)
+    corners = find_corners(dense_walls)
+    return dense_cloud, dense_walls, corners
+
+
+def compute_scan_geometry(source) -> dict:
+    """
+    Run the full pipeline over a scan package (bytes, a path, or an open
+    file — see open_scan_zip). Returns {'inspect': <the
+    inspect_scan response body>, 'svg': <render_scan's SVG, '' if there's
+    not enough geometry>}. Raises ValueError if the package can't be parsed
+    (zipfile.BadZipFile if it isn't a zip at all).
+    """
+    parsed = parse_scan_package(source)
+
+    result = summarize(parsed)
+    result['footprint'] = summarize_footprint(estimate_room_footprint(parsed))
+
+    dense_cloud, dense_walls, dense_corners = _compute_dense_geometry(source, parsed)
+
+    result['densePointCount'] = len(dense_cloud)
+    # nearbyConflictM: distance to the closest other wall detection at a
+    # similar orientation that did NOT merge into this one because its
+    # position disagreed too much — a real signal of ARCore pose drift
+    # (a fixed wall seen at different positions across a scan's duration),
+    # not a bug. A wall with a small/absent conflict is confidently placed;
+    # one with a conflict under ~1m should not be trusted as precise until
+    # this pipeline gets drift correction (see merge_collinear_walls docstring).
+    result['denseWallLines'] = [
+        {
+            'x1': w.x1, 'z1': w.z1, 'x2': w.x2, 'z2': w.z2,
+            'inlierCount': w.inlier_count, 'nearbyConflictM': w.nearby_conflict_m,
+        }
+        for w in dense_walls
+    ]
+
+    # Only confidently-placed walls (nearby_conflict_m None or large) are
+    # used — a corner built from a drift-uncertain wall would fabricate
+    # false precision. On a scan with too few confident, perpendicular
+    # walls, this is honestly empty rather than a forced guess.
+    result['denseCorners'] = [
+        {'x': c.x, 'z': c.z, 'wallA': c.wall_a, 'wallB': c.wall_b, 'angleDeg': c.angle_deg}
+        for c in dense_corners
+    ]
+
+    svg = render_floorplan_svg(dense_walls, dense_corners, points=dense_cloud)
+    return {'inspect': result, 'svg': svg}
+
+
+def load_geometry(scan) -> Optional[dict]:
+    """The stored result for this scan, or None if never computed / computed by an older version."""
+    if scan.geometry_version != GEOMETRY_VERSION or not scan.geometry:
+        return None
+    try:
+        return json.loads(scan.geometry)
+    except (ValueError, TypeError):
+        return None
+
+
+def save_geometry(scan, result: dict, seen_updated_at) -> bool:
+    """
+    Store result unless the scan changed after seen_updated_at (its
+    updated_at when computing started). Returns False if the result was
+    discarded as stale. updated_at itself is left as it was — storing a
+    derived result isn't an edit. Caller commits.
+    """
+    stored = (FloorPlanScan.query
+              .filter(FloorPlanScan.id == scan.id, FloorPlanScan.updated_at == seen_updated_at)
+              .update({'geometry':         json.dumps(result),
+                       'geometry_version': GEOMETRY_VERSION,
+                       'updated_at':       seen_updated_at},
+                      synchronize_session=False))
+    return stored == 1
+
+
+def _get_pool():
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = ThreadPoolExecutor(max_workers=GEOMETRY_WORKERS, thread_name_prefix='floorplan-geometry')
+        _pool_pid = os.getpid()
+    return _pool
+
+
+def _precompute(app, scan_id):
+    with app.app_context():
+        try:
+            scan = db.session.get(FloorPlanScan, scan_id)
+            if scan is None or scan.status != 'UPLOADED' or not scan.s3_key:
+                return
+            if scan.geometry_version == GEOMETRY_VERSION:
+                return
+            seen = scan.updated_at
+            with scan_package(scan.s3_key) as package:
+                result = compute_scan_geometry(package)
+            if not save_geometry(scan, result, seen):
+                db.session.rollback()
+                print(f'[floorplans] scan {scan_id} changed while computing — result discarded')
+                return
+            db.session.commit()
+            print(f'[floorplans] geometry computed for scan {scan_id} '
+                  f'({result["inspect"]["densePointCount"]} points)')
+        except (ValueError, zipfile.BadZipFile) as e:
+            db.session.rollback()
+            print(f'[floorplans] scan {scan_id} could not be parsed: {e}')
+        except Exception:
+            db.session.rollback()
+            print(f'[floorplans] geometry precompute failed for scan {scan_id}:')
+            print(traceback.format_exc())
+        finally:
+            db.session.remove()
+
+
+def queue_geometry(app, scan_id: int):
+    """Compute and store a scan's geometry in the background (fire-and-forget)."""
+    _get_pool().submit(_precompute, app, scan_id)
@@ -0,0 +1,253 @@
+"""
+services/report_store.py — Section-level storage for inspection report_data.
+
+report_data used to be one TEXT column holding the whole report JSON, so every
+reader parsed the full blob (often several MB) and every sync rewrote it. A
+report is now stored as one report_sections row per top-level key (rooms,
+fixed sections, _signatures, _roomOrder, …), JSONB on Postgres:
+
+  load_report(insp)                 → whole report dict
+  load_sections(insp, keys)         → just those top-level keys — O(section)
+  write_sections(insp, changed, removed)
+                                    → upsert / delete individual sections — O(section)
+  store_report(insp, rd)            → full replace; only rows whose section
+                                      actually changed are UPDATEd
+  store_report_json(insp, value)    → the Inspection.report_data setter
+
+Inspection.report_data (models.py) stays as the compatibility accessor for
+legacy callers: reading it reassembles the JSON string, assigning to it goes
+through store_report_json. Reports written before this change sit in the
+legacy report_blob column until their next write moves them over.
+
+Writers serialise on the inspection row: every write first takes its row lock
+(lock_report — SELECT … FOR UPDATE, as PATCH /report-data does) and reloads
+the version, summary and section rows, so a full replace and a delta can't
+both commit the same report_version over different content. Callers that
+read sections, modify them and write them back call lock_report before the
+read.
+
+Every write bumps Inspection.report_version and refreshes the stored summary
+(report_size, photo_count, last_synced_at). Each section row keeps its own
+size/photo_count, so a partial write adjusts the totals by the difference.
+Section values are compared before writing; a value that *is* the loaded row's
+object (mutated in place by the caller) is always written, since its change
+can't be detected.
+"""
+
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm.attributes import flag_modified
+
+from models import db, Inspection, ReportSection
+
+_PHOTO_LIST_KEYS = ('_photos', '_overviewPhotos')
+
+
+def count_photos(node) -> int:
+    """Photos referenced anywhere in a report (or one section of it)."""
+    if isinstance(node, dict):
+        total = 0
+        for key, value in node.items():
+            if key in _PHOTO_LIST_KEYS and isinstance(value, list):
+                total += sum(1 for p in value if p)
+            else:
+                total += count_photos(value)
+        return total
+    if isinstance(node, list):
+        return sum(count_photos(v) for v in node)
+    return 0
+
+
+def section_stats(key, value):
+    """
+    (size, photo count) for one section. size is the section's share of the
+    whole report's JSON — `"key": value, ` — so the sections of a report sum
+    to exactly len(json.dumps(report)) (the trailing ", " of the last entry
+    stands in for the enclosing braces).
+    """
+    return len(json.dumps(key)) + len(json.dumps(value)) + 4, count_photos(value)
+
+
+def _new_row(key, position, value, **kw):
+    size, photos = section_stats(key, value)
+    return ReportSection(key=key, position=position, data=value, size=size, photo_count=photos, **kw)
+
+
+def _bump(inspection, size=None, photos=None):
+    inspection.report_version = (inspection.report_version or 0) + 1
+    if size is not None:
+        inspection.report_size = size
+    if photos is not None:
+        inspection.photo_count = photos
+    inspection.last_synced_at = datetime.now(timezone.utc)
+
+
+def lock_report(inspection):
+    """
+    Take the inspection's row lock for the rest of the transaction and drop
+    anything about the report loaded before it, so the next read sees the
+    latest committed version. Taking it twice in one transaction is harmless.
+    """
+    if not sa_inspect(inspection).persistent:
+        return
+    db.session.flush()
+    (db.session.query(Inspection.id).filter(Inspection.id == inspection.id)
+     .with_for_update().scalar())
+    db.session.expire(inspection, ['report_version', 'report_size', 'photo_count',
+                                   'report_sectioned', 'report_blob', 'report_sections'])
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, ReportSection) and obj.inspection_id == inspection.id:
+            db.session.expire(obj)
+
+
+def _sections_loaded(inspection) -> bool:
+    return 'report_sections' in inspection.__dict__
+
+
+def _set_row(row, value):
+    """Write value into a section row if it changed; returns (Δsize, Δphotos)."""
+    if row.data is value:
+        flag_modified(row, 'data')
+    elif row.data != value:
+        row.data = value
+    else:
+        return 0, 0
+    size, photos = section_stats(row.key, value)
+    delta = (size - (row.size or 0), photos - (row.photo_count or 0))
+    row.size, row.photo_count = size, photos
+    return delta
+
+
+def load_report(inspection) -> dict:
+    """
+    Whole report as a dict ({} when empty). Raises ValueError if the legacy
+    blob isn't a JSON object.
+    """
+    if inspection.report_sectioned:
+        return {s.key: s.data for s in inspection.report_sections}
+    if not inspection.report_blob:
+        return {}
+    rd = json.loads(inspection.report_blob)
+    if not isinstance(rd, dict):
+        raise ValueError('report_data is not a JSON object')
+    return rd
+
+
+def load_sections(inspection, keys) -> dict:
+    """Only the given top-level keys ({key: value}, missing keys omitted)."""
+    keys = set(keys)
+    if not keys:
+        return {}
+    if not inspection.report_sectioned:
+        rd = load_report(inspection)
+        return {k: rd[k] for k in keys if k in rd}
+    if _sections_loaded(inspection):
+        rows = [s for s in inspection.report_sections if s.key in keys]
+    else:
+        rows = ReportSection.query.filter(ReportSection.inspection_id == inspection.id,
+                                          ReportSection.key.in_(keys)).all()
+    return {s.key: s.data for s in rows}
+
+
+def store_report(inspection, rd: dict):
+    """Replace the whole report, writing only the sections that changed."""
+    lock_report(inspection)
+    existing = {s.key: s for s in inspection.report_sections}
+    for position, (key, value) in enumerate(rd.items()):
+        row = existing.pop(key, None)
+        if row is None:
+            inspection.report_sections.append(_new_row(key, position, value))
+            continue
+        _set_row(row, value)
+        if row.position != position:
+            row.position = position
+    for row in existing.values():
+        inspection.report_sections.remove(row)
+    inspection.report_blob = None
+    inspection.report_sectioned = True
+    _bump(inspection,
+          size=max(2, sum(r.size or 0 for r in inspection.report_sections)),
+          photos=sum(r.photo_count or 0 for r in inspection.report_sections))
+
+
+def store_report_json(inspection, value):
+    """
+    Assign a whole report given as a JSON string (or dict). Anything that
+    isn't a JSON object is kept verbatim in the legacy blob column.
+    """
+    if value is None or value == '':
+        rd = None
+    elif isinstance(value, dict):
+        rd = value
+    else:
+        try:
+            rd = json.loads(value)
+        except (ValueError, TypeError):
+            rd = None
+    if isinstance(rd, dict):
+        store_report(inspection, rd)
+        return
+    lock_report(inspection)
+    inspection.report_sections = []
+    inspection.report_blob = value if value != '' else None
+    inspection.report_sectioned = False
+    _bump(inspection, size=len(inspection.report_blob or ''), photos=0)
+
+
+def write_sections(inspection, changed: dict, removed=()):
+    """
+    Upsert `changed` ({key: value}) and delete `removed` keys without touching
+    the rest of the report. A report still in the legacy blob is moved to
+    section rows first (once).
+    """
+    removed = set(removed) - set(changed)
+    if not changed and not removed:
+        return
+    lock_report(inspection)
+    if not inspection.report_sectioned:
+        store_report(inspection, load_report(inspection))
+
+    d_size = d_photos = 0
+    if _sections_loaded(inspection):
+        rows = {s.key: s for s in inspection.report_sections}
+        next_pos = max((s.position for s in inspection.report_sections), default=-1) + 1
+        for key, value in changed.items():
+            if key in rows:
+                ds, dp = _set_row(rows[key], value)
+            else:
+                row = _new_row(key, next_pos, value)
+                inspection.report_sections.append(row)
+                ds, dp = row.size, row.photo_count
+                next_pos += 1
+            d_size, d_photos = d_size + ds, d_photos + dp
+        for key in removed:
+            if key in rows:
+                d_size, d_photos = d_size - (rows[key].size or 0), d_photos - (rows[key].photo_count or 0)
+                inspection.report_sections.remove(rows[key])
+    else:
+        keys = set(changed) | removed
+        rows = {s.key: s for s in ReportSection.query.filter(
+            ReportSection.inspection_id == inspection.id, ReportSection.key.in_(keys))}
+        next_pos = None
+        for key, value in changed.items():
+            if key in rows:
+                ds, dp = _set_row(rows[key], value)
+                d_size, d_photos = d_size + ds, d_photos + dp
+                continue
+            if next_pos is None:
+                next_pos = (db.session.query(db.func.max(ReportSection.position))
+                            .filter(ReportSection.inspection_id == inspection.id).scalar())
+                next_pos = -1 if next_pos is None else next_pos
+            next_pos += 1
+            row = _new_row(key, next_pos, value, inspection_id=inspection.id)
+            db.session.add(row)
+            d_size, d_photos = d_size + row.size, d_photos + row.photo_count
+        for key in removed:
+            if key in rows:
+                d_size, d_photos = d_size - (rows[key].size or 0), d_photos - (rows[key].photo_count or 0)
+                db.session.delete(rows[key])
+    # photo_count NULL = never computed (pre-summary row); leave it for the backfill
+    photos = None if inspection.photo_count is None else max(0, inspection.photo_count + d_photos)
+    _bump(inspection, size=max(2, (inspection.report_size or 0) + d_size), photos=photos)
@@ -21,5 +21,10 @@ python3 migrate_floor_plan_scans.py          || echo "migrate_floor_plan_scans:
 python3 migrate_floor_plans.py               || echo "migrate_floor_plans: skipped or already done"
 python3 migrate_floor_plan_levels.py         || echo "migrate_floor_plan_levels: skipped or already done"
 
+# The completion worker (completion_worker.py) is NOT started here: it runs as
+# its own supervised process — the Procfile `worker:` entry on Railway, the
+# `worker` process group in fly.toml — so it is restarted if it dies and never
+# races this process's schema migrations in create_app().
+
 echo "==> Starting Gunicorn..."
 exec gunicorn app:app --config gunicorn.conf.py
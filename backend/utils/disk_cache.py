@@ -0,0 +1,96 @@
+"""
+utils/disk_cache.py — Small LRU cache of files in a local directory.
+
+Used where a cached value is a whole artifact (a rendered PDF, a Whisper
+transcript) that every gunicorn worker on the machine should share: each
+entry is one file, <key><suffix>, and its mtime doubles as the LRU stamp —
+a hit touches it, a write evicts expired entries and then the least
+recently used ones over the cap (total bytes and/or entry count).
+
+Writes go to a temp file in the same directory and are os.replace()d into
+place, so concurrent readers never see a partial entry; a failed write
+removes its temp file. Every failure degrades to a miss / no-op.
+
+Usage:
+    from utils.disk_cache import DiskCache
+    _CACHE = DiskCache('/tmp/pdf_cache', '.pdf', ttl=7 * 86400, max_bytes=512 << 20)
+    data = _CACHE.get(key)        # bytes or None
+    _CACHE.put(key, data)
+"""
+
+import os
+import tempfile
+import time
+
+
+class DiskCache:
+
+    def __init__(self, directory: str, suffix: str, ttl: int,
+                 max_bytes: int = None, max_entries: int = None, tag: str = 'cache'):
+        self.directory   = directory
+        self.suffix      = suffix
+        self.ttl         = ttl
+        self.max_bytes   = max_bytes
+        self.max_entries = max_entries
+        self.tag         = tag
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}{self.suffix}')
+
+    def get(self, key: str):
+        """Return the cached bytes or None. A hit refreshes the entry's LRU timestamp."""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.unlink(path)
+                return None
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path, None)
+            return data
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes):
+        """Store data, then evict expired / least-recently-used entries over the cap."""
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))  # atomic — readers never see a partial file
+        except Exception as e:
+            print(f'[{self.tag}] cache write failed: {e}')
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            return
+        self._sweep()
+
+    def _sweep(self):
+        try:
+            entries = []
+            for de in os.scandir(self.directory):
+                if de.name.endswith(self.suffix):
+                    st = de.stat()
+                    entries.append((st.st_mtime, st.st_size, de.path))
+        except OSError:
+            return
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        entries.sort()
+        for mtime, size, path in entries:
+            over = ((self.max_bytes is not None and total > self.max_bytes) or
+                    (self.max_entries is not None and count > self.max_entries))
+            if not over and now - mtime <= self.ttl:
+                continue
+            try:
+                os.unlink(path)
+                total -= size
+                count -= 1
+            except OSError:
+                pass
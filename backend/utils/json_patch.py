@@ -0,0 +1,131 @@
+"""
+utils/json_patch.py — Apply JSON Patch (RFC 6902) operations to report_data.
+
+Used by the report_data delta-sync endpoint (PATCH /api/inspections/<id>/report-data)
+so the mobile app can upload just the fields it changed instead of the whole
+multi-MB blob.
+
+Supported ops: add, replace, remove, test (move/copy are not needed by the app).
+Paths are JSON Pointers (RFC 6901): "/<roomId>/items/<itemId>/condition",
+with "~1" for "/" and "~0" for "~" inside keys, and "-" to append to an array.
+
+Usage:
+    from utils.json_patch import apply_patch, PatchError
+    touched = apply_patch(rd, ops)   # mutates rd in place
+    keys = touched_keys(ops)         # top-level sections to load beforehand
+"""
+
+
+_MISSING = object()
+
+
+class PatchError(ValueError):
+    """An operation is malformed, targets a missing path, or a test op failed."""
+
+
+def _pointer(path) -> list:
+    if not isinstance(path, str) or (path and not path.startswith('/')):
+        raise PatchError(f'invalid path: {path!r}')
+    if path == '':
+        return []
+    return [p.replace('~1', '/').replace('~0', '~') for p in path[1:].split('/')]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == '-':
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise PatchError(f'invalid array index: {token!r}')
+    idx = int(token)
+    if idx > len(container) or (idx == len(container) and not allow_end):
+        raise PatchError(f'array index out of range: {token}')
+    return idx
+
+
+def _parent(doc, tokens: list):
+    node = doc
+    for token in tokens[:-1]:
+        if isinstance(node, dict):
+            if token not in node:
+                raise PatchError(f'path not found: /{"/".join(tokens)}')
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token)]
+        else:
+            raise PatchError(f'path not found: /{"/".join(tokens)}')
+    return node
+
+
+def _apply_op(doc: dict, op: dict):
+    kind   = op.get('op')
+    tokens = _pointer(op.get('path'))
+    if not tokens:
+        raise PatchError('operations on the document root are not supported')
+    parent, last = _parent(doc, tokens), tokens[-1]
+
+    if kind in ('add', 'replace'):
+        if 'value' not in op:
+            raise PatchError(f'{kind} requires a value')
+        if isinstance(parent, dict):
+            if kind == 'replace' and last not in parent:
+                raise PatchError(f'path not found: {op["path"]}')
+            parent[last] = op['value']
+        elif isinstance(parent, list):
+            if kind == 'add':
+                parent.insert(_index(parent, last, allow_end=True), op['value'])
+            else:
+                parent[_index(parent, last)] = op['value']
+        else:
+            raise PatchError(f'path not found: {op["path"]}')
+    elif kind == 'remove':
+        if isinstance(parent, dict) and last in parent:
+            del parent[last]
+        elif isinstance(parent, list):
+            del parent[_index(parent, last)]
+        else:
+            raise PatchError(f'path not found: {op["path"]}')
+    elif kind == 'test':
+        if isinstance(parent, dict):
+            current = parent.get(last, _MISSING)
+        elif isinstance(parent, list):
+            current = parent[_index(parent, last)]
+        else:
+            current = _MISSING
+        if current != op.get('value', _MISSING):
+            raise PatchError(f'test failed: {op["path"]}')
+    else:
+        raise PatchError(f'unsupported op: {kind!r}')
+
+
+def touched_keys(ops: list) -> set:
+    """Top-level keys an op list reads or writes — validates paths, not values."""
+    if not isinstance(ops, list):
+        raise PatchError('patch must be a list of operations')
+    keys = set()
+    for op in ops:
+        if not isinstance(op, dict):
+            raise PatchError('each operation must be an object')
+        tokens = _pointer(op.get('path'))
+        if not tokens:
+            raise PatchError('operations on the document root are not supported')
+        keys.add(tokens[0])
+    return keys
+
+
+def apply_patch(doc: dict, ops: list) -> set:
+    """
+    Apply `ops` to `doc` in place and return the set of top-level keys touched.
+
+    All-or-nothing only from the caller's point of view: on PatchError `doc`
+    may be partially modified, so callers must discard it (the endpoint
+    rolls the session back). `doc` may hold just the sections the ops touch.
+    """
+    if not isinstance(ops, list):
+        raise PatchError('patch must be a list of operations')
+    touched = set()
+    for op in ops:
+        if not isinstance(op, dict):
+            raise PatchError('each operation must be an object')
+        _apply_op(doc, op)
+        touched.add(_pointer(op['path'])[0])
+    return touched
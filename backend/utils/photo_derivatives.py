@@ -0,0 +1,139 @@
+"""
+utils/photo_derivatives.py — Persistent pre-compressed photo renditions.
+
+Every consumer of report photos used to decode and LANCZOS-resize the
+full-size phone JPEG on every request (PDF builds, gallery viewer, gallery
+filmstrip). This module renders each (photo, rendition) pair once and keeps
+the result in S3 under a deterministic key, so every later PDF build, gallery
+load and gunicorn worker reuses it.
+
+Renditions:
+  pdf      ≤ 900 px,  JPEG q65   — embedded in generated PDFs
+  gallery  ≤ 1600 px, JPEG q82   — full-size gallery viewer
+  thumb    ≤ 320 px,  JPEG q70   — gallery filmstrip
+
+Keys:
+  photo-derivatives/<rendition>/<sha256(src)[:40]>.jpg
+  src is the photo's stored value (S3 URL or legacy data URI). Photo URLs are
+  immutable (uuid keys, see utils.s3.new_key), so the hash of the src string
+  identifies the image content.
+
+Photos are uploaded directly from the mobile app to S3 with presigned PUTs,
+so the backend never sees an upload event — renditions are generated on first
+use and stored from then on. When S3 isn't configured, renditions are still
+produced, just not persisted.
+
+Usage:
+    from utils.photo_derivatives import get_derivative
+    jpeg = get_derivative(url, 'gallery')
+"""
+
+import base64
+import hashlib
+import io
+import logging
+
+log = logging.getLogger(__name__)
+
+RENDITIONS = {
+    'pdf':     (900,  65),
+    'gallery': (1600, 82),
+    'thumb':   (320,  70),
+    'cover':   (1200, 70),   # full-width property photo on the PDF cover page
+}
+
+KEY_PREFIX = 'photo-derivatives'
+
+
+def derivative_key(src: str, rendition: str) -> str:
+    """Deterministic S3 key for one rendition of one photo src."""
+    digest = hashlib.sha256(src.encode('utf-8')).hexdigest()[:40]
+    return f'{KEY_PREFIX}/{rendition}/{digest}.jpg'
+
+
+def load_source(src: str, timeout: int = 10) -> bytes:
+    """Raw bytes for a photo src — a data URI (decoded in-process) or an http(s) URL."""
+    if src.startswith('data:'):
+        _, b64 = src.split(',', 1)
+        # Normalise: strip whitespace, convert URL-safe chars, fix padding
+        b64 = b64.strip().replace('-', '+').replace('_', '/')
+        b64 += '=' * (4 - len(b64) % 4) if len(b64) % 4 else ''
+        return base64.b64decode(b64)
+    import urllib.request
+    req = urllib.request.Request(src, headers={'User-Agent': 'InspectPro/1.0'})
+    return urllib.request.urlopen(req, timeout=timeout).read()
+
+
+def render(data: bytes, max_px: int, quality: int):
+    """
+    Resize + re-encode image bytes as JPEG with Pillow (EXIF orientation kept).
+    Returns None if Pillow is unavailable or the image can't be decoded.
+    """
+    try:
+        from PIL import Image as _PILImage, ImageOps
+        pil = _PILImage.open(io.BytesIO(data)).convert('RGB')
+        try:
+            pil = ImageOps.exif_transpose(pil)
+        except Exception:
+            pass
+        w, h = pil.size
+        if w > max_px or h > max_px:
+            pil.thumbnail((max_px, max_px), _PILImage.LANCZOS)
+        out = io.BytesIO()
+        pil.save(out, format='JPEG', quality=quality, optimize=True)
+        return out.getvalue()
+    except Exception:
+        return None
+
+
+def _stored(key: str):
+    """Stored rendition bytes, or None on a miss / S3 unavailable."""
+    try:
+        from utils.s3 import is_configured, download_bytes
+        if not is_configured():
+            return None
+        return download_bytes(key)
+    except Exception as e:
+        # NoSuchKey is the normal miss; anything else is logged and treated
+        # the same way — the caller just renders from the original.
+        code = (getattr(e, 'response', None) or {}).get('Error', {}).get('Code')
+        if code not in ('NoSuchKey', '404'):
+            log.warning('[derivatives] read %s failed: %s', key, e)
+        return None
+
+
+def _store(key: str, data: bytes):
+    try:
+        from utils.s3 import is_configured, upload_bytes
+        if is_configured():
+            upload_bytes(data, key, 'image/jpeg')
+    except Exception as e:
+        log.warning('[derivatives] write %s failed: %s', key, e)
+
+
+def get_derivative(src: str, rendition: str, fetch=None) -> bytes:
+    """
+    Return JPEG bytes for the given rendition of a photo.
+
+    Serves the stored rendition when one exists; otherwise loads the original
+    (fetch(src) for http(s) srcs if given — e.g. a retrying downloader —
+    else load_source), renders it and stores the result for next time.
+    If Pillow can't decode the original, the original bytes are returned
+    unchanged and nothing is stored. Raises if the original can't be loaded.
+    """
+    max_px, quality = RENDITIONS[rendition]
+    key = derivative_key(src, rendition)
+
+    data = _stored(key)
+    if data is not None:
+        return data
+
+    if fetch is not None and not src.startswith('data:'):
+        raw = fetch(src)
+    else:
+        raw = load_source(src)
+    data = render(raw, max_px, quality)
+    if data is None:
+        return raw
+    _store(key, data)
+    return data
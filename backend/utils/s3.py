@@ -22,6 +22,7 @@ import uuid
 import base64
 import io
 import logging
+import threading
 from functools import lru_cache
 from botocore.config import Config
 
@@ -80,6 +81,26 @@ def _make_client():
     return boto3.client('s3', **kwargs)
 
 
+_client_lock = threading.Lock()
+_client      = None
+_client_pid  = None
+
+
+def _get_client():
+    """
+    Process-wide shared client for hot paths (parallel uploads/downloads).
+    boto3 clients are thread-safe once built, but building them from the
+    default session is not — so construction is serialised and the client is
+    rebuilt after a fork (gunicorn preload_app).
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = _make_client()
+            _client_pid = os.getpid()
+        return _client
+
+
 # ── Key helpers ───────────────────────────────────────────────────────────────
 
 def new_key(prefix: str, ext: str = 'jpg') -> str:
@@ -108,7 +129,7 @@ def upload_bytes(data: bytes, key: str, content_type: str = 'image/jpeg') -> str
     """
     if not is_configured():
         raise RuntimeError('S3 is not configured (missing env vars)')
-    client = _make_client()
+    client = _get_client()
     client.put_object(
         Bucket      = get_bucket(),
         Key         = key,
@@ -144,11 +165,27 @@ def download_bytes(key: str) -> bytes:
     """
     if not is_configured():
         raise RuntimeError('S3 is not configured (missing env vars)')
-    client = _make_client()
+    client = _get_client()
     resp = client.get_object(Bucket=get_bucket(), Key=key)
     return resp['Body'].read()
 
 
+def download_to_file(key: str, fileobj) -> int:
+    """
+    Stream an object into an open, writable binary file (e.g. a tempfile)
+    in chunks, so large objects never sit in memory whole. Returns the
+    number of bytes written; the file is left positioned at the end.
+    """
+    if not is_configured():
+        raise RuntimeError('S3 is not configured (missing env vars)')
+    client = _get_client()
+    start = fileobj.tell()
+    client.download_fileobj(get_bucket(), key, fileobj)
+    size = fileobj.tell() - start
+    log.debug('[S3] streamed %d bytes ← %s', size, key)
+    return size
+
+
 # ── Pre-signed URLs (for direct mobile → S3 upload) ──────────────────────────
 
 def presign_put(key: str, content_type: str = 'image/jpeg', expires: int = 900) -> str:
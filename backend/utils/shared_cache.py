@@ -0,0 +1,231 @@
+"""
+utils/shared_cache.py — Response cache shared by every gunicorn worker.
+
+The list/dashboard caches in routes/inspections.py, routes/properties.py and
+routes/dashboard.py used to be per-process dicts: with 4 workers each cache
+was cold four times, and an invalidation only cleared the copy in the worker
+that handled the write — the other three kept serving stale lists until TTL.
+
+Backends (SHARED_CACHE_BACKEND):
+  sqlite  (default) — one SQLite file on local disk (SHARED_CACHE_PATH,
+                      default /tmp/inspectpro_cache.sqlite3) in WAL mode,
+                      visible to every worker on the machine.
+  memory            — the old per-process dict behaviour (local dev, tests,
+                      or if the disk is unavailable).
+
+Invalidation is generation-based: every namespace has a counter, every key
+has its own counter, and every entry is stamped with both as they were when
+its value was read from the database. A full invalidate() bumps the namespace
+counter — O(1), and instantly visible to all workers; invalidate(key) drops
+the entry and bumps that key's counter. Entries stamped with an old generation
+are never served and are swept on later writes.
+
+A worker can be building a value while another worker invalidates it, so
+get() also returns a token — the generations current at the time of the
+miss — and set() only stores if neither has moved since. A list computed
+before a write can't be cached after that write's invalidation.
+
+Values are pickled, so anything the routes cached before (lists/dicts with
+datetimes etc.) round-trips unchanged.
+
+Usage:
+    from utils.shared_cache import shared_cache
+    _CACHE = shared_cache('dashboard', ttl=300)
+    data, token = _CACHE.get(key)          # data is None on a miss
+    if data is None:
+        data = build()
+        _CACHE.set(key, data, token)
+    _CACHE.invalidate([key])
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+BACKEND   = os.environ.get('SHARED_CACHE_BACKEND', 'sqlite')
+DB_PATH   = os.environ.get('SHARED_CACHE_PATH', '/tmp/inspectpro_cache.sqlite3')
+BUSY_MS   = 2000
+
+# Bumped when the tables below change shape; older cache files are rebuilt.
+SCHEMA_VERSION = 2
+
+
+class _MemoryCache:
+    """Per-process fallback — same interface, no cross-worker visibility."""
+
+    def __init__(self, namespace, ttl, max_entries):
+        self.namespace   = namespace
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self._data: dict = {}
+        self._gen        = 0
+        self._key_gens: dict = {}
+        self._lock       = threading.Lock()
+
+    def _token(self, key):
+        return (self._gen, self._key_gens.get(key, 0))
+
+    def get(self, key):
+        with self._lock:
+            token = self._token(key)
+            entry = self._data.get(key)
+            if entry and entry['token'] == token and time.monotonic() - entry['ts'] < self.ttl:
+                return entry['data'], token
+            return None, token
+
+    def set(self, key, data, token):
+        with self._lock:
+            if token != self._token(key):
+                return
+            self._data[key] = {'data': data, 'token': token, 'ts': time.monotonic()}
+            if len(self._data) > self.max_entries:
+                oldest = sorted(self._data, key=lambda k: self._data[k]['ts'])
+                for k in oldest[:max(1, self.max_entries // 5)]:
+                    self._data.pop(k, None)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is not None:
+                self._data.pop(key, None)
+                self._key_gens[key] = self._key_gens.get(key, 0) + 1
+            else:
+                self._data.clear()
+                self._gen += 1
+
+
+_local = threading.local()
+
+
+def _conn():
+    """One connection per thread per process (sqlite3 connections aren't fork-safe)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and getattr(_local, 'pid', None) == os.getpid():
+        return conn
+    conn = sqlite3.connect(DB_PATH, timeout=BUSY_MS / 1000, isolation_level=None,
+                           check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA busy_timeout={BUSY_MS}')
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+            # Only cached values live here, so an old layout is just dropped.
+            conn.execute('DROP TABLE IF EXISTS entries')
+            conn.execute('DROP TABLE IF EXISTS key_generations')
+            conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+        conn.execute('CREATE TABLE IF NOT EXISTS generations ('
+                     'namespace TEXT PRIMARY KEY, gen INTEGER NOT NULL)')
+        conn.execute('CREATE TABLE IF NOT EXISTS key_generations ('
+                     'namespace TEXT NOT NULL, key TEXT NOT NULL, gen INTEGER NOT NULL, '
+                     'PRIMARY KEY (namespace, key))')
+        conn.execute('CREATE TABLE IF NOT EXISTS entries ('
+                     'namespace TEXT NOT NULL, key TEXT NOT NULL, gen INTEGER NOT NULL, '
+                     'key_gen INTEGER NOT NULL, expires_at REAL NOT NULL, data BLOB NOT NULL, '
+                     'PRIMARY KEY (namespace, key))')
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    _local.conn, _local.pid = conn, os.getpid()
+    return conn
+
+
+class _SQLiteCache:
+    """Cross-worker cache backed by a shared SQLite file. Errors degrade to a miss / no-op."""
+
+    def __init__(self, namespace, ttl, max_entries):
+        self.namespace   = namespace
+        self.ttl         = ttl
+        self.max_entries = max_entries
+
+    def _token(self, conn, key):
+        row = conn.execute(
+            'SELECT COALESCE((SELECT gen FROM generations WHERE namespace = ?), 0), '
+            'COALESCE((SELECT gen FROM key_generations WHERE namespace = ? AND key = ?), 0)',
+            (self.namespace, self.namespace, key)).fetchone()
+        return (row[0], row[1])
+
+    def get(self, key):
+        """(value, token) — value is None on a miss; pass token to set()."""
+        try:
+            conn = _conn()
+            # One statement, so the generations and the entry come from the same snapshot
+            row = conn.execute(
+                'SELECT t.gen, t.key_gen, e.data FROM ('
+                'SELECT COALESCE((SELECT gen FROM generations WHERE namespace = ?), 0) AS gen, '
+                'COALESCE((SELECT gen FROM key_generations WHERE namespace = ? AND key = ?), 0) AS key_gen'
+                ') t LEFT JOIN entries e ON e.namespace = ? AND e.key = ? '
+                'AND e.gen = t.gen AND e.key_gen = t.key_gen AND e.expires_at > ?',
+                (self.namespace, self.namespace, key, self.namespace, key, time.time())).fetchone()
+            token = (row[0], row[1])
+            return (pickle.loads(row[2]) if row[2] is not None else None), token
+        except Exception as e:
+            print(f'[cache] {self.namespace} get failed: {e}')
+            return None, None
+
+    def set(self, key, data, token):
+        """Store data unless key was invalidated since the get() that returned token."""
+        if token is None:
+            return
+        try:
+            blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            conn = _conn()
+            now  = time.time()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if self._token(conn, key) != tuple(token):
+                    conn.execute('ROLLBACK')
+                    return
+                gen, key_gen = token
+                conn.execute('INSERT OR REPLACE INTO entries '
+                             '(namespace, key, gen, key_gen, expires_at, data) '
+                             'VALUES (?, ?, ?, ?, ?, ?)',
+                             (self.namespace, key, gen, key_gen, now + self.ttl, blob))
+                # Sweep: superseded generations, expired rows, then oldest over the cap
+                conn.execute('DELETE FROM entries WHERE namespace = ? AND (gen <> ? OR expires_at <= ?)',
+                             (self.namespace, gen, now))
+                conn.execute('DELETE FROM entries WHERE namespace = ? AND key IN ('
+                             'SELECT key FROM entries WHERE namespace = ? '
+                             'ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+                             (self.namespace, self.namespace, self.max_entries))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except Exception as e:
+            print(f'[cache] {self.namespace} set failed: {e}')
+
+    def invalidate(self, key=None):
+        try:
+            conn = _conn()
+            if key is not None:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    conn.execute('DELETE FROM entries WHERE namespace = ? AND key = ?',
+                                 (self.namespace, key))
+                    conn.execute('INSERT INTO key_generations (namespace, key, gen) VALUES (?, ?, 1) '
+                                 'ON CONFLICT(namespace, key) DO UPDATE SET gen = gen + 1',
+                                 (self.namespace, key))
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+            else:
+                conn.execute('INSERT INTO generations (namespace, gen) VALUES (?, 1) '
+                             'ON CONFLICT(namespace) DO UPDATE SET gen = gen + 1',
+                             (self.namespace,))
+        except Exception as e:
+            print(f'[cache] {self.namespace} invalidate failed: {e}')
+
+
+def shared_cache(namespace: str, ttl: int = 300, max_entries: int = 500):
+    """Return the configured cache backend for one namespace."""
+    if BACKEND == 'sqlite':
+        try:
+            _conn()
+            return _SQLiteCache(namespace, ttl, max_entries)
+        except Exception as e:
+            print(f'[cache] SQLite cache unavailable ({e}) — using per-process cache for {namespace}')
+    return _MemoryCache(namespace, ttl, max_entries)